@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Welcome to the ScenarioRunner's offline criteria evaluation
+
+Re-evaluates the criteria that only depend on the trajectory of the ego vehicle
+(maximum velocity, driven distance, average velocity, in route and route completion)
+on the Waymo-format histories saved with --recordWaymo, or on the CARLA recorder logs
+saved with --record, without running the simulation again. The recorder logs are read
+through a CARLA server. The results are written as ScenarioRunner writes them.
+"""
+
+from __future__ import print_function
+
+import argparse
+from argparse import RawTextHelpFormatter
+import os
+import sys
+
+import numpy as np
+
+import carla
+
+from srunner.metrics.tools.offline_criteria import (AverageVelocityCriterion,
+                                                    DrivenDistanceCriterion,
+                                                    InRouteCriterion,
+                                                    MaxVelocityCriterion,
+                                                    OfflineScenarioResult,
+                                                    RouteCompletionCriterion,
+                                                    densify_route,
+                                                    read_recorder_trajectories,
+                                                    read_waymo_trajectories)
+from srunner.scenariomanager.result_writer import ResultOutputProvider
+
+
+def get_criteria(args):
+    """
+    Returns the offline criteria requested by the arguments
+    """
+    criteria = []
+    if args.maxVelocity is not None:
+        criteria.append(MaxVelocityCriterion(args.maxVelocity))
+    if args.drivenDistance is not None:
+        criteria.append(DrivenDistanceCriterion(*args.drivenDistance))
+    if args.averageVelocity is not None:
+        criteria.append(AverageVelocityCriterion(*args.averageVelocity))
+    if args.route:
+        points = np.loadtxt(args.route, delimiter=',', ndmin=2)
+        if points.shape[1] == 2:
+            points = np.hstack((points, np.zeros((len(points), 1))))
+        route = densify_route(points)
+        criteria.append(InRouteCriterion(route, offroad_max=args.offroadMax))
+        criteria.append(RouteCompletionCriterion(route))
+    return criteria
+
+
+def read_trajectories(file_name, args, client=None):
+    """
+    Returns the name of the scenario and the trajectories of a Waymo-format history (*.pkl), or of
+    the ego vehicles of a CARLA recorder log (*.log), which is read by the client
+    """
+    if file_name.endswith('.log'):
+        recorder_str = client.show_recorder_file_info(os.path.abspath(file_name), True)
+        return os.path.splitext(os.path.basename(file_name))[0], read_recorder_trajectories(recorder_str)
+    return read_waymo_trajectories(file_name, args.delta)
+
+
+def main():
+    """
+    main function
+    """
+
+    description = ("Scenario Runner's offline criteria evaluation. "
+                   "Re-evaluate the criteria of recorded scenarios from their trajectories.\n")
+
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=RawTextHelpFormatter)
+    parser.add_argument('files', nargs='+',
+                        help='Waymo-format histories (.pkl) created by the --recordWaymo functionality\n'
+                        'of ScenarioRunner, or CARLA recorder logs (.log) created by its --record functionality')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='IP of the host server, used to read the recorder logs (default: localhost)')
+    parser.add_argument('--port', '-p', default=2000, type=int,
+                        help='TCP port to listen to (default: 2000)')
+    parser.add_argument('--actor', default=0, type=int,
+                        help='Index of the evaluated actor in the histories (default: 0, the first ego vehicle).\n'
+                        'Only the ego vehicles of the recorder logs are indexed')
+    parser.add_argument('--delta', default=0.05, type=float,
+                        help='Time between the samples of the histories, in seconds (default: 0.05)')
+    parser.add_argument('--maxVelocity', default=None, type=float,
+                        help='Maximum velocity allowed, in m/s')
+    parser.add_argument('--drivenDistance', default=None, type=float, nargs='+',
+                        metavar=('SUCCESS', 'ACCEPTABLE'),
+                        help='Distance to be driven, in meters, and optionally the acceptable one')
+    parser.add_argument('--averageVelocity', default=None, type=float, nargs='+',
+                        metavar=('SUCCESS', 'ACCEPTABLE'),
+                        help='Average velocity to be reached, in m/s, and optionally the acceptable one')
+    parser.add_argument('--route', default='',
+                        help='CSV file with the x,y[,z] points of the route to be followed, one per line')
+    parser.add_argument('--offroadMax', default=30, type=float,
+                        help='Maximum distance to the route, in meters (default: 30)')
+    parser.add_argument('--timeout', default=float('inf'), type=float,
+                        help='Timeout of the scenarios, in seconds')
+    parser.add_argument('--file', action="store_true", help='Write results into a txt file per history')
+    parser.add_argument('--junit', action="store_true", help='Write results into a junit file per history')
+    parser.add_argument('--json', action="store_true", help='Write results into a JSON file per history')
+    parser.add_argument('--outputDir', default='', help='Directory for output files (default: this directory)')
+
+    args = parser.parse_args()
+    for option, values in (('--drivenDistance', args.drivenDistance), ('--averageVelocity', args.averageVelocity)):
+        if values is not None and len(values) > 2:
+            parser.error("{} takes at most 2 values (SUCCESS and ACCEPTABLE)".format(option))
+
+    criteria = get_criteria(args)
+    if not criteria:
+        print("ERROR: No criteria to be evaluated")
+        return -1
+
+    client = None
+    if any(file_name.endswith('.log') for file_name in args.files):
+        client = carla.Client(args.host, args.port)
+        client.set_timeout(10.0)
+
+    failure = False
+    for file_name in args.files:
+        name, trajectories = read_trajectories(file_name, args, client)
+        if args.actor >= len(trajectories):
+            print("WARNING: {} has no actor {}. Skipping it".format(file_name, args.actor))
+            continue
+
+        result = OfflineScenarioResult(name, trajectories[args.actor], criteria, args.timeout)
+        result_string = result.get_result()
+        failure = failure or result_string not in ("SUCCESS", "ACCEPTABLE")
+
+        output_name = os.path.join(args.outputDir, os.path.splitext(os.path.basename(file_name))[0])
+        output = ResultOutputProvider(result, result_string, True,
+                                      output_name + '.txt' if args.file else None,
+                                      output_name + '.xml' if args.junit else None,
+                                      output_name + '.json' if args.json else None)
+        output.write()
+
+    return 1 if failure else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Summary of the run logs (*.jsonl) written by ScenarioRunner with --runLog.
+
+Reports the throughput of each run log (or of each group of jobs), so that
+sweeps run before and after a change can be compared:
+
+    python run_log_summary.py baseline.jsonl optimized.jsonl
+    python run_log_summary.py sweep.jsonl --groupBy type
+"""
+
+from __future__ import print_function
+
+import argparse
+from argparse import RawTextHelpFormatter
+import sys
+
+from tabulate import tabulate
+
+from srunner.scenariomanager.run_log import read_run_log, summarize_run_log
+
+COLUMNS = [
+    ('jobs', 'Jobs', '{:d}'),
+    ('success_rate', 'Success', '{:.0%}'),
+    ('sweep_time', 'Wall time [s]', '{:.1f}'),
+    ('jobs_per_hour', 'Jobs/h', '{:.1f}'),
+    ('sim_hours_per_hour', 'Sim h/h', '{:.2f}'),
+    ('ticks_per_second', 'Ticks/s', '{:.1f}'),
+    ('setup_time', 'Setup [s]', '{:.2f}'),
+    ('world_load_time', 'World load [s]', '{:.2f}'),
+    ('spawn_time', 'Spawn [s]', '{:.2f}'),
+    ('export_time', 'Export [s]', '{:.2f}'),
+    ('tick_latency_mean', 'Tick mean [ms]', '{:.1f}'),
+    ('tick_latency_p95', 'Tick p95 [ms]', '{:.1f}'),
+    ('sim_wall_ratio', 'Sim/wall', '{:.2f}'),
+]
+MILLISECOND_COLUMNS = ('tick_latency_mean', 'tick_latency_p95')
+
+
+def format_summary(summary):
+    """
+    Returns the table row of a summary
+    """
+    row = []
+    for key, _, value_format in COLUMNS:
+        value = summary.get(key, None)
+        if value is None:
+            row.append('-')
+            continue
+        if key in MILLISECOND_COLUMNS:
+            value *= 1000.0
+        row.append(value_format.format(value))
+    return row
+
+
+def main():
+    """
+    main function
+    """
+    description = "Throughput summary of ScenarioRunner's run logs\n"
+
+    parser = argparse.ArgumentParser(description=description, formatter_class=RawTextHelpFormatter)
+    parser.add_argument('files', nargs='+', help='Run logs (*.jsonl) written with --runLog')
+    parser.add_argument('--groupBy', default=None,
+                        help='Group the jobs by a record field (e.g. type, town, name) instead of by file')
+    args = parser.parse_args()
+
+    groups = {}
+    for file_name in args.files:
+        for record in read_run_log(file_name):
+            key = str(record.get(args.groupBy, None)) if args.groupBy else file_name
+            groups.setdefault(key, []).append(record)
+
+    if not groups:
+        print("The run logs have no records")
+        return 1
+
+    table = []
+    for key, records in groups.items():
+        table.append([key] + format_summary(summarize_run_log(records)))
+
+    headers = [args.groupBy if args.groupBy else 'Run log'] + [header for _, header, _ in COLUMNS]
+    print(tabulate(table, headers=headers, tablefmt='simple'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
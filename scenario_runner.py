@@ -34,11 +34,17 @@ import carla
 
 from srunner.scenarioconfigs.openscenario_configuration import OpenScenarioConfiguration
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
+from srunner.scenariomanager.run_log import RunLog
 from srunner.scenariomanager.scenario_manager import ScenarioManager
+from srunner.scenariomanager.scenarioatomics.atomic_criteria import SurrogateSafetyTest
+from srunner.scenariomanager.server_supervisor import ServerSupervisor
+from srunner.scenariomanager.termination_policy import TerminationPolicy
 from srunner.scenarios.open_scenario import OpenScenario
 from srunner.scenarios.route_scenario import RouteScenario
 from srunner.tools.scenario_parser import ScenarioConfigurationParser
 from srunner.tools.route_parser import RouteParser
+from srunner.tools.scenario_sampler import ScenarioParameterSpace
 
 # Version of scenario_runner
 VERSION = '0.9.13'
@@ -83,6 +89,17 @@ class ScenarioRunner(object):
         if args.timeout:
             self.client_timeout = float(args.timeout)
 
+        # Launch the simulator (or attach to a running one) and watch over it
+        self._supervisor = ServerSupervisor(args.host, int(args.port), args.serverCommand,
+                                            startup_timeout=self.wait_for_world)
+        if not self._supervisor.start():
+            print("WARNING: The CARLA server at {}:{} is not responding".format(args.host, args.port))
+        self._reload_world = False
+        self._server_lost = False
+
+        # Structured log of all jobs
+        self._run_log = RunLog(args.runLog if args.runLog else None)
+
         # First of all, we need to create the client that will send the requests
         # to the simulator. Here we'll assume the simulator is accepting
         # requests in the localhost at port 2000.
@@ -101,7 +118,15 @@ class ScenarioRunner(object):
             self.module_agent = importlib.import_module(module_name)
 
         # Create the ScenarioManager
-        self.manager = ScenarioManager(self._args.debug, self._args.sync, self._args.timeout)
+        termination_policy = None
+        if self._args.terminationPolicy:
+            termination_policy = TerminationPolicy.from_string(self._args.terminationPolicy)
+        self.manager = ScenarioManager(self._args.debug, self._args.sync, self._args.timeout,
+                                       self._args.batchCriteria, termination_policy)
+
+        if self._args.routePlannerCache:
+            CarlaDataProvider.set_route_planner_dir(self._args.routePlannerCache)
+        CarlaDataProvider.set_actor_pool_size(int(self._args.actorPoolSize))
 
         # Create signal handler for SIGINT
         self._shutdown_requested = False
@@ -124,6 +149,7 @@ class ScenarioRunner(object):
             del self.world
         if self.client is not None:
             del self.client
+        self._supervisor.stop()
 
     def _signal_handler(self, signum, frame):
         """
@@ -180,7 +206,9 @@ class ScenarioRunner(object):
                 self.world.apply_settings(settings)
                 self.client.get_trafficmanager(int(self._args.trafficManagerPort)).set_synchronous_mode(False)
             except RuntimeError:
-                sys.exit(-1)
+                if self._supervisor.is_alive():
+                    sys.exit(-1)
+                raise
 
         self.manager.cleanup()
 
@@ -309,8 +337,9 @@ class ScenarioRunner(object):
         Load a new CARLA world and provide data to CarlaDataProvider
         """
 
-        if self._args.reloadWorld:
+        if self._args.reloadWorld or self._reload_world:
             self.world = self.client.load_world(town)
+            self._reload_world = False
         else:
             # if the world should not be reloaded, wait at least until all ego vehicles are ready
             ego_vehicle_found = False
@@ -353,15 +382,33 @@ class ScenarioRunner(object):
 
         return True
 
-    def _load_and_run_scenario(self, config):
+    def _set_random_seed(self, repetition=0):
         """
-        Load and run the scenario given by config
+        Seed the random streams of the job, so that it can be reproduced
+        """
+        CarlaDataProvider.set_random_seed(int(self._args.seed), int(self._args.jobId), repetition)
+
+    def _load_and_run_scenario(self, config, sample=None, sample_index=0):
+        """
+        Load and run the scenario given by config.
+        If a sample of the parameter space is given, it is applied to the configuration
         """
         result = False
-        if not self._load_and_wait_for_world(config.town, config.ego_vehicles):
+        with self._run_log.measure(RunLog.WORLD_LOAD):
+            world_loaded = self._load_and_wait_for_world(config.town, config.ego_vehicles)
+        if not world_loaded:
             self._cleanup()
             return False
 
+        if sample is not None:
+            sampled_config = ScenarioParameterSpace.apply(config, sample, sample_index)
+            if sampled_config is None:
+                print("Skipping sample {} of {}, as it has no valid spawn point".format(sample_index, config.name))
+                self._cleanup()
+                return False
+            config = sampled_config
+            self._run_log.set_config(config)
+
         if self._args.agent:
             agent_class_name = self.module_agent.__name__.title().replace('_', '')
             try:
@@ -375,12 +422,16 @@ class ScenarioRunner(object):
 
         CarlaDataProvider.set_traffic_manager_port(int(self._args.trafficManagerPort))
         tm = self.client.get_trafficmanager(int(self._args.trafficManagerPort))
-        tm.set_random_device_seed(int(self._args.trafficManagerSeed))
+        if self._args.trafficManagerSeed:
+            tm.set_random_device_seed(int(self._args.trafficManagerSeed))
+        else:
+            tm.set_random_device_seed(RandomStreams.derive_seed(RandomStreams.TRAFFIC_MANAGER))
         if self._args.sync:
             tm.set_synchronous_mode(True)
 
         # Prepare scenario
         print("Preparing scenario: " + config.name)
+        spawn_start_time = time.time()
         try:
             self._prepare_ego_vehicles(config.ego_vehicles)
             if self._args.openscenario:
@@ -418,6 +469,7 @@ class ScenarioRunner(object):
             print(exception)
             self._cleanup()
             return False
+        self._run_log.add_duration(RunLog.SPAWN, time.time() - spawn_start_time)
 
         try:
             if self._args.record:
@@ -425,18 +477,23 @@ class ScenarioRunner(object):
                     os.getenv('SCENARIO_RUNNER_ROOT', "./"), self._args.record, config.name)
                 self.client.start_recorder(recorder_name,True) # TODO:this may blow up malloc. And this does not work because this method takes absolute path if there is /.
 
+            if self._args.safetyMetrics:
+                scenario.scenario.add_criterion(SurrogateSafetyTest(scenario.ego_vehicles[0]))
+
             # Load scenario and run it
             self.manager.load_scenario(scenario, self.agent_instance)
             self.manager.run_scenario(self._args.recordWaymo, config, self._args.data_id)
 
             # Provide outputs if required
-            self._analyze_scenario(config)
+            with self._run_log.measure(RunLog.EXPORT):
+                self._analyze_scenario(config)
 
             # Remove all actors, stop the recorder and save all criterias (if needed)
             scenario.remove_all_actors()
             if self._args.record:
-                self.client.stop_recorder()
-                self._record_criteria(self.manager.scenario.get_criteria(), recorder_name)
+                with self._run_log.measure(RunLog.EXPORT):
+                    self.client.stop_recorder()
+                    self._record_criteria(self.manager.scenario.get_criteria(), recorder_name)
 
             result = True
 
@@ -448,6 +505,64 @@ class ScenarioRunner(object):
         self._cleanup()
         return result
 
+    def _recover_server(self):
+        """
+        Restart a crashed or hung server and reconnect to it.
+        Returns False if the server could not be recovered
+        """
+        self.finished = True
+        try:
+            self.manager.cleanup()
+        except RuntimeError:
+            pass
+        try:
+            CarlaDataProvider.cleanup()
+        except RuntimeError:
+            pass
+        self.ego_vehicles = []
+        self.agent_instance = None
+        self.world = None
+
+        if not self._supervisor.restart():
+            return False
+
+        self.client = carla.Client(self._args.host, int(self._args.port))
+        self.client.set_timeout(self.client_timeout)
+        # A restarted server starts with its default map
+        self._reload_world = True
+        return True
+
+    def _run_job(self, config, sample=None, sample_index=0):
+        """
+        Run a single job. If the server crashed or hung during the job,
+        it is restarted and the job is requeued (up to --serverRetries times)
+        """
+        if self._server_lost:
+            return False
+
+        result = False
+        for _ in range(self._args.serverRetries + 1):
+            self._run_log.start_job(config)
+            try:
+                result = self._load_and_run_scenario(config, sample, sample_index)
+            except RuntimeError as e:
+                print("The scenario {} was interrupted: {}".format(config.name, e))
+                result = False
+            self._run_log.write(self.manager, result)
+
+            if self._supervisor.is_alive():
+                return result
+
+            print("Lost the CARLA server while running {}".format(config.name))
+            if not self._recover_server():
+                print("The CARLA server could not be recovered. Skipping all remaining scenarios")
+                self._server_lost = True
+                return False
+            self.finished = False
+            print("Requeueing {}".format(config.name))
+
+        return result
+
     def _run_scenarios(self):
         """
         Run conventional scenarios (e.g. implemented using the Python API of ScenarioRunner)
@@ -462,11 +577,26 @@ class ScenarioRunner(object):
             print("Configuration for scenario {} cannot be found!".format(self._args.scenario))
             return result
 
+        parameter_space = None
+        if self._args.parameterSpace:
+            parameter_space = ScenarioParameterSpace.parse_from_file(self._args.parameterSpace)
+
         # Execute each configuration
         for config in scenario_configurations:
-            for _ in range(self._args.repetitions):
-                self.finished = False
-                result = self._load_and_run_scenario(config)
+            if parameter_space is None:
+                for repetition in range(self._args.repetitions):
+                    self.finished = False
+                    self._set_random_seed(repetition)
+                    result = self._run_job(config)
+            else:
+                self._set_random_seed()
+                samples = parameter_space.sample(self._args.samples, self._args.samplingMethod)
+                print("Running {} samples of {}".format(len(samples), config.name))
+                for index, sample in enumerate(samples):
+                    for repetition in range(self._args.repetitions):
+                        self.finished = False
+                        self._set_random_seed(index * self._args.repetitions + repetition)
+                        result = self._run_job(config, sample, index)
 
             self._cleanup()
         return result
@@ -488,8 +618,9 @@ class ScenarioRunner(object):
         route_configurations = RouteParser.parse_routes_file(routes, scenario_file, single_route)
 
         for config in route_configurations:
-            for _ in range(self._args.repetitions):
-                result = self._load_and_run_scenario(config)
+            for repetition in range(self._args.repetitions):
+                self._set_random_seed(repetition)
+                result = self._run_job(config)
 
                 self._cleanup()
         return result
@@ -512,7 +643,8 @@ class ScenarioRunner(object):
                 openscenario_params[key] = val
         config = OpenScenarioConfiguration(self._args.openscenario, self.client, openscenario_params)
 
-        result = self._load_and_run_scenario(config)
+        self._set_random_seed()
+        result = self._run_job(config)
         self._cleanup()
         return result
 
@@ -551,8 +683,9 @@ def main():
                         help='Set the CARLA client timeout value in seconds')
     parser.add_argument('--trafficManagerPort', default='8000',
                         help='Port to use for the TrafficManager (default: 8000)')
-    parser.add_argument('--trafficManagerSeed', default='0',
-                        help='Seed used by the TrafficManager (default: 0)')
+    parser.add_argument('--trafficManagerSeed', default='',
+                        help='Seed used by the TrafficManager\n'
+                        '(default: derived from --seed, --jobId and the repetition)')
     parser.add_argument('--sync', action='store_true',
                         help='Forces the simulation to run synchronously')
     parser.add_argument('--list', action="store_true", help='List all supported scenarios and exit')
@@ -574,11 +707,35 @@ def main():
     parser.add_argument('--junit', action="store_true", help='Write results into a junit file')
     parser.add_argument('--json', action="store_true", help='Write results into a JSON file')
     parser.add_argument('--outputDir', default='', help='Directory for output files (default: this directory)')
+    parser.add_argument('--runLog', default='',
+                        help='Append one JSON record with the timings and results of each job to this file (*.jsonl)')
 
     parser.add_argument('--configFile', default='', help='Provide an additional scenario configuration file (*.xml),relative to SCENARIO_RUNNER_ROOT')
     parser.add_argument('--additionalScenario', default='', help='Provide additional scenario implementations (*.py)')
 
+    parser.add_argument('--serverCommand', default=None,
+                        help='Command to launch the CARLA server, which is then restarted if it crashes or hangs.\n'
+                        '"{port}" is replaced by the port\n'
+                        '(e.g. "./CarlaUE4.sh -RenderOffScreen -carla-rpc-port={port}")')
+    parser.add_argument('--serverRetries', default=1, type=int,
+                        help='Number of times a job is requeued after the server crashed or hung (default: 1)')
     parser.add_argument('--debug', action="store_true", help='Run with debug output')
+    parser.add_argument('--batchCriteria', action="store_true",
+                        help='Evaluate the criteria in a single pass per tick, outside of the scenario tree')
+    parser.add_argument('--safetyMetrics', action="store_true",
+                        help='Compute surrogate safety indicators (TTC, PET, gap, DRAC)\n'
+                        'between the ego and the other actors')
+    parser.add_argument('--terminationPolicy', default='',
+                        help='End the scenarios early when a rule is met,\n'
+                        'e.g. "collision:2,stationary:20,region:80:5":\n'
+                        '2s after the first collision, after 20s with a stationary ego, or after the other actors\n'
+                        'have been further than 80m from the ego for 5s')
+    parser.add_argument('--routePlannerCache', default='',
+                        help='Directory where the route planner graphs, junction tables and lane type grids\n'
+                        'are stored, to be reused by later runs')
+    parser.add_argument('--actorPoolSize', default='0',
+                        help='Number of removed actors kept out of sight, instead of destroyed, '
+                        'to be reused by later spawns (default: 0)')
     parser.add_argument('--reloadWorld', action="store_true",
                         help='Reload the CARLA world before starting a scenario (default=True)')
     parser.add_argument('--record', type=str, default='',
@@ -588,7 +745,17 @@ def main():
                         help='Path were the files will be saved, relative to SCENARIO_RUNNER_ROOT.\nActivates the CARLA recording feature and saves to file all the criteria information.')
 
     parser.add_argument('--randomize', action="store_true", help='Scenario parameters are randomized')
+    parser.add_argument('--seed', default='2000',
+                        help='Seed of the random streams used by the scenarios (default: 2000)')
+    parser.add_argument('--jobId', default='0',
+                        help='Id of this job. Jobs with different ids use independent random streams (default: 0)')
     parser.add_argument('--repetitions', default=1, type=int, help='Number of scenario executions')
+    parser.add_argument('--parameterSpace', default='',
+                        help='Run samples of the scenario parameter space, declared in a JSON file')
+    parser.add_argument('--samples', default=None, type=int,
+                        help='Number of samples of the parameter space (default: as declared)')
+    parser.add_argument('--samplingMethod', default=None, choices=ScenarioParameterSpace.SAMPLING_METHODS,
+                        help='Sampling method of the parameter space (default: as declared)')
     parser.add_argument('--waitForEgo', action="store_true", help='Connect the scenario to an existing ego vehicle')
     parser.add_argument('--autoPilot', action="store_true", help='Enable autopilot for all vehicles')
     parser.add_argument('--cyclist',action="store_true",help='cyclist are generated')
@@ -0,0 +1,412 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides an offline evaluation of the criteria that only depend on
+the poses of an actor, from its recorded trajectory (the Waymo-format history
+saved with --recordWaymo, or a MetricsLog of the CARLA recorder).
+
+The criteria reproduce the result of their live counterpart of atomic_criteria.py,
+and the results can be written with the ResultOutputProvider, as if the scenario
+had been simulated again.
+"""
+
+from __future__ import print_function
+
+from collections import namedtuple
+import pickle
+import time
+
+import numpy as np
+
+from srunner.metrics.tools.metrics_log import MetricsLog
+from srunner.scenariomanager.route_geometry import RouteGeometry
+from srunner.scenariomanager.traffic_events import TrafficEvent, TrafficEventType
+
+DELTA_SECONDS = 0.05  # Time between the samples of the Waymo-format history (ScenarioRunner's frame rate is 20Hz)
+
+OfflineActor = namedtuple('OfflineActor', ['id', 'type_id'])
+RoutePoint = namedtuple('RoutePoint', ['x', 'y', 'z'])
+
+# Type ids of the actor types of the Waymo format
+WAYMO_TYPE_IDS = {1: 'vehicle.unknown', 2: 'walker.pedestrian.unknown', 3: 'vehicle.bicycle.unknown'}
+
+
+class Trajectory(object):
+
+    """
+    Recorded states of an actor, one per tick:
+    - times: (T,) game time of the samples, as GameTime returns it during the scenario [s]
+    - positions: (T, 3) positions [m]
+    - velocities: (T, 3) velocities [m/s]
+    """
+
+    def __init__(self, times, positions, velocities, actor_id=0, type_id='unknown'):
+        self.times = np.asarray(times, dtype=float)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        self.velocities = np.asarray(velocities, dtype=float).reshape(-1, 3)
+        self.actor = OfflineActor(actor_id, type_id)
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def speeds(self):
+        """
+        Speeds of the samples, as computed by the CarlaDataProvider [m/s]
+        """
+        return np.linalg.norm(self.velocities[:, :2], axis=1)
+
+    @staticmethod
+    def from_waymo(data, index, delta_seconds=DELTA_SECONDS):
+        """
+        Returns the trajectory of the index-th actor of the data of a Waymo-format history.
+        The history has no height, and its y axis is the opposite of CARLA's one
+        """
+        valid = np.asarray(data['state/valid'][index]) > 0
+        steps = np.arange(len(valid))[valid]
+        positions = np.zeros((len(steps), 3))
+        positions[:, 0] = np.asarray(data['state/x'][index])[valid]
+        positions[:, 1] = -np.asarray(data['state/y'][index])[valid]
+        velocities = np.zeros((len(steps), 3))
+        velocities[:, 0] = np.asarray(data['state/velocity_x'][index])[valid]
+        velocities[:, 1] = -np.asarray(data['state/velocity_y'][index])[valid]
+
+        actor_id = int(data['state/id'][index])
+        type_id = WAYMO_TYPE_IDS.get(int(data['state/type'][index]), 'unknown')
+        return Trajectory((steps + 1) * delta_seconds, positions, velocities, actor_id, type_id)
+
+    @staticmethod
+    def from_metrics_log(log, actor_id):
+        """
+        Returns the trajectory of an actor of a MetricsLog, while it was alive
+        """
+        first_frame, last_frame = log.get_actor_alive_frames(actor_id)
+        times = []
+        positions = []
+        velocities = []
+        for frame in range(first_frame, last_frame + 1):
+            transform = log.get_actor_transform(actor_id, frame)
+            velocity = log.get_actor_velocity(actor_id, frame)
+            if transform is None or velocity is None:
+                continue
+            times.append(log.get_elapsed_time(frame - 1))
+            positions.append((transform.location.x, transform.location.y, transform.location.z))
+            velocities.append((velocity.x, velocity.y, velocity.z))
+
+        type_id = log.get_actor_attributes(actor_id).get('type_id', 'unknown')
+        return Trajectory(times, positions, velocities, actor_id, type_id)
+
+
+def read_waymo_trajectories(file_name, delta_seconds=DELTA_SECONDS):
+    """
+    Returns the name of the scenario and the trajectories of all actors of a
+    Waymo-format history (*.pkl), in the order they were registered
+    """
+    with open(file_name, 'rb') as fd:
+        data = pickle.load(fd)
+
+    trajectories = []
+    for index, actor_id in enumerate(data['state/id']):
+        if actor_id < 0:  # Unused slot
+            continue
+        trajectories.append(Trajectory.from_waymo(data, index, delta_seconds))
+
+    return str(data['scenario/id'][0]), trajectories
+
+
+def read_recorder_trajectories(recorder_str):
+    """
+    Returns the trajectories of the ego vehicles (role_name 'hero') of a CARLA recorder log,
+    from its information as client.show_recorder_file_info(file_name, True) returns it
+    """
+    log = MetricsLog(recorder_str)
+    return [Trajectory.from_metrics_log(log, actor_id)
+            for actor_id in sorted(log.get_actor_ids_with_role_name('hero'))]
+
+
+def densify_route(points, resolution=1.0):
+    """
+    Returns a route (list of (RoutePoint, None)) interpolating linearly the given (N, 3)
+    points every resolution meters, as the routes used by the scenarios are
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    route = []
+    for start, end in zip(points[:-1], points[1:]):
+        steps = max(1, int(np.ceil(np.linalg.norm(end - start) / resolution)))
+        for ratio in np.arange(steps) / float(steps):
+            route.append((RoutePoint(*(start + ratio * (end - start))), None))
+    if len(points) > 0:
+        route.append((RoutePoint(*points[-1]), None))
+    return route
+
+
+class OfflineCriterion(object):
+
+    """
+    Base class of the offline criteria. After evaluate() they have the same
+    results as the criteria of atomic_criteria.py at the end of a scenario
+    """
+
+    def __init__(self, name, expected_value_success, expected_value_acceptable=None, optional=False):
+        self.name = name
+        self.expected_value_success = expected_value_success
+        self.expected_value_acceptable = expected_value_acceptable
+        self.optional = optional
+        self.actor = None
+        self.test_status = "INIT"
+        self.actual_value = 0
+        self.list_traffic_events = []
+
+    def evaluate(self, trajectory):
+        """
+        Evaluate the criterion on a trajectory, and return itself
+        """
+        self.actor = trajectory.actor
+        self.test_status = "INIT"
+        self.actual_value = 0
+        self.list_traffic_events = []
+
+        if len(trajectory) > 0:
+            self._evaluate(trajectory)
+        self._terminate()
+
+        if self.test_status in ('RUNNING', 'INIT'):
+            self.test_status = "SUCCESS"
+        return self
+
+    def _evaluate(self, trajectory):  # pylint: disable=unused-argument,no-self-use
+        """
+        Evaluate the criterion on a non empty trajectory. The base criterion
+        has no condition on the trajectory, so it succeeds
+        """
+
+    def _terminate(self):
+        """
+        Set the final result, as the terminate() of the live criterion
+        """
+
+
+class MaxVelocityCriterion(OfflineCriterion):
+
+    """
+    Offline MaxVelocityTest. As the live one, its status depends on the last velocity
+    """
+
+    def __init__(self, max_velocity_allowed, optional=False, name="CheckMaximumVelocity"):
+        super(MaxVelocityCriterion, self).__init__(name, max_velocity_allowed, None, optional)
+
+    def _evaluate(self, trajectory):
+        speeds = trajectory.speeds
+        self.actual_value = max(float(np.max(speeds)), 0)
+        self.test_status = "FAILURE" if speeds[-1] > self.expected_value_success else "SUCCESS"
+
+
+class DrivenDistanceCriterion(OfflineCriterion):
+
+    """
+    Offline DrivenDistanceTest
+    """
+
+    def __init__(self, distance_success, distance_acceptable=None, optional=False, name="CheckDrivenDistance"):
+        super(DrivenDistanceCriterion, self).__init__(name, distance_success, distance_acceptable, optional)
+
+    def _evaluate(self, trajectory):
+        self.actual_value = float(np.sum(np.linalg.norm(np.diff(trajectory.positions, axis=0), axis=1)))
+
+        if self.actual_value > self.expected_value_success:
+            self.test_status = "SUCCESS"
+        elif (self.expected_value_acceptable is not None and
+              self.actual_value > self.expected_value_acceptable):
+            self.test_status = "ACCEPTABLE"
+        else:
+            self.test_status = "RUNNING"
+
+    def _terminate(self):
+        if self.test_status != "SUCCESS":
+            self.test_status = "FAILURE"
+        self.actual_value = round(self.actual_value, 2)
+
+
+class AverageVelocityCriterion(OfflineCriterion):
+
+    """
+    Offline AverageVelocityTest
+    """
+
+    def __init__(self, avg_velocity_success, avg_velocity_acceptable=None, optional=False,
+                 name="CheckAverageVelocity"):
+        super(AverageVelocityCriterion, self).__init__(name, avg_velocity_success, avg_velocity_acceptable, optional)
+
+    def _evaluate(self, trajectory):
+        distance = float(np.sum(np.linalg.norm(np.diff(trajectory.positions, axis=0), axis=1)))
+        elapsed_time = trajectory.times[-1]
+        if elapsed_time > 0.0:
+            self.actual_value = distance / elapsed_time
+
+        if self.actual_value > self.expected_value_success:
+            self.test_status = "SUCCESS"
+        elif (self.expected_value_acceptable is not None and
+              self.actual_value > self.expected_value_acceptable):
+            self.test_status = "ACCEPTABLE"
+        else:
+            self.test_status = "RUNNING"
+
+    def _terminate(self):
+        if self.test_status == "RUNNING":
+            self.test_status = "FAILURE"
+
+
+class InRouteCriterion(OfflineCriterion):
+
+    """
+    Offline InRouteTest. As the live criterion, each sample is only compared
+    with the route points of its search window
+    """
+
+    MAX_ROUTE_PERCENTAGE = 30  # %
+    WINDOWS_SIZE = 5  # Amount of additional waypoints checked
+
+    def __init__(self, route, offroad_min=-1, offroad_max=30, name="InRouteTest"):
+        super(InRouteCriterion, self).__init__(name, 0)
+        self._route_geometry = RouteGeometry(route)
+        self._offroad_max = offroad_max
+        self._offroad_min = offroad_max / 2 if offroad_min == -1 else offroad_min
+
+    def _evaluate(self, trajectory):
+        accum_meters = self._route_geometry.accum_meters
+
+        current_index = 0
+        out_route_distance = 0
+        in_safe_route = True
+        for location in trajectory.positions:
+            closest_index, shortest_distance = self._route_geometry.get_closest_index(
+                RoutePoint(*location), current_index, self.WINDOWS_SIZE)
+
+            off_route = True
+            if shortest_distance < self._offroad_max:
+                off_route = False
+                in_safe_route = bool(shortest_distance < self._offroad_min)
+
+            if current_index != closest_index:
+                if not in_safe_route:
+                    out_route_distance += accum_meters[closest_index] - accum_meters[current_index]
+                    if 100 * out_route_distance / accum_meters[-1] > self.MAX_ROUTE_PERCENTAGE:
+                        off_route = True
+                current_index = closest_index
+
+            if off_route:
+                route_deviation_event = TrafficEvent(event_type=TrafficEventType.ROUTE_DEVIATION)
+                route_deviation_event.set_message(
+                    "Agent deviated from the route at (x={}, y={}, z={})".format(
+                        round(location[0], 3), round(location[1], 3), round(location[2], 3)))
+                route_deviation_event.set_dict({'x': location[0], 'y': location[1], 'z': location[2]})
+                self.list_traffic_events.append(route_deviation_event)
+
+                self.test_status = "FAILURE"
+                self.actual_value += 1
+                break
+
+
+class RouteCompletionCriterion(OfflineCriterion):
+
+    """
+    Offline RouteCompletionTest. The directions of the route are the ones of the route itself,
+    as the lanes of the map are unknown, and the distance to its target is measured in 2D
+    """
+
+    DISTANCE_THRESHOLD = 10.0  # meters
+    WINDOWS_SIZE = 2
+
+    def __init__(self, route, name="RouteCompletionTest"):
+        super(RouteCompletionCriterion, self).__init__(name, 100)
+        self._route_geometry = RouteGeometry(route)
+        self._percentage_route_completed = 0.0
+
+    def _evaluate(self, trajectory):
+        geometry = self._route_geometry
+        target_distances = np.linalg.norm(trajectory.positions[:, :2] - geometry.points[-1, :2], axis=1)
+
+        traffic_event = TrafficEvent(event_type=TrafficEventType.ROUTE_COMPLETION)
+        self.list_traffic_events.append(traffic_event)
+        self._percentage_route_completed = 0.0
+
+        current_index = 0
+        for location, target_distance in zip(trajectory.positions, target_distances):
+            passed_index = geometry.get_passed_index(RoutePoint(*location), current_index, self.WINDOWS_SIZE)
+            if passed_index is not None:
+                current_index = passed_index
+                self._percentage_route_completed = 100.0 * float(geometry.accum_meters[current_index]) \
+                    / float(geometry.accum_meters[-1])
+                traffic_event.set_dict({'route_completed': self._percentage_route_completed})
+                traffic_event.set_message(
+                    "Agent has completed > {:.2f}% of the route".format(self._percentage_route_completed))
+
+            if self._percentage_route_completed > 99.0 and target_distance < self.DISTANCE_THRESHOLD:
+                route_completion_event = TrafficEvent(event_type=TrafficEventType.ROUTE_COMPLETED)
+                route_completion_event.set_message("Destination was successfully reached")
+                self.list_traffic_events.append(route_completion_event)
+                self.test_status = "SUCCESS"
+                self._percentage_route_completed = 100
+                break
+
+    def _terminate(self):
+        self.actual_value = round(self._percentage_route_completed, 2)
+        if self.test_status == "INIT":
+            self.test_status = "FAILURE"
+
+
+class OfflineScenarioResult(object):
+
+    """
+    Result of the offline evaluation of the criteria of an episode. It has the attributes of
+    the ScenarioManager used by the ResultOutputProvider, to write its results:
+
+        ResultOutputProvider(result, result.get_result(), stdout, filename, junit, json).write()
+    """
+
+    ScenarioTree = namedtuple('ScenarioTree', ['name'])
+
+    def __init__(self, name, trajectory, criteria, timeout=float('inf')):
+        self.start_system_time = time.time()
+        self.scenario_tree = self.ScenarioTree(name)
+        self.scenario = self
+        self.timeout = timeout
+        self.ego_vehicles = [trajectory.actor]
+        self.other_actors = []
+
+        self._criteria = [criterion.evaluate(trajectory) for criterion in criteria]
+
+        self.end_system_time = time.time()
+        self.scenario_duration_system = max(self.end_system_time - self.start_system_time, 1e-6)
+        self.scenario_duration_game = float(trajectory.times[-1]) if len(trajectory) > 0 else 0.0
+
+    def get_criteria(self):
+        """
+        Return the list of evaluated criteria
+        """
+        return self._criteria
+
+    def get_result(self):
+        """
+        Returns the global result, as ScenarioManager.analyze_scenario computes it
+        """
+        failure = False
+        result = "SUCCESS"
+        for criterion in self._criteria:
+            if (not criterion.optional and
+                    criterion.test_status != "SUCCESS" and
+                    criterion.test_status != "ACCEPTABLE"):
+                failure = True
+                result = "FAILURE"
+            elif criterion.test_status == "ACCEPTABLE":
+                result = "ACCEPTABLE"
+
+        if self.scenario_duration_game >= self.timeout and not failure:
+            result = "TIMEOUT"
+
+        return result
@@ -70,6 +70,7 @@ class ScenarioConfiguration(object):
     - town, where the scenario should be executed
     - name of the scenario (e.g. ControlLoss_1)
     - type is the class of scenario (e.g. ControlLoss)
+    - other parameters, which are used by the scenario (e.g. the start distance of an adversary)
     """
 
     trigger_points = []
@@ -84,3 +85,4 @@ class ScenarioConfiguration(object):
     friction = None
     subtype = None
     route_var_name = None
+    other_parameters = {}
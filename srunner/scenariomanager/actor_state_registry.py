@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the registry of the per-actor state shared between atomics
+(controllers and waypoint followers), also published on the py_trees Blackboard
+"""
+
+import py_trees
+
+
+class FollowerState(object):
+
+    """
+    State of the WaypointFollowers of an actor:
+    - running: unique ids of the running followers
+    - terminate: unique ids of the followers that have to terminate
+    """
+
+    __slots__ = ('running', 'terminate')
+
+    def __init__(self):
+        self.running = []
+        self.terminate = []
+
+
+class ActorStateRegistry(object):
+
+    """
+    This (static) class keeps the state shared by the atomics controlling the same actor,
+    indexed by the actor id, so that the atomics don't have to look it up by name
+    on the Blackboard every tick.
+
+    For compatibility, the same objects are published on the Blackboard under their previous
+    names ("ActorsWithController", "running_WF_actor_<id>" and "terminate_WF_actor_<id>"),
+    and they are always modified in place, so reading them from the Blackboard still works.
+    They should only be modified through this registry, though, as objects set on the
+    Blackboard under those names aren't seen by it.
+    """
+
+    _controllers = {}               # ActorControl of each actor id
+    _controllers_published = False  # Whether _controllers is published on the Blackboard
+    _followers = {}                 # FollowerState of each actor id
+
+    @staticmethod
+    def get_controllers():
+        """
+        Returns the dictionary of the ActorControl of each actor id
+        """
+        if not ActorStateRegistry._controllers_published:
+            py_trees.blackboard.Blackboard().set("ActorsWithController", ActorStateRegistry._controllers,
+                                                 overwrite=True)
+            ActorStateRegistry._controllers_published = True
+        return ActorStateRegistry._controllers
+
+    @staticmethod
+    def get_controller(actor_id):
+        """
+        Returns the ActorControl of an actor, or None if it has none
+        """
+        return ActorStateRegistry.get_controllers().get(actor_id)
+
+    @staticmethod
+    def reset_controllers():
+        """
+        Reset and forget all controllers
+        """
+        controllers = ActorStateRegistry.get_controllers()
+        for controller in controllers.values():
+            controller.reset()
+        controllers.clear()
+        py_trees.blackboard.Blackboard().set("ActorsWithController", controllers, overwrite=True)
+
+    @staticmethod
+    def get_follower_state(actor_id, create=False):
+        """
+        Returns the FollowerState of an actor. If it has none, it is created if create is True,
+        otherwise None is returned
+        """
+        state = ActorStateRegistry._followers.get(actor_id)
+        if state is None and create:
+            state = FollowerState()
+            ActorStateRegistry._followers[actor_id] = state
+            blackboard = py_trees.blackboard.Blackboard()
+            blackboard.set("running_WF_actor_{}".format(actor_id), state.running, overwrite=True)
+            blackboard.set("terminate_WF_actor_{}".format(actor_id), state.terminate, overwrite=True)
+        return state
+
+    @staticmethod
+    def cleanup():
+        """
+        Forget the state of all actors
+        """
+        ActorStateRegistry._controllers = {}
+        ActorStateRegistry._controllers_published = False
+        ActorStateRegistry._followers = {}
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a local planner following waypoint plans with many vehicles at once,
+computing the PID controls of all of them in a single vectorized step
+"""
+
+from collections import deque
+import math
+
+import numpy as np
+
+import carla
+from agents.navigation.local_planner import RoadOption
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
+
+
+class BatchedLocalPlanner(object):
+
+    """
+    Equivalent of the LocalPlanner of the CARLA agents (and its VehiclePIDController) for a group
+    of vehicles. Each vehicle has its own waypoint queue, purged as the LocalPlanner does, but the
+    lateral and longitudinal PIDs of all vehicles are computed together with numpy, from the
+    transforms and velocities cached by the CarlaDataProvider instead of querying each vehicle.
+
+    The vehicles without a plan follow their lane indefinitely, choosing randomly at junctions.
+
+    Args:
+        args_lateral (dict): K_P, K_I, K_D and dt of the lateral PID
+        args_longitudinal (dict): K_P, K_I, K_D and dt of the longitudinal PID
+    """
+
+    BUFFER_SIZE = 10             # Number of errors remembered by the PIDs
+    SAMPLING_RADIUS = 2.0        # Distance between the waypoints created on the fly [m]
+    MIN_QUEUE_LENGTH = 100       # Minimum number of waypoints of the vehicles without plan
+    BASE_MIN_DISTANCE = 3.0      # Distance at which a waypoint is reached, at 0 m/s [m]
+    MAX_THROTTLE = 0.75
+    MAX_BRAKE = 0.3
+    MAX_STEERING = 0.8
+    MAX_STEERING_CHANGE = 0.1    # Maximum steering change between steps
+
+    def __init__(self, args_lateral, args_longitudinal=None):
+        if args_longitudinal is None:
+            args_longitudinal = {'K_P': 1.0, 'K_I': 0.05, 'K_D': 0, 'dt': 1.0 / 20.0}
+        self._args_lateral = args_lateral
+        self._args_longitudinal = args_longitudinal
+
+        self._indexes = {}     # Index of each actor id in the arrays
+        self._queues = []      # Waypoint queue of each vehicle
+        self._create = []      # Whether to create waypoints on the fly for each vehicle
+        self._target_speeds = np.zeros(0)  # [km/h]
+        self._past_steering = np.zeros(0)
+        self._lateral_errors = np.zeros((0, self.BUFFER_SIZE))
+        self._longitudinal_errors = np.zeros((0, self.BUFFER_SIZE))
+        self._error_counts = np.zeros(0, dtype=int)
+
+    def add(self, actor, target_speed, plan=None):
+        """
+        Start following a plan (list of (carla.Waypoint, RoadOption)) with a vehicle, at the
+        target speed [km/h]. Without a plan, it follows its lane indefinitely
+        """
+        if plan is None:
+            location = CarlaDataProvider.get_location(actor) or actor.get_location()
+            waypoint = CarlaDataProvider.get_map().get_waypoint(location)
+            queue = deque([(waypoint, RoadOption.LANEFOLLOW)])
+        else:
+            queue = deque(plan)
+
+        index = self._indexes.get(actor.id)
+        if index is None:
+            index = len(self._queues)
+            self._indexes[actor.id] = index
+            self._queues.append(None)
+            self._create.append(False)
+            self._target_speeds = np.append(self._target_speeds, 0.0)
+            self._past_steering = np.append(self._past_steering, 0.0)
+            self._lateral_errors = np.vstack((self._lateral_errors, np.zeros(self.BUFFER_SIZE)))
+            self._longitudinal_errors = np.vstack((self._longitudinal_errors, np.zeros(self.BUFFER_SIZE)))
+            self._error_counts = np.append(self._error_counts, 0)
+
+        self._queues[index] = queue
+        self._create[index] = plan is None
+        self._target_speeds[index] = target_speed
+        self._past_steering[index] = actor.get_control().steer
+        self._lateral_errors[index] = 0.0
+        self._longitudinal_errors[index] = 0.0
+        self._error_counts[index] = 0
+
+    def done(self, actor):
+        """
+        Returns whether the vehicle reached the end of its plan
+        """
+        return not self._queues[self._indexes[actor.id]]
+
+    def _extend_queue(self, queue):
+        """
+        Add waypoints to the queue of a vehicle without plan
+        """
+        for _ in range(self.MIN_QUEUE_LENGTH):
+            next_waypoints = list(queue[-1][0].next(self.SAMPLING_RADIUS))
+            if not next_waypoints:
+                break
+            if len(next_waypoints) == 1:
+                queue.append((next_waypoints[0], RoadOption.LANEFOLLOW))
+            else:
+                choice = RandomStreams.get(RandomStreams.LOCAL_PLANNER).randint(len(next_waypoints))
+                queue.append((next_waypoints[choice], RoadOption.VOID))
+
+    def _purge_queue(self, queue, location, speed):
+        """
+        Remove the waypoints already reached by a vehicle
+        """
+        min_distance = self.BASE_MIN_DISTANCE + 0.5 * speed
+        while queue:
+            waypoint_location = queue[0][0].transform.location
+            distance = math.sqrt((waypoint_location.x - location.x) ** 2 + (waypoint_location.y - location.y) ** 2
+                                 + (waypoint_location.z - location.z) ** 2)
+            if distance >= (1.0 if len(queue) == 1 else min_distance):
+                break
+            queue.popleft()
+
+    def _pid(self, buffers, errors, args, indexes):
+        """
+        Append the errors of the vehicles at the indexes to their buffers, and return the PID outputs
+        """
+        rows = buffers[indexes]
+        rows[:, :-1] = rows[:, 1:]
+        rows[:, -1] = errors
+        buffers[indexes] = rows
+
+        enough = self._error_counts[indexes] >= 2
+        derivatives = np.where(enough, (rows[:, -1] - rows[:, -2]) / args['dt'], 0.0)
+        integrals = np.where(enough, rows.sum(axis=1) * args['dt'], 0.0)
+        return np.clip(args['K_P'] * errors + args['K_D'] * derivatives + args['K_I'] * integrals, -1.0, 1.0)
+
+    def run_step(self, actors):
+        """
+        Returns the carla.VehicleControl of each vehicle of the list for this step
+        """
+        rows = []
+        targets = []
+        positions = []
+        yaws = []
+        speeds = []
+        controls = []
+        for actor in actors:
+            index = self._indexes[actor.id]
+            transform = CarlaDataProvider.get_transform(actor)
+            speed = CarlaDataProvider.get_velocity(actor)
+            queue = self._queues[index]
+
+            if self._create[index] and len(queue) < self.MIN_QUEUE_LENGTH:
+                self._extend_queue(queue)
+            if transform is not None:
+                self._purge_queue(queue, transform.location, speed)
+
+            control = carla.VehicleControl()
+            control.hand_brake = False
+            control.manual_gear_shift = False
+            controls.append(control)
+            if not queue or transform is None:
+                control.steer = 0.0
+                control.throttle = 0.0
+                control.brake = 1.0
+                continue
+
+            target = queue[0][0].transform.location
+            rows.append((len(controls) - 1, index))
+            targets.append((target.x, target.y))
+            positions.append((transform.location.x, transform.location.y))
+            yaws.append(math.radians(transform.rotation.yaw))
+            speeds.append(speed)
+
+        if not rows:
+            return controls
+
+        indexes = np.array([index for _, index in rows])
+        self._error_counts[indexes] = np.minimum(self._error_counts[indexes] + 1, self.BUFFER_SIZE)
+
+        # Longitudinal control, in km/h as the LocalPlanner does
+        errors = self._target_speeds[indexes] - 3.6 * np.array(speeds)
+        accelerations = self._pid(self._longitudinal_errors, errors, self._args_longitudinal, indexes)
+
+        # Lateral control: signed angle between the vehicle and the direction to its target
+        forward = np.stack((np.cos(yaws), np.sin(yaws)), axis=1)
+        to_target = np.array(targets) - np.array(positions)
+        norms = np.linalg.norm(to_target, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosines = np.clip(np.einsum('ij,ij->i', forward, to_target) / norms, -1.0, 1.0)
+        angles = np.where(norms > 0, np.arccos(cosines), 1.0)
+        crosses = forward[:, 0] * to_target[:, 1] - forward[:, 1] * to_target[:, 0]
+        errors = np.where(crosses < 0, -angles, angles)
+        steering = self._pid(self._lateral_errors, errors, self._args_lateral, indexes)
+
+        # Steering changes cannot happen abruptly, and can't steer too much
+        past_steering = self._past_steering[indexes]
+        steering = np.clip(steering, past_steering - self.MAX_STEERING_CHANGE,
+                           past_steering + self.MAX_STEERING_CHANGE)
+        steering = np.clip(steering, -self.MAX_STEERING, self.MAX_STEERING)
+        self._past_steering[indexes] = steering
+
+        throttles = np.where(accelerations >= 0, np.minimum(accelerations, self.MAX_THROTTLE), 0.0)
+        brakes = np.where(accelerations >= 0, 0.0, np.minimum(np.abs(accelerations), self.MAX_BRAKE))
+
+        for i, (position, _) in enumerate(rows):
+            controls[position].throttle = float(throttles[i])
+            controls[position].brake = float(brakes[i])
+            controls[position].steer = float(steering[i])
+
+        return controls
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a global route planner whose graph is built once per map
+and resolution, and which remembers the routes it has traced
+"""
+
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import networkx as nx
+
+from agents.navigation.global_route_planner import GlobalRoutePlanner
+from agents.navigation.local_planner import RoadOption
+
+from srunner.scenariomanager.map_cache import MapCache
+
+
+class CachedRoutePlanner(object):
+
+    """
+    Wrapper of the GlobalRoutePlanner of a map, with a LRU cache of the routes it traced,
+    keyed by their endpoints rounded to KEY_RESOLUTION meters.
+
+    The planner remembers its last turn decision between routes, so that state is part of the
+    keys too, and it is restored when a route is taken from the cache. Use reset() to start
+    tracing a new sequence of routes, as a new planner would do.
+
+    Building the graph of the planner is slow, so it can be stored in a directory (see MapCache).
+    As the waypoints can't be serialized, they are stored as their OpenDRIVE coordinates.
+
+    Use CarlaDataProvider.get_route_planner(resolution) to get the planner of the current map.
+
+    Args:
+        wmap (carla.Map): map of the routes
+        resolution (float): distance between the waypoints of the routes [m]
+        cache_dir (str): directory where the graph is stored, or None
+        fingerprint (str): md5 of the OpenDRIVE of the map, computed from it if not given
+    """
+
+    MAX_ROUTES = 256       # Maximum number of routes remembered
+    KEY_RESOLUTION = 0.1   # Resolution of the endpoints of the routes remembered [m]
+    WAYPOINT_KEYS = ('entry_waypoint', 'exit_waypoint', 'change_waypoint')
+
+    def __init__(self, wmap, resolution, cache_dir=None, fingerprint=None):
+        self.resolution = resolution
+        self._map = wmap
+        self._routes = OrderedDict()
+
+        self._planner = None
+        file_name = None
+        if cache_dir:
+            if fingerprint is None:
+                fingerprint = MapCache.get_fingerprint(wmap)
+            file_name = MapCache.get_file_name(cache_dir, wmap, resolution)
+            self._planner = self._load(file_name, fingerprint)
+
+        if self._planner is None:
+            self._planner = GlobalRoutePlanner(wmap, resolution)
+            if file_name is not None:
+                self._save(file_name, fingerprint)
+
+    def reset(self):
+        """
+        Forget the last turn decision of the planner
+        """
+        self._planner._previous_decision = RoadOption.VOID  # pylint: disable=protected-access
+        self._planner._intersection_end_node = -1  # pylint: disable=protected-access
+
+    def _get_state(self):
+        """
+        Returns the state of the planner kept between routes
+        """
+        return (self._planner._previous_decision,  # pylint: disable=protected-access
+                self._planner._intersection_end_node)  # pylint: disable=protected-access
+
+    def _get_key(self, location):
+        """
+        Returns the rounded coordinates of a location
+        """
+        return (int(round(location.x / self.KEY_RESOLUTION)),
+                int(round(location.y / self.KEY_RESOLUTION)),
+                int(round(location.z / self.KEY_RESOLUTION)))
+
+    def trace_route(self, origin, destination):
+        """
+        Returns the list of (carla.Waypoint, RoadOption) from origin to destination (carla.Location),
+        as GlobalRoutePlanner.trace_route does
+        """
+        key = (self._get_key(origin), self._get_key(destination), self._get_state())
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            route, state = self._routes[key]
+            # pylint: disable=protected-access
+            self._planner._previous_decision, self._planner._intersection_end_node = state
+            # pylint: enable=protected-access
+            return list(route)
+
+        route = self._planner.trace_route(origin, destination)
+        self._routes[key] = (route, self._get_state())
+        if len(self._routes) > self.MAX_ROUTES:
+            self._routes.popitem(last=False)
+
+        return list(route)
+
+    def _save(self, file_name, fingerprint):
+        """
+        Store the graph of the planner
+        """
+        waypoints = []
+        indexes = {}
+
+        def get_index(waypoint):
+            if waypoint is None:
+                return None
+            if id(waypoint) not in indexes:
+                indexes[id(waypoint)] = len(waypoints)
+                waypoints.append((waypoint.road_id, waypoint.lane_id, waypoint.s))
+            return indexes[id(waypoint)]
+
+        planner = self._planner
+        topology = []
+        for segment in planner._topology:  # pylint: disable=protected-access
+            segment = dict(segment)
+            segment['entry'] = get_index(segment['entry'])
+            segment['exit'] = get_index(segment['exit'])
+            segment['path'] = [get_index(waypoint) for waypoint in segment['path']]
+            topology.append(segment)
+
+        edges = []
+        for n1, n2, attributes in planner._graph.edges(data=True):  # pylint: disable=protected-access
+            attributes = dict(attributes)
+            for key in self.WAYPOINT_KEYS:
+                if key in attributes:
+                    attributes[key] = get_index(attributes[key])
+            attributes['path'] = [get_index(waypoint) for waypoint in attributes['path']]
+            edges.append((n1, n2, attributes))
+
+        data = {
+            'waypoints': waypoints,
+            'topology': topology,
+            'nodes': list(planner._graph.nodes(data=True)),  # pylint: disable=protected-access
+            'edges': edges,
+            'id_map': planner._id_map,  # pylint: disable=protected-access
+            'road_id_to_edge': planner._road_id_to_edge,  # pylint: disable=protected-access
+        }
+
+        MapCache.save(file_name, fingerprint, data, "route planner graph")
+
+    def _load(self, file_name, fingerprint):
+        """
+        Returns a planner with the stored graph, or None if it is missing or outdated
+        """
+        data = MapCache.load(file_name, fingerprint, "route planner graph")
+        if data is None:
+            return None
+
+        try:
+            waypoints = [self._map.get_waypoint_xodr(road_id, lane_id, s)
+                         for road_id, lane_id, s in data['waypoints']]
+            if any(waypoint is None for waypoint in waypoints):
+                raise ValueError("some waypoints are not part of the map")
+
+            def get_waypoint(index):
+                return None if index is None else waypoints[index]
+
+            topology = []
+            for segment in data['topology']:
+                segment = dict(segment)
+                segment['entry'] = get_waypoint(segment['entry'])
+                segment['exit'] = get_waypoint(segment['exit'])
+                segment['path'] = [get_waypoint(index) for index in segment['path']]
+                topology.append(segment)
+
+            graph = nx.DiGraph()
+            graph.add_nodes_from(data['nodes'])
+            for n1, n2, attributes in data['edges']:
+                for key in self.WAYPOINT_KEYS:
+                    if key in attributes:
+                        attributes[key] = get_waypoint(attributes[key])
+                attributes['path'] = [get_waypoint(index) for index in attributes['path']]
+                graph.add_edge(n1, n2, **attributes)
+
+        except Exception as e:  # pylint: disable=broad-except
+            print("WARNING: The stored route planner graph could not be used: {}".format(e))
+            return None
+
+        # pylint: disable=protected-access
+        planner = GlobalRoutePlanner.__new__(GlobalRoutePlanner)
+        planner._sampling_resolution = self.resolution
+        planner._wmap = self._map
+        planner._topology = topology
+        planner._graph = graph
+        planner._id_map = data['id_map']
+        planner._road_id_to_edge = data['road_id_to_edge']
+        planner._intersection_end_node = -1
+        planner._previous_decision = RoadOption.VOID
+        # pylint: enable=protected-access
+        return planner
@@ -12,14 +12,23 @@ local buffers to avoid blocking calls to CARLA
 
 from __future__ import print_function
 
+from fnmatch import fnmatch
 import math
 import re
-from numpy import random
 from six import iteritems
 import numpy as np
 
 import carla
 
+from srunner.scenariomanager.actor_state_registry import ActorStateRegistry
+from srunner.scenariomanager.cached_route_planner import CachedRoutePlanner
+from srunner.scenariomanager.collision_manager import CollisionManager
+from srunner.scenariomanager.junction_table import JunctionTable
+from srunner.scenariomanager.lane_type_grid import LaneTypeGrid
+from srunner.scenariomanager.map_cache import MapCache
+from srunner.scenariomanager.random_streams import RandomStreams
+from srunner.scenariomanager.route_geometry import RouteGeometry
+
 
 def calculate_velocity(actor):
     """
@@ -52,6 +61,11 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
     _actor_transform_map = {}
     _traffic_light_map = {}
     _carla_actor_pool = {}
+    _parked_actors = {}
+    _parking_index = 0
+    PARKING_HEIGHT = -500.0   # Height at which the parked actors are kept, out of sight [m]
+    PARKING_SPACING = 10.0    # Distance between the parked actors [m]
+    _actor_pool_size = 0      # Maximum number of actors parked when removed, instead of destroyed
     _global_osc_parameters = {}
     _client = None
     _world = None
@@ -61,14 +75,25 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
     _spawn_index = 0
     _blueprint_library = None
     _ego_vehicle_route = None
+    _route_geometries = {}
+    _route_geometries_by_id = {}
+    _waypoint_cache = {}
+    _lane_type_grid = None
+    _lane_type_grid_fingerprint = None
+    _lane_types = {}
+    _route_planners = {}
+    _map_fingerprints = {}
+    _route_planner_dir = None
+    _junction_tables = {}
     _traffic_manager_port = 8000
     _random_seed = 2000
-    _rng = random.RandomState(_random_seed)
+    _rng = RandomStreams.get(RandomStreams.SPAWNING)
 
     # For saving later to waymo format
     _actor_history = {}
     _actor_id_type_map = {}  # We also want ID and Type
     _num_steps = 0
+    _actor_states = None  # Arrays of the last states of the history, built on demand
 
     _actor_state_keys = [
         "state/x",
@@ -149,6 +174,9 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             if actor is not None and actor.is_alive:
                 CarlaDataProvider._actor_transform_map[actor] = actor.get_transform()
 
+        CarlaDataProvider._waypoint_cache.clear()
+        CarlaDataProvider._actor_states = None
+
         world = CarlaDataProvider._world
         if world is None:
             print("WARNING: CarlaDataProvider couldn't find the world")
@@ -161,6 +189,19 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         for key in CarlaDataProvider._actor_state_keys:
             CarlaDataProvider._actor_history[actor_id][key] = []
 
+        # The actor didn't exist during the previous steps
+        for _ in range(CarlaDataProvider._num_steps):
+            CarlaDataProvider._append_invalid_state(CarlaDataProvider._actor_history[actor_id])
+
+    @staticmethod
+    def _append_invalid_state(history):
+        """
+        Append an invalid state to the history of an actor, for the steps at which it isn't part of
+        the simulation (not spawned yet, parked or destroyed)
+        """
+        for key in CarlaDataProvider._actor_state_keys:
+            history[key].append(0 if key == "state/valid" else -1.0)
+
     @staticmethod
     def _store_history():
         actor_history = CarlaDataProvider._actor_history
@@ -218,8 +259,47 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
 
             # print(actor_id, "storing_history", len(CarlaDataProvider._actor_history[actor_id]["state/x"]))
 
+        # Actors parked or destroyed at this step
+        for actor_id, history in actor_history.items():
+            if actor_id not in CarlaDataProvider._carla_actor_pool:
+                CarlaDataProvider._append_invalid_state(history)
+
         CarlaDataProvider._num_steps += 1
 
+    @staticmethod
+    def get_actor_states():
+        """
+        Returns the states of all registered actors at the current tick, from their history,
+        as a dictionary of numpy arrays:
+        - ids: (N,) ids of the actors
+        - positions: (N, 2) positions [m]
+        - yaws: (N,) yaws of their bounding boxes [rad]
+        - extents: (N, 2) half length and width of their bounding boxes [m]
+        - velocities: (N, 2) velocities [m/s]
+        """
+        if CarlaDataProvider._actor_states is None:
+            ids = []
+            states = []
+            for actor_id in CarlaDataProvider._carla_actor_pool:
+                history = CarlaDataProvider._actor_history.get(actor_id)
+                if not history or not history["state/x"]:
+                    continue
+                ids.append(actor_id)
+                states.append([history[key][-1] for key in ("state/x", "state/y", "state/bbox_yaw", "state/length",
+                                                            "state/width", "state/velocity_x", "state/velocity_y")])
+
+            # The y axis of the history is the opposite of CARLA's one
+            states = np.array(states, dtype=float).reshape(-1, 7)
+            CarlaDataProvider._actor_states = {
+                "ids": np.array(ids, dtype=np.int64),
+                "positions": np.stack((states[:, 0], -states[:, 1]), axis=1),
+                "yaws": states[:, 2],
+                "extents": states[:, 3:5] / 2.0,
+                "velocities": np.stack((states[:, 5], -states[:, 6]), axis=1),
+            }
+
+        return CarlaDataProvider._actor_states
+
     @staticmethod
     def get_velocity(actor):
         """
@@ -311,6 +391,97 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
 
         return CarlaDataProvider._map
 
+    @staticmethod
+    def get_waypoint(location, project_to_road=True, lane_type=carla.LaneType.Driving):
+        """
+        Get the waypoint of a location, as carla.Map.get_waypoint does.
+        The waypoints are cached until the next tick, so that all criteria
+        querying the same location (e.g. of the same actor) share the query
+        """
+        key = (round(location.x, 2), round(location.y, 2), round(location.z, 2), project_to_road, int(lane_type))
+        if key not in CarlaDataProvider._waypoint_cache:
+            CarlaDataProvider._waypoint_cache[key] = CarlaDataProvider.get_map().get_waypoint(
+                location, project_to_road=project_to_road, lane_type=lane_type)
+        return CarlaDataProvider._waypoint_cache[key]
+
+    @staticmethod
+    def set_route_planner_dir(directory):
+        """
+        Set the directory where the graphs of the route planners are stored, to be reused by later runs
+        """
+        CarlaDataProvider._route_planner_dir = directory
+
+    @staticmethod
+    def get_route_planner(resolution, wmap=None):
+        """
+        Get the global route planner of a map (the current one by default) with the given resolution.
+        It is built once and shared by all its users, and remembers the routes it traced
+        (see CachedRoutePlanner)
+        """
+        if wmap is None:
+            wmap = CarlaDataProvider.get_map()
+
+        fingerprint = CarlaDataProvider.get_map_fingerprint(wmap)
+        key = (fingerprint, resolution)
+        if key not in CarlaDataProvider._route_planners:
+            CarlaDataProvider._route_planners[key] = CachedRoutePlanner(
+                wmap, resolution, CarlaDataProvider._route_planner_dir, fingerprint)
+        return CarlaDataProvider._route_planners[key]
+
+    @staticmethod
+    def get_map_fingerprint(wmap):
+        """
+        Returns the fingerprint of the OpenDRIVE of a map, which identifies it even among
+        maps with the same name (e.g. generated from OpenDRIVE files). It is computed once per map object,
+        until the cleanup of the provider
+        """
+        entry = CarlaDataProvider._map_fingerprints.get(id(wmap))
+        if entry is None or entry[0] is not wmap:
+            # Keep a reference to the map, so that its id isn't reused while it is stored
+            entry = (wmap, MapCache.get_fingerprint(wmap))
+            CarlaDataProvider._map_fingerprints[id(wmap)] = entry
+        return entry[1]
+
+    @staticmethod
+    def get_next_junction(waypoint, wmap=None):
+        """
+        Get the next junction of a waypoint following its lane, as a JunctionInfo (its id and the
+        distances to its entry and exit), or None if there is none. It is looked up in the junction
+        table of the map (the current one by default), built once and stored with the route planners
+        """
+        if wmap is None:
+            wmap = CarlaDataProvider.get_map()
+
+        fingerprint = CarlaDataProvider.get_map_fingerprint(wmap)
+        if fingerprint not in CarlaDataProvider._junction_tables:
+            CarlaDataProvider._junction_tables[fingerprint] = JunctionTable.from_map(
+                wmap, CarlaDataProvider._route_planner_dir, fingerprint)
+        return CarlaDataProvider._junction_tables[fingerprint].get_next_junction(waypoint)
+
+    @staticmethod
+    def get_lane_type(location):
+        """
+        Get the lane type at a location, and whether it is part of a junction, as the waypoint of
+        get_waypoint(location, lane_type=carla.LaneType.Any) would have them. The location is also
+        inside that lane, as if get_waypoint(location, project_to_road=False) were used.
+
+        The lane types are looked up in a rasterized grid of the town (see LaneTypeGrid), built
+        (or loaded from the route planner cache directory) at the first call, and kept while the
+        map doesn't change. Returns None if the location
+        isn't known by the grid (e.g. at the border of a lane), and the map has to be queried
+        """
+        wmap = CarlaDataProvider.get_map()
+        fingerprint = CarlaDataProvider.get_map_fingerprint(wmap)
+        if CarlaDataProvider._lane_type_grid_fingerprint != fingerprint:
+            CarlaDataProvider._lane_type_grid, CarlaDataProvider._lane_types = LaneTypeGrid.from_map(
+                wmap, cache_dir=CarlaDataProvider._route_planner_dir, fingerprint=fingerprint)
+            CarlaDataProvider._lane_type_grid_fingerprint = fingerprint
+
+        lane = CarlaDataProvider._lane_type_grid.get_lane_type(location)
+        if lane is None:
+            return None
+        return CarlaDataProvider._lane_types[lane[0]], lane[1]
+
     @staticmethod
     def is_sync_mode():
         """
@@ -462,15 +633,19 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             location = CarlaDataProvider.get_location(actor)
 
         waypoint = CarlaDataProvider.get_map().get_waypoint(location)
-        # Create list of all waypoints until next intersection
-        list_of_waypoints = []
-        while waypoint and not waypoint.is_intersection:
-            list_of_waypoints.append(waypoint)
-            waypoint = waypoint.next(2.0)[0]
-
-        # If the list is empty, the actor is in an intersection
-        if not list_of_waypoints:
+        junction = CarlaDataProvider.get_next_junction(waypoint)
+
+        # The actor is in an intersection, or there is none ahead
+        if junction is None or junction.in_junction:
             return None
+        return CarlaDataProvider.get_junction_traffic_light(junction)
+
+    @staticmethod
+    def get_junction_traffic_light(junction):
+        """
+        returns the traffic light controlling the entry of a junction (a JunctionInfo of get_next_junction)
+        """
+        junction_location = JunctionTable.get_junction_location(junction)
 
         relevant_traffic_light = None
         distance_to_relevant_traffic_light = float("inf")
@@ -479,7 +654,7 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             if hasattr(traffic_light, 'trigger_volume'):
                 tl_t = CarlaDataProvider._traffic_light_map[traffic_light]
                 transformed_tv = tl_t.transform(traffic_light.trigger_volume.location)
-                distance = carla.Location(transformed_tv).distance(list_of_waypoints[-1].transform.location)
+                distance = carla.Location(transformed_tv).distance(junction_location)
 
                 if distance < distance_to_relevant_traffic_light:
                     relevant_traffic_light = traffic_light
@@ -504,6 +679,39 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         """
         return CarlaDataProvider._ego_vehicle_route
 
+    @staticmethod
+    def get_route_geometry(route):
+        """
+        returns the RouteGeometry of a route (list of (location or transform, RoadOption)).
+        It is built once per route and shared by all its users.
+
+        The geometries are first looked up by the identity of the route list, so that calling this
+        every tick is cheap. Only new lists are compared by their points, to share the geometry of copies
+        """
+        route_id = id(route)
+        entry = CarlaDataProvider._route_geometries_by_id.get(route_id)
+        if entry is not None and entry[0] is route:
+            return entry[1]
+
+        key = RouteGeometry.get_key(route)
+        if key not in CarlaDataProvider._route_geometries:
+            CarlaDataProvider._route_geometries[key] = RouteGeometry(route, CarlaDataProvider.get_map())
+        geometry = CarlaDataProvider._route_geometries[key]
+
+        # Keep a reference to the route, so that its id isn't reused while it is stored
+        CarlaDataProvider._route_geometries_by_id[route_id] = (route, geometry)
+        return geometry
+
+    @staticmethod
+    def set_random_seed(seed, job_id=0, repetition=0):
+        """
+        Set the seed of the random streams (see RandomStreams) used by the provider,
+        the scenarios and the atomics
+        """
+        CarlaDataProvider._random_seed = seed
+        RandomStreams.set_seed(seed, job_id, repetition)
+        CarlaDataProvider._rng = RandomStreams.get(RandomStreams.SPAWNING)
+
     @staticmethod
     def generate_spawn_points():
         """
@@ -625,7 +833,13 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
                           safe_blueprint=False, tick=True):
         """
         This method tries to create a new actor, returning it if successful (None otherwise).
+        A matching parked actor is used instead, if there is one.
         """
+        if not random_location and color is None and not safe_blueprint:
+            actor = CarlaDataProvider.request_parked_actor(model, spawn_point, rolename, autopilot)
+            if actor is not None:
+                return actor
+
         blueprint = CarlaDataProvider.create_blueprint(model, rolename, color, actor_category, safe_blueprint)
 
         if random_location:
@@ -672,6 +886,8 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         This method tries to series of actor in batch. If this was successful,
         the new actors are returned, None otherwise.
 
+        Matching parked actors are used instead of spawning new ones, if there are any.
+
         param:
         - actor_list: list of ActorConfigurationData
         """
@@ -684,10 +900,18 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         SetVehicleLightState = carla.command.SetVehicleLightState  # pylint: disable=invalid-name
 
         batch = []
+        parked_actors = {}
 
         CarlaDataProvider.generate_spawn_points()
 
-        for actor in actor_list:
+        for i, actor in enumerate(actor_list):
+
+            if not actor.random_location and actor.color is None and not actor.args and not safe_blueprint:
+                parked_actor = CarlaDataProvider.request_parked_actor(
+                    actor.model, actor.transform, actor.rolename, actor.autopilot)
+                if parked_actor is not None:
+                    parked_actors[i] = parked_actor
+                    continue
 
             # Get the blueprint
             blueprint = CarlaDataProvider.create_blueprint(
@@ -733,13 +957,30 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
 
             batch.append(command)
 
-        actors = CarlaDataProvider.handle_actor_batch(batch, tick)
+        actors = CarlaDataProvider.handle_actor_batch(batch, tick) if batch or not parked_actors else []
         for actor in actors:
             if actor is None:
                 continue
             CarlaDataProvider._carla_actor_pool[actor.id] = actor
             CarlaDataProvider.register_actor(actor)
 
+        return CarlaDataProvider._merge_parked_actors(actors, parked_actors, len(actor_list))
+
+    @staticmethod
+    def _merge_parked_actors(spawned_actors, parked_actors, amount):
+        """
+        Returns the actors of a request in order, from the spawned actors and the
+        parked actors used instead, indexed by their position in the request
+        """
+        if not parked_actors:
+            return spawned_actors
+
+        actors = []
+        spawned_actors = iter(spawned_actors)
+        for i in range(amount):
+            actor = parked_actors[i] if i in parked_actors else next(spawned_actors, None)
+            if actor is not None:
+                actors.append(actor)
         return actors
 
     @staticmethod
@@ -753,7 +994,8 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         This makes actor spawning easier but reduces the amount of configurability.
 
         Some parameters are the same for all actors (rolename, autopilot and random location)
-        while others are randomized (color)
+        while others are randomized (color). Matching parked actors are used instead of spawning
+        new ones, if there are any
         """
 
         SpawnActor = carla.command.SpawnActor  # pylint: disable=invalid-name
@@ -763,11 +1005,9 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         CarlaDataProvider.generate_spawn_points()
 
         batch = []
+        parked_actors = {}
 
         for i in range(amount):
-            # Get vehicle by model
-            blueprint = CarlaDataProvider.create_blueprint(model, rolename, safe=safe_blueprint)
-
             if random_location:
                 if CarlaDataProvider._spawn_index >= len(CarlaDataProvider._spawn_points):
                     print("No more spawn points to use. Spawned {} actors out of {}".format(i + 1, amount))
@@ -784,18 +1024,26 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
                     break
 
             if spawn_point:
+                if not safe_blueprint:
+                    parked_actor = CarlaDataProvider.request_parked_actor(model, spawn_point, rolename, autopilot)
+                    if parked_actor is not None:
+                        parked_actors[i] = parked_actor
+                        continue
+
+                # Get vehicle by model
+                blueprint = CarlaDataProvider.create_blueprint(model, rolename, safe=safe_blueprint)
                 batch.append(SpawnActor(blueprint, spawn_point).then(
                     SetAutopilot(FutureActor, autopilot,
                                  CarlaDataProvider._traffic_manager_port)))
 
-        actors = CarlaDataProvider.handle_actor_batch(batch, tick)
+        actors = CarlaDataProvider.handle_actor_batch(batch, tick) if batch or not parked_actors else []
         for actor in actors:
             if actor is None:
                 continue
             CarlaDataProvider._carla_actor_pool[actor.id] = actor
             CarlaDataProvider.register_actor(actor)
 
-        return actors
+        return CarlaDataProvider._merge_parked_actors(actors, parked_actors, amount)
 
     @staticmethod
     def get_actors():
@@ -841,9 +1089,12 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
     @staticmethod
     def remove_actor_by_id(actor_id):
         """
-        Remove an actor from the pool using its ID
+        Remove an actor from the pool using its ID.
+        It is parked instead of destroyed if the actor pool has room for it
         """
         if actor_id in CarlaDataProvider._carla_actor_pool:
+            if CarlaDataProvider._recycle_actor(CarlaDataProvider._carla_actor_pool[actor_id]):
+                return
             CarlaDataProvider._carla_actor_pool[actor_id].destroy()
             CarlaDataProvider._carla_actor_pool[actor_id] = None
             CarlaDataProvider._carla_actor_pool.pop(actor_id)
@@ -851,18 +1102,156 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             print("Trying to remove a non-existing actor id {}".format(actor_id))
 
     @staticmethod
-    def remove_actors_in_surrounding(location, distance):
+    def remove_actors_in_surrounding(location, distance, park=False):
         """
         Remove all actors from the pool that are closer than distance to the
-        provided location
+        provided location. If park is True, they are parked instead of destroyed,
+        otherwise they are only parked if the actor pool has room for them
         """
-        for actor_id in CarlaDataProvider._carla_actor_pool.copy():
-            if CarlaDataProvider._carla_actor_pool[actor_id].get_location().distance(location) < distance:
-                CarlaDataProvider._carla_actor_pool[actor_id].destroy()
-                CarlaDataProvider._carla_actor_pool.pop(actor_id)
+        for actor in CarlaDataProvider.get_actors_in_radius(location, distance):
+            if actor.id not in CarlaDataProvider._carla_actor_pool:
+                continue
+            if park:
+                CarlaDataProvider.park_actor(actor)
+            elif not CarlaDataProvider._recycle_actor(actor):
+                actor.destroy()
+                CarlaDataProvider._carla_actor_pool.pop(actor.id)
 
-        # Remove all keys with None values
-        CarlaDataProvider._carla_actor_pool = dict({k: v for k, v in CarlaDataProvider._carla_actor_pool.items() if v})
+    @staticmethod
+    def get_actors_in_radius(location, radius):
+        """
+        Returns the registered actors closer than radius to the location,
+        using their locations cached at the last tick
+        """
+        actors = []
+        for actor, actor_location in CarlaDataProvider._actor_location_map.items():
+            if actor_location is None or not actor.is_alive:
+                continue
+            if (actor_location.x - location.x) ** 2 + (actor_location.y - location.y) ** 2 + \
+                    (actor_location.z - location.z) ** 2 < radius ** 2:
+                actors.append(actor)
+        return actors
+
+    @staticmethod
+    def _get_parking_transform():
+        """
+        Returns a free transform far below the map, where parked actors are kept out of sight
+        """
+        index = CarlaDataProvider._parking_index
+        CarlaDataProvider._parking_index += 1
+        return carla.Transform(carla.Location(x=CarlaDataProvider.PARKING_SPACING * (index % 100),
+                                              y=CarlaDataProvider.PARKING_SPACING * (index // 100),
+                                              z=CarlaDataProvider.PARKING_HEIGHT))
+
+    @staticmethod
+    def set_actor_pool_size(size):
+        """
+        Set the maximum number of parked actors. While there is room for them, the vehicles and walkers
+        removed from the pool are parked instead of destroyed, to be reused by later requests
+        """
+        CarlaDataProvider._actor_pool_size = size
+
+    @staticmethod
+    def _recycle_actor(actor):
+        """
+        Park an actor removed from the pool, if it can be reused and the actor pool has room for it.
+        Returns whether it was parked
+        """
+        if len(CarlaDataProvider._parked_actors) >= CarlaDataProvider._actor_pool_size:
+            return False
+        if not actor.type_id.startswith(('vehicle.', 'walker.')) or not actor.is_alive:
+            return False
+        if actor.attributes.get('role_name') == 'hero':
+            return False
+
+        CarlaDataProvider.park_actor(actor)
+        return True
+
+    @staticmethod
+    def park_actor(actor):
+        """
+        Remove an actor from the pool without destroying it. It is moved out of sight with its
+        physics disabled, and can be used again with request_parked_actor
+        """
+        SetSimulatePhysics = carla.command.SetSimulatePhysics  # pylint: disable=invalid-name
+        ApplyTransform = carla.command.ApplyTransform  # pylint: disable=invalid-name
+        SetAutopilot = carla.command.SetAutopilot  # pylint: disable=invalid-name
+
+        batch = [SetSimulatePhysics(actor, False),
+                 ApplyTransform(actor, CarlaDataProvider._get_parking_transform())]
+        if actor.type_id.startswith('vehicle.'):
+            batch.append(SetAutopilot(actor, False, CarlaDataProvider._traffic_manager_port))
+            batch.append(carla.command.ApplyVehicleControl(actor, carla.VehicleControl()))
+        CarlaDataProvider._client.apply_batch(batch)
+
+        CarlaDataProvider._carla_actor_pool.pop(actor.id, None)
+        CarlaDataProvider._actor_velocity_map.pop(actor, None)
+        CarlaDataProvider._actor_location_map.pop(actor, None)
+        CarlaDataProvider._actor_transform_map.pop(actor, None)
+        CarlaDataProvider._parked_actors[actor.id] = actor
+
+    @staticmethod
+    def is_parked(actor):
+        """
+        Returns whether an actor is parked
+        """
+        return actor.id in CarlaDataProvider._parked_actors
+
+    @staticmethod
+    def create_parked_actors(model, amount, rolename='scenario', safe_blueprint=False):
+        """
+        Spawn, in a single batch, several parked actors of the model (with randomized blueprints
+        if the model has wildcards), to be used later with request_parked_actor
+        """
+        SpawnActor = carla.command.SpawnActor  # pylint: disable=invalid-name
+        SetSimulatePhysics = carla.command.SetSimulatePhysics  # pylint: disable=invalid-name
+        FutureActor = carla.command.FutureActor  # pylint: disable=invalid-name
+
+        batch = []
+        for _ in range(amount):
+            blueprint = CarlaDataProvider.create_blueprint(model, rolename, safe=safe_blueprint)
+            batch.append(SpawnActor(blueprint, CarlaDataProvider._get_parking_transform()).then(
+                SetSimulatePhysics(FutureActor, False)))
+
+        actors = CarlaDataProvider.handle_actor_batch(batch, tick=False)
+        for actor in actors:
+            if actor is not None:
+                CarlaDataProvider._parked_actors[actor.id] = actor
+        return actors
+
+    @staticmethod
+    def request_parked_actor(model, spawn_point, rolename=None, autopilot=False):
+        """
+        Take a parked actor matching the model (possibly with wildcards) and the rolename (if given)
+        out of the parking, and move it to the spawn point. Returns it, or None if there is no such actor.
+
+        Its cached transform is set to the spawn point, as it is only moved at the next tick
+        """
+        actor = None
+        for parked_actor in CarlaDataProvider._parked_actors.values():
+            if not fnmatch(parked_actor.type_id, model):
+                continue
+            if rolename is not None and parked_actor.attributes.get('role_name') != rolename:
+                continue
+            actor = parked_actor
+            break
+        if actor is None:
+            return None
+
+        # As done when spawning, slightly lift the actor to avoid collisions with the ground
+        transform = carla.Transform(carla.Location(spawn_point.location.x, spawn_point.location.y,
+                                                   spawn_point.location.z + 0.2), spawn_point.rotation)
+        batch = [carla.command.ApplyTransform(actor, transform), carla.command.SetSimulatePhysics(actor, True)]
+        if autopilot and actor.type_id.startswith('vehicle.'):
+            batch.append(carla.command.SetAutopilot(actor, True, CarlaDataProvider._traffic_manager_port))
+        CarlaDataProvider._client.apply_batch(batch)
+
+        CarlaDataProvider._parked_actors.pop(actor.id)
+        CarlaDataProvider._carla_actor_pool[actor.id] = actor
+        CarlaDataProvider.register_actor(actor)
+        CarlaDataProvider._actor_location_map[actor] = transform.location
+        CarlaDataProvider._actor_transform_map[actor] = transform
+        return actor
 
     @staticmethod
     def get_traffic_manager_port():
@@ -884,13 +1273,20 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         """
         Cleanup and remove all entries from all dictionaries
         """
+        CollisionManager.cleanup()
+        ActorStateRegistry.cleanup()
+
         DestroyActor = carla.command.DestroyActor  # pylint: disable=invalid-name
         batch = []
 
-        for actor_id in CarlaDataProvider._carla_actor_pool.copy():
-            actor = CarlaDataProvider._carla_actor_pool[actor_id]
-            if actor is not None and actor.is_alive:
-                batch.append(DestroyActor(actor))
+        actors = list(CarlaDataProvider._carla_actor_pool.values()) + list(CarlaDataProvider._parked_actors.values())
+        for actor in actors:
+            try:
+                if actor is not None and actor.is_alive:
+                    batch.append(DestroyActor(actor))
+            except RuntimeError:
+                # The server was lost, and its actors with it
+                pass
 
         if CarlaDataProvider._client:
             try:
@@ -906,14 +1302,22 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         CarlaDataProvider._actor_transform_map.clear()
         CarlaDataProvider._traffic_light_map.clear()
         CarlaDataProvider._map = None
+        CarlaDataProvider._map_fingerprints = {}
         CarlaDataProvider._world = None
         CarlaDataProvider._sync_flag = False
         CarlaDataProvider._ego_vehicle_route = None
+        CarlaDataProvider._route_geometries = {}
+        CarlaDataProvider._route_geometries_by_id = {}
+        CarlaDataProvider._waypoint_cache = {}
+        CarlaDataProvider._actor_states = None
         CarlaDataProvider._carla_actor_pool = {}
+        CarlaDataProvider._parked_actors = {}
+        CarlaDataProvider._parking_index = 0
         CarlaDataProvider._client = None
         CarlaDataProvider._spawn_points = None
         CarlaDataProvider._spawn_index = 0
-        CarlaDataProvider._rng = random.RandomState(CarlaDataProvider._random_seed)
+        RandomStreams.reset()
+        CarlaDataProvider._rng = RandomStreams.get(RandomStreams.SPAWNING)
 
         # CarlaDataProvider._actor_history.clear()
         # CarlaDataProvider._actor_id_type_map.clear() #ToDO: cleanup
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a collision sensor shared by all the criteria
+checking the collisions of an actor
+"""
+
+from collections import deque
+import weakref
+
+import carla
+
+from srunner.scenariomanager.timer import GameTime
+
+
+class CollisionManager(object):
+
+    """
+    This (static) class spawns a single collision sensor per actor, and sends its
+    collisions to all the criteria listening to that actor.
+
+    The sensor's callback only buffers the events (appending to a deque is thread safe).
+    They are dispatched once per frame, by the first listener calling tick(actor), as a list
+    with a single event per collided object, as all events against the same object in a
+    frame happen at the same location of the actor.
+
+    The listeners are callbacks receiving that list. They are referenced weakly,
+    so they don't keep their criteria alive.
+    """
+
+    _sensors = {}    # Collision sensor of each actor id
+    _buffers = {}    # Events of each actor id, pending to be dispatched
+    _listeners = {}  # Weak references to the callbacks of each actor id
+    _frames = {}     # Last frame the events of each actor id were dispatched
+
+    @staticmethod
+    def register(actor, callback):
+        """
+        Send the collisions of the actor to the callback (a bound method),
+        spawning the actor's collision sensor if it has none
+        """
+        if actor.id not in CollisionManager._sensors:
+            world = actor.get_world()
+            blueprint = world.get_blueprint_library().find('sensor.other.collision')
+            sensor = world.spawn_actor(blueprint, carla.Transform(), attach_to=actor)
+
+            events = deque()
+            sensor.listen(events.append)
+
+            CollisionManager._sensors[actor.id] = sensor
+            CollisionManager._buffers[actor.id] = events
+            CollisionManager._listeners[actor.id] = []
+            CollisionManager._frames[actor.id] = None
+
+        CollisionManager._listeners[actor.id].append(weakref.WeakMethod(callback))
+
+    @staticmethod
+    def unregister(actor, callback):
+        """
+        Stop sending the collisions of the actor to the callback.
+        The sensor is destroyed once the actor has no listeners
+        """
+        listeners = CollisionManager._listeners.get(actor.id)
+        if listeners is None:
+            return
+
+        listeners[:] = [listener for listener in listeners if listener() not in (None, callback)]
+        if not listeners:
+            CollisionManager._remove(actor.id)
+
+    @staticmethod
+    def tick(actor):
+        """
+        Dispatch the collisions of the actor received since the last frame they were dispatched
+        """
+        if CollisionManager._frames.get(actor.id, GameTime.get_frame()) == GameTime.get_frame():
+            return
+        CollisionManager._frames[actor.id] = GameTime.get_frame()
+
+        events = CollisionManager._buffers[actor.id]
+        if not events:
+            return
+
+        unique_events = {}
+        for _ in range(len(events)):
+            event = events.popleft()
+            unique_events.setdefault((event.other_actor.id, event.other_actor.type_id), event)
+        unique_events = list(unique_events.values())
+
+        for listener in list(CollisionManager._listeners[actor.id]):
+            callback = listener()
+            if callback is not None:
+                callback(unique_events)
+
+    @staticmethod
+    def _remove(actor_id):
+        """
+        Destroy the sensor of an actor and forget its listeners
+        """
+        sensor = CollisionManager._sensors.pop(actor_id)
+        CollisionManager._buffers.pop(actor_id)
+        CollisionManager._listeners.pop(actor_id)
+        CollisionManager._frames.pop(actor_id)
+
+        try:
+            sensor.destroy()
+        except RuntimeError:
+            # The server was lost, and its actors with it
+            pass
+
+    @staticmethod
+    def cleanup():
+        """
+        Destroy all the collision sensors
+        """
+        for actor_id in list(CollisionManager._sensors):
+            CollisionManager._remove(actor_id)
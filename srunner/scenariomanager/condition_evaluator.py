@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a batched evaluation of the distance, time to arrival
+and velocity trigger conditions between actors
+"""
+
+import numpy as np
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.timer import GameTime
+
+
+class ConditionEvaluator(object):
+
+    """
+    This (static) class evaluates the measurements of all active trigger conditions at once.
+
+    The conditions register themselves when they start running, with the actors and the kind of
+    value they compare. The first condition asking for its value in a frame triggers the evaluation
+    of all of them, as a single vectorized pass over the locations and velocities of the actors,
+    and the rest of them just read their result. The conditions still compare the values with
+    their own operators.
+
+    Available kinds:
+    - DISTANCE: distance between the two actors, minus an offset (e.g. their extents) [m]
+    - TIME_TO_ARRIVAL: time for the actor to reach the other one (minus an offset), or
+        infinite if it is not faster than it [s]
+    - VELOCITY: velocity of the actor [m/s]
+    """
+
+    DISTANCE = 0
+    TIME_TO_ARRIVAL = 1
+    VELOCITY = 2
+
+    _conditions = {}  # Kind, actor id, other actor id and offset of each condition
+    _results = {}     # Value of each condition at the current frame
+    _frame = None
+
+    @staticmethod
+    def register(condition, kind, actor, other_actor=None, offset=0.0):
+        """
+        Evaluate the value of a condition every frame, until it is unregistered
+        """
+        other_id = actor.id if other_actor is None else other_actor.id
+        ConditionEvaluator._conditions[condition] = (kind, actor.id, other_id, offset)
+        ConditionEvaluator._results.pop(condition, None)
+
+    @staticmethod
+    def unregister(condition):
+        """
+        Stop evaluating the value of a condition
+        """
+        ConditionEvaluator._conditions.pop(condition, None)
+        ConditionEvaluator._results.pop(condition, None)
+
+    @staticmethod
+    def get_value(condition):
+        """
+        Returns the value of a registered condition at the current frame,
+        or None if the locations of its actors are unknown
+        """
+        if ConditionEvaluator._frame != GameTime.get_frame():
+            ConditionEvaluator._frame = GameTime.get_frame()
+            ConditionEvaluator._results = ConditionEvaluator._evaluate(list(ConditionEvaluator._conditions))
+        elif condition not in ConditionEvaluator._results:
+            # Registered after the evaluation of this frame
+            ConditionEvaluator._results.update(ConditionEvaluator._evaluate([condition]))
+
+        return ConditionEvaluator._results[condition]
+
+    @staticmethod
+    def _evaluate(conditions):
+        """
+        Returns the values of the given conditions
+        """
+        if not conditions:
+            return {}
+
+        # State of the actors
+        indexes = {}
+        positions = []
+        speeds = []
+        for actor, location in CarlaDataProvider._actor_location_map.items():  # pylint: disable=protected-access
+            indexes[actor.id] = len(positions)
+            positions.append((np.nan,) * 3 if location is None else (location.x, location.y, location.z))
+            speeds.append(CarlaDataProvider._actor_velocity_map.get(actor, 0.0))  # pylint: disable=protected-access
+        missing = len(positions)
+        positions = np.array(positions + [(np.nan,) * 3], dtype=float)
+        speeds = np.array(speeds + [0.0], dtype=float)
+
+        # Measurements of the conditions
+        specs = [ConditionEvaluator._conditions[condition] for condition in conditions]
+        kinds = np.array([spec[0] for spec in specs])
+        actors = np.array([indexes.get(spec[1], missing) for spec in specs])
+        others = np.array([indexes.get(spec[2], missing) for spec in specs])
+        offsets = np.array([spec[3] for spec in specs], dtype=float)
+
+        # Overlapping actors are at distance 0 (np.maximum keeps the NaN of the unknown locations)
+        distances = np.maximum(np.linalg.norm(positions[actors] - positions[others], axis=1) - offsets, 0.0)
+        relative_speeds = speeds[actors] - speeds[others]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            times = np.where(relative_speeds > 0, distances / relative_speeds, np.inf)
+
+        values = np.select([kinds == ConditionEvaluator.DISTANCE, kinds == ConditionEvaluator.TIME_TO_ARRIVAL],
+                           [distances, times], speeds[actors])
+        unknown = (kinds != ConditionEvaluator.VELOCITY) & np.isnan(distances)
+
+        return {condition: None if unknown[i] else float(values[i]) for i, condition in enumerate(conditions)}
+
+    @staticmethod
+    def cleanup():
+        """
+        Forget all conditions
+        """
+        ConditionEvaluator._conditions = {}
+        ConditionEvaluator._results = {}
+        ConditionEvaluator._frame = None
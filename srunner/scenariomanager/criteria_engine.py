@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides an engine evaluating the criteria of a scenario in a single
+pass per tick, outside of the scenario's behavior tree
+"""
+
+import py_trees
+
+
+class CriteriaEngine(object):
+
+    """
+    Evaluates a flat list of criteria once per tick, as the Parallel node of the criteria
+    would do, without the overhead of ticking them as part of the behavior tree
+    (generators, per node debug logging and status checks of the composites).
+
+    The criteria keep their state, so their results (status, test_status, actual_value,
+    traffic events...) are read from them as usual, e.g. by ResultOutputProvider.
+    The actor states are taken from the CarlaDataProvider, which updates them once per tick.
+
+    Args:
+        criteria (list): Criterion behaviours to be evaluated
+        policy (py_trees.common.ParallelPolicy): When the evaluation of the criteria ends,
+            as the policy of the Parallel node they belonged to
+    """
+
+    def __init__(self, criteria, policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE):
+        self.criteria = list(criteria)
+        self.policy = policy
+        self.status = py_trees.common.Status.INVALID
+
+    @staticmethod
+    def supports(criteria_tree):
+        """
+        Returns True if the criteria of the tree can be evaluated by the engine,
+        which is the case if all of them are direct children of a Parallel node
+        """
+        if not isinstance(criteria_tree, py_trees.composites.Parallel) or not criteria_tree.children:
+            return False
+        return all(not criterion.children for criterion in criteria_tree.children)
+
+    def tick(self):
+        """
+        Evaluate all criteria, returning the overall status
+        """
+        if self.status != py_trees.common.Status.RUNNING and self.status != py_trees.common.Status.INVALID:
+            return self.status
+
+        for criterion in self.criteria:
+            if criterion.status != py_trees.common.Status.RUNNING:
+                criterion.initialise()
+            new_status = criterion.update()
+            if new_status != py_trees.common.Status.RUNNING:
+                criterion.terminate(new_status)
+            criterion.status = new_status
+
+        statuses = [criterion.status for criterion in self.criteria]
+        new_status = py_trees.common.Status.RUNNING
+        if py_trees.common.Status.FAILURE in statuses:
+            new_status = py_trees.common.Status.FAILURE
+        elif self.policy == py_trees.common.ParallelPolicy.SUCCESS_ON_ALL:
+            if all(status == py_trees.common.Status.SUCCESS for status in statuses):
+                new_status = py_trees.common.Status.SUCCESS
+        elif py_trees.common.Status.SUCCESS in statuses:
+            new_status = py_trees.common.Status.SUCCESS
+
+        # Once finished, the criteria that are still running are interrupted
+        if new_status != py_trees.common.Status.RUNNING:
+            for criterion in self.criteria:
+                if criterion.status == py_trees.common.Status.RUNNING:
+                    criterion.terminate(py_trees.common.Status.INVALID)
+                    criterion.status = py_trees.common.Status.INVALID
+
+        self.status = new_status
+        return new_status
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a table of the distances from the lanes of a town to their
+next junction, used to locate the junctions ahead without stepping along the lanes
+"""
+
+from __future__ import print_function
+
+from collections import namedtuple
+import heapq
+
+import carla
+
+from srunner.scenariomanager.map_cache import MapCache
+
+JunctionInfo = namedtuple('JunctionInfo', ['in_junction', 'junction_id', 'entry_distance',
+                                           'exit_distance', 'entry_location'])
+JunctionInfo.__doc__ = """
+Next junction of a waypoint, following its lane:
+- in_junction: whether the waypoint is already part of the junction
+- junction_id: id of the junction
+- entry_distance: distance along the lanes to the junction, 0 if inside it [m]
+- exit_distance: distance along the lanes to the end of the junction [m]
+- entry_location: (x, y, z) location where the lane enters the junction
+"""
+
+
+class JunctionTable(object):
+
+    """
+    Distances to the next junction of all lane segments of a town, built once from its topology.
+
+    Each segment of the topology knows the distance from its end to the next junction entry
+    (and the length of the shortest lane through that junction), found with a search backwards
+    from the junctions along the lane graph. The distance of a waypoint is then its remaining
+    length along its segment, plus the distance of the segment.
+
+    Building the table only needs the topology of the town, but it can also be stored in a
+    directory (see MapCache), for later runs on the same town.
+
+    Use CarlaDataProvider.get_next_junction(waypoint) to use the table of the current town.
+
+    Args:
+        segments (list): list of dictionaries of the lane segments, with their 'road_id', 'lane_id',
+            'entry_s', 'exit_s', 'length', 'junction_id' (-1 if not part of a junction) and their
+            'entry' and 'exit' locations as (x, y, z)
+    """
+
+    NODE_RESOLUTION = 1.0  # Resolution of the locations connecting the segments [m]
+
+    def __init__(self, segments):
+        self._list = segments
+        self._segments = {}
+        self._entries = {}
+
+        for index, segment in enumerate(segments):
+            self._segments.setdefault((segment['road_id'], segment['lane_id']), []).append(index)
+            self._entries.setdefault(self._get_node(segment['entry']), []).append(index)
+
+        # Search backwards from the segments ending at a junction
+        self._next = [None] * len(segments)  # (distance to the entry, junction id, exit distance, entry location)
+        queue = []
+        predecessors = {}
+        for index, segment in enumerate(segments):
+            for successor in self._entries.get(self._get_node(segment['exit']), []):
+                predecessors.setdefault(successor, []).append(index)
+                if segment['junction_id'] < 0 and segments[successor]['junction_id'] >= 0:
+                    heapq.heappush(queue, (0.0, segments[successor]['length'], index,
+                                           segments[successor]['junction_id'], segment['exit']))
+
+        while queue:
+            distance, exit_length, index, junction_id, location = heapq.heappop(queue)
+            if self._next[index] is not None:
+                continue
+            self._next[index] = (distance, junction_id, exit_length, location)
+            for predecessor in predecessors.get(index, []):
+                if segments[predecessor]['junction_id'] < 0 and self._next[predecessor] is None:
+                    heapq.heappush(queue, (distance + segments[index]['length'], exit_length,
+                                           predecessor, junction_id, location))
+
+    def _get_node(self, location):
+        """
+        Returns the rounded coordinates of a location connecting segments
+        """
+        return tuple(int(round(value / self.NODE_RESOLUTION)) for value in location)
+
+    def __len__(self):
+        return len(self._list)
+
+    def _get_segment(self, waypoint):
+        """
+        Returns the index of the segment of a waypoint, or None if it is unknown
+        """
+        closest = None
+        closest_distance = float('inf')
+        for index in self._segments.get((waypoint.road_id, waypoint.lane_id), []):
+            segment = self._list[index]
+            low, high = sorted((segment['entry_s'], segment['exit_s']))
+            distance = max(low - waypoint.s, waypoint.s - high, 0.0)
+            if distance < closest_distance:
+                closest = index
+                closest_distance = distance
+        return closest
+
+    def get_next_junction(self, waypoint):
+        """
+        Returns the JunctionInfo of the next junction of a waypoint along its lane,
+        or None if there is none (or the lane is unknown)
+        """
+        index = self._get_segment(waypoint)
+        if index is None:
+            return None
+
+        segment = self._list[index]
+        remaining = min(abs(segment['exit_s'] - waypoint.s), segment['length'])
+        if segment['junction_id'] >= 0:
+            return JunctionInfo(True, segment['junction_id'], 0.0, remaining, segment['entry'])
+
+        if self._next[index] is None:
+            return None
+        distance, junction_id, exit_length, location = self._next[index]
+        return JunctionInfo(False, junction_id, remaining + distance, remaining + distance + exit_length, location)
+
+    @staticmethod
+    def get_junction_location(info):
+        """
+        Returns the entry location of a JunctionInfo as a carla.Location
+        """
+        return carla.Location(x=info.entry_location[0], y=info.entry_location[1], z=info.entry_location[2])
+
+    @staticmethod
+    def from_map(wmap, cache_dir=None, fingerprint=None):
+        """
+        Build the table of a town from its topology, or load it from cache_dir if it was stored there.
+        The fingerprint (md5 of the OpenDRIVE of the map) is computed from the map if not given
+        """
+        file_name = None
+        if cache_dir:
+            if fingerprint is None:
+                fingerprint = MapCache.get_fingerprint(wmap)
+            file_name = MapCache.get_file_name(cache_dir, wmap, "junctions")
+            segments = MapCache.load(file_name, fingerprint, "junction table")
+            if segments is not None:
+                return JunctionTable(segments)
+
+        segments = []
+        for entry, exit_ in wmap.get_topology():
+            entry_location = entry.transform.location
+            exit_location = exit_.transform.location
+            segments.append({
+                'road_id': entry.road_id,
+                'lane_id': entry.lane_id,
+                'entry_s': entry.s,
+                'exit_s': exit_.s,
+                'length': abs(exit_.s - entry.s),
+                'junction_id': entry.junction_id if entry.is_junction else -1,
+                'entry': (entry_location.x, entry_location.y, entry_location.z),
+                'exit': (exit_location.x, exit_location.y, exit_location.z),
+            })
+
+        if file_name is not None:
+            MapCache.save(file_name, fingerprint, segments, "junction table")
+        return JunctionTable(segments)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a lane frame following an actor, used to compare the
+longitudinal positions of locations along its lane without querying the map
+"""
+
+import numpy as np
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.route_geometry import RouteGeometry
+
+
+class LaneFrameTracker(object):
+
+    """
+    Tracks the lane of an actor: its centreline, sampled from BEHIND meters behind the actor up
+    to lookahead meters ahead of it, and the distance of the actor along it (its s-coordinate).
+
+    The centreline is only sampled again from the map when the actor gets close to its end,
+    or leaves its lane. In between, the actor and any other location are projected onto it,
+    only checking the segments close to their previous projections, so comparing their
+    longitudinal positions is just arithmetic on their s-coordinates. These are only valid
+    until the next update, as the origin of the centreline changes when it is sampled again.
+
+    Args:
+        actor (carla.Actor): tracked actor
+        lookahead (float): minimum length of the centreline ahead of the actor [m]
+        resolution (float): distance between the samples of the centreline [m]
+    """
+
+    LOOKAHEAD = 30.0   # Default length of the centreline ahead of the actor [m]
+    BEHIND = 10.0      # Length of the centreline behind the actor [m]
+
+    def __init__(self, actor, lookahead=LOOKAHEAD, resolution=1.0):
+        self._actor = actor
+        self._lookahead = lookahead
+        self._resolution = resolution
+
+        self._geometry = None
+        self._half_width = 0.0
+        self._indexes = {}
+        self.s = None
+
+    def _sample(self, location):
+        """
+        Sample the centreline of the lane at the location
+        """
+        self._geometry = None
+        self._indexes = {}
+
+        waypoint = CarlaDataProvider.get_map().get_waypoint(location)
+        if waypoint is None:
+            return
+
+        previous_waypoints = waypoint.previous(self.BEHIND)
+        start = previous_waypoints[0] if previous_waypoints else waypoint
+
+        points = [start.transform.location]
+        length = self.BEHIND + 2 * self._lookahead
+        for _ in range(int(length / self._resolution)):
+            next_waypoints = start.next(self._resolution)
+            if not next_waypoints:
+                break
+            start = next_waypoints[0]
+            points.append(start.transform.location)
+
+        if len(points) > 1:
+            self._geometry = RouteGeometry([(point, None) for point in points])
+            self._half_width = waypoint.lane_width / 2.0
+
+    def _project(self, location, slot):
+        """
+        Returns the projection of a location onto the centreline, checking the
+        segments close to the previous projection of the slot, if any
+        """
+        projection = self._geometry.project_near(location, self._indexes.get(slot))
+        if projection is not None and slot is not None:
+            self._indexes[slot] = projection.index
+        return projection
+
+    def update(self):
+        """
+        Update the s-coordinate of the actor, sampling the centreline again if needed.
+        Returns it, or None if the actor isn't on a lane
+        """
+        self.s = None
+        location = CarlaDataProvider.get_location(self._actor)
+        if location is None:
+            return None
+
+        projection = None
+        if self._geometry is not None:
+            projection = self._project(location, self._actor.id)
+            if (projection is None or abs(projection.lateral_offset) > self._half_width
+                    or projection.progress + self._lookahead > self._geometry.accum_meters[-1]):
+                projection = None
+
+        if projection is None:
+            self._sample(location)
+            if self._geometry is None:
+                return None
+            projection = self._project(location, self._actor.id)
+            if projection is None:
+                return None
+
+        self.s = projection.progress
+        return self.s
+
+    def get_s(self, location, slot=None):
+        """
+        Returns the s-coordinate of a location along the centreline of the actor, or None if unknown.
+        Locations tracked over time should use their own slot (e.g. their actor id), to only check
+        the segments close to their previous projection
+        """
+        if self._geometry is None:
+            return None
+        projection = self._project(location, slot)
+        return None if projection is None else projection.progress
+
+    def get_location(self, s):
+        """
+        Returns the (x, y, z) position of the centreline at an s-coordinate
+        """
+        accum_meters = self._geometry.accum_meters
+        return np.array([np.interp(s, accum_meters, self._geometry.points[:, i]) for i in range(3)])
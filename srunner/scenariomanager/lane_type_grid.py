@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a rasterized grid of the lane types of a town, used to
+know the lane type at a location without querying the map
+"""
+
+import math
+
+import numpy as np
+
+import carla
+
+from srunner.scenariomanager.map_cache import MapCache
+
+
+class LaneTypeGrid(object):
+
+    """
+    Rasterized lane types of a town, built once from the cross sections of its lanes.
+
+    The map returns the lane whose center is the closest one to a location, and only if the
+    location is inside it when it isn't projected to the road. So each lane covers the area
+    up to halfway to the centers of its neighbouring lanes, but never outside itself. Only the
+    cells whose neighbouring cells all have the same lane type, junction flag and a similar
+    height are kept, so the lanes' borders, overlapping lanes and the outside of the roads
+    are unknown, and have to be queried from the map.
+
+    Rasterizing a town takes some seconds, so the grid can be stored in a directory (see MapCache),
+    and loaded by later runs on the same town.
+
+    Use CarlaDataProvider.get_lane_type(location) to use the grid of the current town.
+
+    Args:
+        centers (array): (N, 3) positions of the centers of the lane samples
+        yaws (array): (N,) yaws of the lanes at the samples [deg]
+        left_extents, right_extents (array): (N,) lateral extents of the samples at each side [m]
+        lane_types (array): (N,) lane types of the samples, as integers
+        junctions (array): (N,) flags of the samples that are part of a junction, or None
+        length (float): length of the lanes covered by each sample [m]
+        cell_size (float): size of the cells of the grid [m]
+    """
+
+    CELL_SIZE = 0.5        # Size of the cells [m]
+    SAMPLE_DISTANCE = 1.0  # Distance between the lane samples [m]
+    MAX_HEIGHT = 1.0       # Maximum height difference between the samples of a cell, and to a location [m]
+
+    def __init__(self, centers, yaws, left_extents, right_extents, lane_types, junctions=None,
+                 length=SAMPLE_DISTANCE, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self._codes = np.zeros(0, dtype=np.int64)
+        self._types = np.zeros(0, dtype=np.int64)
+        self._junctions = np.zeros(0, dtype=bool)
+        self._heights = np.zeros(0)
+        self._origin = (0, 0)
+        self._width = 1
+
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        if len(centers) == 0:
+            return
+
+        # Points of the samples, every half cell along and across their lanes
+        yaws = np.radians(np.asarray(yaws, dtype=float))
+        forward = np.stack((np.cos(yaws), np.sin(yaws)), axis=1)
+        right = np.stack((-forward[:, 1], forward[:, 0]), axis=1)  # CARLA is left-handed
+
+        left_extents = np.asarray(left_extents, dtype=float)
+        right_extents = np.asarray(right_extents, dtype=float)
+        widths = left_extents + right_extents
+        along = np.arange(-length / 2.0, length / 2.0 + 1e-6, cell_size / 2.0)
+
+        # The junction flag is stored as the lowest bit of the lane types (which are powers of two)
+        junctions = np.zeros(len(centers), dtype=bool) if junctions is None else np.asarray(junctions, dtype=bool)
+        lane_codes = np.asarray(lane_types, dtype=np.int64) * 2 + junctions
+
+        # The number of points across a lane depends on its width, so the samples
+        # are processed in groups with the same number of them
+        counts = np.maximum(2, np.ceil(widths / (cell_size / 2.0)).astype(np.int64) + 1)
+        points = []
+        point_types = []
+        point_heights = []
+        for count in np.unique(counts):
+            group = np.flatnonzero(counts == count)
+            across = np.linspace(0.0, 1.0, count)
+            lateral = -left_extents[group, np.newaxis] + widths[group, np.newaxis] * across
+
+            group_points = (centers[group, np.newaxis, np.newaxis, :2]
+                            + along[np.newaxis, :, np.newaxis, np.newaxis] * forward[group, np.newaxis, np.newaxis, :]
+                            + lateral[:, np.newaxis, :, np.newaxis] * right[group, np.newaxis, np.newaxis, :])
+            shape = group_points.shape[:3]
+            points.append(group_points.reshape(-1, 2))
+            point_types.append(np.broadcast_to(lane_codes[group, np.newaxis, np.newaxis], shape).ravel())
+            point_heights.append(np.broadcast_to(centers[group, np.newaxis, np.newaxis, 2], shape).ravel())
+
+        points = np.concatenate(points)
+        point_types = np.concatenate(point_types)
+        point_heights = np.concatenate(point_heights)
+
+        # Cells of the points, aggregated
+        cells = np.floor(points / cell_size).astype(np.int64)
+        self._origin = (int(cells[:, 0].min()) - 1, int(cells[:, 1].min()) - 1)
+        self._width = int(cells[:, 1].max()) - self._origin[1] + 2
+        codes = self._get_codes(cells[:, 0], cells[:, 1])
+
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        point_types = point_types[order]
+        point_heights = point_heights[order]
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+
+        unique_codes = codes[starts]
+        min_types = np.minimum.reduceat(point_types, starts)
+        max_types = np.maximum.reduceat(point_types, starts)
+        min_heights = np.minimum.reduceat(point_heights, starts)
+        max_heights = np.maximum.reduceat(point_heights, starts)
+        pure = (min_types == max_types) & (max_heights - min_heights < self.MAX_HEIGHT)
+        cell_types = np.where(pure, min_types, -1)
+
+        # Only keep the cells surrounded by cells of the same type
+        kept = pure.copy()
+        for offset in (-self._width - 1, -self._width, -self._width + 1, -1, 1,
+                       self._width - 1, self._width, self._width + 1):
+            neighbours = np.searchsorted(unique_codes, unique_codes + offset)
+            neighbours = np.minimum(neighbours, len(unique_codes) - 1)
+            kept &= unique_codes[neighbours] == unique_codes + offset
+            kept &= cell_types[neighbours] == cell_types
+
+        self._codes = unique_codes[kept]
+        self._types = cell_types[kept] // 2
+        self._junctions = cell_types[kept] % 2 == 1
+        self._heights = ((min_heights + max_heights) / 2.0)[kept]
+
+    def _get_codes(self, rows, columns):
+        """
+        Returns the codes of cells, from their indexes
+        """
+        return (rows - self._origin[0]) * self._width + (columns - self._origin[1])
+
+    def __len__(self):
+        return len(self._codes)
+
+    def _get_state(self):
+        """
+        Returns the cells of the grid, to be stored
+        """
+        return {'cell_size': self.cell_size, 'origin': self._origin, 'width': self._width, 'codes': self._codes,
+                'types': self._types, 'junctions': self._junctions, 'heights': self._heights}
+
+    @staticmethod
+    def _from_state(state):
+        """
+        Returns the grid with the stored cells
+        """
+        grid = LaneTypeGrid(np.zeros((0, 3)), [], [], [], [], cell_size=state['cell_size'])
+        grid._origin = tuple(state['origin'])  # pylint: disable=protected-access
+        grid._width = state['width']  # pylint: disable=protected-access
+        grid._codes = state['codes']  # pylint: disable=protected-access
+        grid._types = state['types']  # pylint: disable=protected-access
+        grid._junctions = state['junctions']  # pylint: disable=protected-access
+        grid._heights = state['heights']  # pylint: disable=protected-access
+        return grid
+
+    @staticmethod
+    def from_map(wmap, sample_distance=SAMPLE_DISTANCE, cell_size=CELL_SIZE, cache_dir=None, fingerprint=None):
+        """
+        Build the grid of a town, from the cross sections of its roads every sample_distance meters,
+        or load it from cache_dir if it was stored there. The fingerprint (md5 of the OpenDRIVE of the map)
+        is computed from the map if not given.
+        Returns the grid and a dictionary of the carla.LaneType of the grid's lane types
+        """
+        file_name = None
+        if cache_dir:
+            if fingerprint is None:
+                fingerprint = MapCache.get_fingerprint(wmap)
+            file_name = MapCache.get_file_name(cache_dir, wmap, "lane_types_{}_{}".format(sample_distance, cell_size))
+            data = MapCache.load(file_name, fingerprint, "lane type grid")
+            if data is not None:
+                return (LaneTypeGrid._from_state(data['grid']),
+                        {value: carla.LaneType.values[value] for value in data['lane_types']})
+
+        centers = []
+        yaws = []
+        left_extents = []
+        right_extents = []
+        lane_types = []
+        junctions = []
+        carla_lane_types = {}
+
+        visited = set()
+        for waypoint in wmap.generate_waypoints(sample_distance):
+            key = (waypoint.road_id, waypoint.section_id, round(waypoint.s, 1))
+            if key in visited:
+                continue
+            visited.add(key)
+
+            # Lanes from the left to the right of the road's reference line
+            section = LaneTypeGrid._get_cross_section(waypoint)
+            widths = [lane.lane_width for lane in section]
+            for i, lane in enumerate(section):
+                outer = i - 1 if lane.lane_id > 0 else i + 1  # Index of the neighbour at the right of the lane
+                inner = i + 1 if lane.lane_id > 0 else i - 1
+                location = lane.transform.location
+                centers.append((location.x, location.y, location.z))
+                yaws.append(lane.transform.rotation.yaw)
+                for index, extents in ((inner, left_extents), (outer, right_extents)):
+                    if 0 <= index < len(section):
+                        extents.append(min(widths[i] + widths[index], 2 * widths[i]) / 4.0)
+                    else:
+                        extents.append(widths[i] / 2.0)
+                lane_types.append(int(lane.lane_type))
+                junctions.append(lane.is_junction)
+                carla_lane_types[int(lane.lane_type)] = lane.lane_type
+
+        grid = LaneTypeGrid(centers, yaws, left_extents, right_extents, lane_types, junctions,
+                            sample_distance, cell_size)
+        if file_name is not None:
+            # The carla.LaneType can't be serialized, so they are stored as integers
+            # pylint: disable=protected-access
+            MapCache.save(file_name, fingerprint, {'grid': grid._get_state(), 'lane_types': sorted(carla_lane_types)},
+                          "lane type grid")
+        return grid, carla_lane_types
+
+    @staticmethod
+    def _get_cross_section(waypoint):
+        """
+        Returns the waypoints of all lanes of the road at the waypoint, sorted by decreasing lane id
+        (from the left to the right of the road's reference line)
+        """
+        lanes = {waypoint.lane_id: waypoint}
+
+        # The right lane is always the outer one. The left one is the inner one,
+        # until the center of the road is crossed
+        for get_inner in (True, False):
+            current = waypoint
+            crossed = False
+            while current is not None:
+                if get_inner and not crossed:
+                    neighbour = current.get_left_lane()
+                    if neighbour is not None and neighbour.lane_id * waypoint.lane_id < 0:
+                        crossed = True
+                else:
+                    neighbour = current.get_right_lane()
+                if neighbour is None or neighbour.lane_id in lanes:
+                    break
+                lanes[neighbour.lane_id] = neighbour
+                current = neighbour
+
+        return [lanes[lane_id] for lane_id in sorted(lanes, reverse=True)]
+
+    def get_lane_type(self, location):
+        """
+        Returns the lane type (as an integer) at the location and whether it is part of a junction,
+        or None if it is unknown
+        """
+        if len(self._codes) == 0:
+            return None
+
+        row = int(math.floor(location.x / self.cell_size))
+        column = int(math.floor(location.y / self.cell_size))
+        if row < self._origin[0] or column < self._origin[1] or column >= self._origin[1] + self._width:
+            return None
+
+        code = self._get_codes(row, column)
+        index = int(np.searchsorted(self._codes, code))
+        if index >= len(self._codes) or self._codes[index] != code:
+            return None
+        if abs(self._heights[index] - location.z) > self.MAX_HEIGHT:
+            return None
+        return int(self._types[index]), bool(self._junctions[index])
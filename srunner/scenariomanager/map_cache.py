@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the storage of the data derived from a map (route planner graphs,
+junction tables...), to be loaded by later runs instead of being built again
+"""
+
+from __future__ import print_function
+
+import hashlib
+import os
+import pickle
+
+
+class MapCache(object):
+
+    """
+    This (static) class stores the data derived from a map in a directory, as one pickle file
+    per map and kind of data. Each file also records the fingerprint of the map it was built
+    from (the md5 of its OpenDRIVE), so the data is ignored, and has to be built again, once the
+    map changes. This also tells apart the maps with the same name (e.g. generated from OpenDRIVE files).
+
+    Errors while storing or loading the data are only reported as warnings, as the data
+    can always be built from the map.
+    """
+
+    @staticmethod
+    def get_fingerprint(wmap):
+        """
+        Returns the fingerprint of the OpenDRIVE of a map
+        """
+        return hashlib.md5(wmap.to_opendrive().encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_file_name(cache_dir, wmap, kind):
+        """
+        Returns the file of a kind of data of a map in the directory
+        """
+        return os.path.join(cache_dir, "{}_{}.pkl".format(os.path.basename(wmap.name), kind))
+
+    @staticmethod
+    def save(file_name, fingerprint, data, description="map data"):
+        """
+        Store the data of the map with the given fingerprint
+        """
+        try:
+            if not os.path.isdir(os.path.dirname(file_name) or '.'):
+                os.makedirs(os.path.dirname(file_name))
+            with open(file_name, 'wb') as fd:
+                pickle.dump({'fingerprint': fingerprint, 'data': data}, fd, protocol=pickle.HIGHEST_PROTOCOL)
+        except (IOError, OSError) as e:
+            print("WARNING: The {} could not be stored: {}".format(description, e))
+
+    @staticmethod
+    def load(file_name, fingerprint, description="map data"):
+        """
+        Returns the stored data, or None if it is missing or belongs to another map
+        """
+        if not os.path.exists(file_name):
+            return None
+
+        try:
+            with open(file_name, 'rb') as fd:
+                stored = pickle.load(fd)
+        except Exception as e:  # pylint: disable=broad-except
+            print("WARNING: The stored {} could not be loaded: {}".format(description, e))
+            return None
+
+        if not isinstance(stored, dict) or stored.get('fingerprint') != fingerprint:
+            return None
+        return stored.get('data')
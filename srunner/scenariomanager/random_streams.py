@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the central source of randomness of ScenarioRunner.
+
+All random draws of scenarios and atomics should be taken from one of the
+named streams, so that an episode can be reproduced from its job seed.
+"""
+
+import zlib
+
+import numpy as np
+
+
+class RandomStreams(object):
+
+    """
+    This (static) class provides independent, seeded random number streams.
+
+    Each stream is derived from the job seed, the job id, the repetition and the
+    name of the component that uses it, using numpy's SeedSequence. This means:
+    - Two runs with the same (seed, job_id, repetition) draw the same numbers
+    - Components do not influence each other, as each one has its own stream
+    - Parallel workers using different job ids get disjoint streams, without coordination
+
+    A stream can be retrieved by calling:
+    RandomStreams.get(RandomStreams.SPAWNING)
+    """
+
+    # Well known components
+    SPAWNING = "spawning"                     # Blueprints, colors and spawn points
+    ADVERSARY = "adversary"                   # Randomized parameters of the scenarios
+    ACTOR_SOURCE = "actor_source"             # Actors created by the ActorSource atomic
+    CONTROL_NOISE = "control_noise"           # Noise added to the vehicle controls
+    SCENARIO_SAMPLING = "scenario_sampling"   # Scenarios chosen along a route
+    PARAMETER_SAMPLING = "parameter_sampling"  # Samples of the scenario parameter space
+    TRAFFIC_MANAGER = "traffic_manager"       # Seed of the traffic manager, if not given
+    LOCAL_PLANNER = "local_planner"           # Turns at junctions of the vehicles without plan
+
+    _seed = 2000
+    _job_id = 0
+    _repetition = 0
+    _streams = {}
+
+    @staticmethod
+    def set_seed(seed, job_id=0, repetition=0):
+        """
+        Set the job seed and restart all streams
+        """
+        RandomStreams._seed = int(seed)
+        RandomStreams._job_id = int(job_id)
+        RandomStreams._repetition = int(repetition)
+        RandomStreams.reset()
+
+    @staticmethod
+    def get_seed():
+        """
+        Returns the (seed, job_id, repetition) the streams are derived from
+        """
+        return RandomStreams._seed, RandomStreams._job_id, RandomStreams._repetition
+
+    @staticmethod
+    def get_seed_sequence(component):
+        """
+        Returns the numpy SeedSequence of the given component
+        """
+        component_key = zlib.crc32(component.encode('utf-8'))
+        return np.random.SeedSequence(
+            RandomStreams._seed, spawn_key=(RandomStreams._job_id, RandomStreams._repetition, component_key))
+
+    @staticmethod
+    def get(component):
+        """
+        Returns the random stream (numpy.random.RandomState) of the given component
+        """
+        if component not in RandomStreams._streams:
+            bit_generator = np.random.MT19937(RandomStreams.get_seed_sequence(component))
+            RandomStreams._streams[component] = np.random.RandomState(bit_generator)
+        return RandomStreams._streams[component]
+
+    @staticmethod
+    def derive_seed(component):
+        """
+        Returns a 32 bit integer seed of the given component, for external
+        random generators (e.g. the traffic manager)
+        """
+        return int(RandomStreams.get_seed_sequence(component).generate_state(1)[0])
+
+    @staticmethod
+    def reset():
+        """
+        Restart all streams from the job seed
+        """
+        RandomStreams._streams = {}
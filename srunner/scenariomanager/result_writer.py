@@ -40,6 +40,7 @@ class ResultOutputProvider(object):
         self._filename = filename
         self._junit = junitfile
         self._json = jsonfile
+        self._termination_reason = getattr(self._data, 'termination_reason', None)
 
         self._start_time = time.strftime('%Y-%m-%d %H:%M:%S',
                                          time.localtime(self._data.start_system_time))
@@ -95,6 +96,8 @@ class ResultOutputProvider(object):
         list_statistics.extend([["Duration (System Time)", "{}s".format(system_time)]])
         list_statistics.extend([["Duration (Game Time)", "{}s".format(game_time)]])
         list_statistics.extend([["Ratio (System Time / Game Time)", "{}s".format(ratio)]])
+        if self._termination_reason is not None:
+            list_statistics.extend([["Terminated Early", self._termination_reason]])
 
         output += tabulate(list_statistics, tablefmt='fancy_grid')
         output += "\n\n"
@@ -187,6 +190,8 @@ class ResultOutputProvider(object):
                     criterion.test_status in ["SUCCESS", "ACCEPTABLE"]
                 )
             )
+            if getattr(criterion, 'details', None) is not None:
+                json_list[-1]["details"] = criterion.details
 
         # add one entry for duration
         timeout = self._data.scenario.timeout
@@ -200,6 +205,7 @@ class ResultOutputProvider(object):
         result_object = {
             "scenario": self._data.scenario_tree.name,
             "success": self._result in ["SUCCESS", "ACCEPTABLE"],
+            "termination_reason": self._termination_reason,
             "criteria": json_list
         }
 
@@ -222,6 +228,11 @@ class ResultOutputProvider(object):
         if self._data.scenario_duration_game >= self._data.scenario.timeout:
             failure_count += 1
 
+        # handle early termination
+        if self._termination_reason is not None:
+            test_count += 1
+            failure_count += 1
+
         with open(self._junit, "w", encoding='utf-8') as junit_file:
 
             junit_file.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n")
@@ -286,5 +297,13 @@ class ResultOutputProvider(object):
             result_string += "    </testcase>\n"
             junit_file.write(result_string)
 
+            if self._termination_reason is not None:
+                result_string = ("    <testcase name=\"Termination\" status=\"run\" time=\"0\" "
+                                 "classname=\"Scenarios.{}\">\n".format(self._data.scenario_tree.name))
+                result_string += "      <failure message=\"{}\"  type=\"\"><![CDATA[\n".format("Termination")
+                result_string += "  Terminated early: {}]]></failure>\n".format(self._termination_reason)
+                result_string += "    </testcase>\n"
+                junit_file.write(result_string)
+
             junit_file.write("  </testsuite>\n")
             junit_file.write("</testsuites>\n")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the distance along the road network between two moving
+locations, updated incrementally every tick
+"""
+
+from srunner.scenariomanager.route_geometry import RouteGeometry
+
+
+class RouteDistanceTracker(object):
+
+    """
+    Tracks the distance along the route between two locations (e.g. two actors), which are
+    usually updated every tick. The route between them is traced once, and extended
+    EXTENSION meters along the lane after its end, so that it remains valid while the second
+    location moves away. Then, both locations are projected onto it, only checking the
+    segments close to their previous projections. The route is traced again when any of
+    them leaves it (is further than max_offset from it).
+
+    Args:
+        planner (CachedRoutePlanner): planner tracing the routes
+        max_offset (float): maximum distance of the locations to the route [m]
+    """
+
+    MAX_OFFSET = 2.0    # Maximum distance to the route, before tracing it again [m]
+    EXTENSION = 50.0    # Length of the route after its destination [m]
+
+    def __init__(self, planner, max_offset=MAX_OFFSET):
+        self._planner = planner
+        self._max_offset = max_offset
+        self._geometry = None
+        self._route_length = 0.0
+        self._indexes = [None, None]
+
+    def _trace(self, location, other_location):
+        """
+        Trace the route between both locations, extending it after its end
+        """
+        self._geometry = None
+        self._route_length = 0.0
+        self._indexes = [None, None]
+
+        route = self._planner.trace_route(location, other_location)
+        if not route:
+            return
+
+        points = [waypoint.transform.location for waypoint, _ in route]
+        waypoint = route[-1][0]
+        for _ in range(int(self.EXTENSION / self._planner.resolution)):
+            next_waypoints = waypoint.next(self._planner.resolution)
+            if not next_waypoints:
+                break
+            waypoint = next_waypoints[0]
+            points.append(waypoint.transform.location)
+
+        if len(points) > 1:
+            self._geometry = RouteGeometry([(point, None) for point in points])
+            self._route_length = float(self._geometry.accum_meters[len(route) - 1])
+
+    def _project(self, location, slot):
+        """
+        Returns the distance along the route of the projection of a location,
+        or None if it is too far away from the route
+        """
+        projection = self._geometry.project_near(location, self._indexes[slot])
+        if projection is None or projection.distance > self._max_offset:
+            return None
+
+        self._indexes[slot] = projection.index
+        return projection.progress
+
+    def get_distance(self, location, other_location):
+        """
+        Returns the distance along the route from location to other_location (carla.Location)
+        """
+        if self._geometry is not None:
+            progress = self._project(location, 0)
+            other_progress = self._project(other_location, 1)
+            if progress is not None and other_progress is not None:
+                return max(0.0, other_progress - progress)
+
+        self._trace(location, other_location)
+        if self._geometry is None:
+            return 0.0
+
+        progress = self._project(location, 0)
+        other_progress = self._project(other_location, 1)
+        if progress is None or other_progress is None:
+            # The locations aren't on the route (e.g. off the road), use its length
+            self._geometry = None
+            return self._route_length
+
+        return max(0.0, other_progress - progress)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a precomputed geometry of a route, which is shared
+by all atomics that need to locate an actor along the route
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+MAX_PROJECTION_DISTANCE = 20.0  # Maximum distance of a location to the route, to be projected onto it [m]
+TRACKING_WINDOW = 10            # Number of segments checked ahead of the previous projection of a location
+TRACKING_BACKWARDS = 2          # Number of segments checked behind the previous projection of a location
+
+RouteProjection = namedtuple('RouteProjection', ['index', 'progress', 'lateral_offset', 'distance'])
+RouteProjection.__doc__ = """
+Projection of a location onto a route:
+- index: index of the route segment (between points index and index + 1)
+- progress: distance along the route [m]
+- lateral_offset: signed distance to the route, positive to its right (CARLA is left-handed) [m]
+- distance: absolute distance to the route [m]
+"""
+
+
+def _to_location(point):
+    """
+    Returns the location of a route point (carla.Location or carla.Transform)
+    """
+    return point.location if hasattr(point, 'location') else point
+
+
+class RouteGeometry(object):
+
+    """
+    Geometry of a route, built once from its points and the map:
+    - points: (N, 3) array of positions
+    - forward: (N, 3) array of the forward vectors of the lanes at the points
+    - headings: (N,) array of the yaw of the lanes at the points [rad]
+    - accum_meters: (N,) array of the distance along the route at the points [m]
+    - road_ids, lane_ids: (N,) arrays of the road and lane of the points
+
+    Use CarlaDataProvider.get_route_geometry(route) to get the shared geometry of a route.
+
+    Args:
+        route (list): list of (carla.Location or carla.Transform, RoadOption) tuples
+        wmap (carla.Map): map of the route. If None, the forward vectors are taken from
+            the route itself and the road and lane ids are unknown (-1)
+    """
+
+    def __init__(self, route, wmap=None):
+        self.points = RouteGeometry.get_points(route)
+        self.length = len(self.points)
+
+        segments = np.diff(self.points, axis=0)
+        self.accum_meters = np.concatenate(([0.0], np.cumsum(np.linalg.norm(segments, axis=1))))
+
+        # By default, the route direction. Replaced by the lane direction, if known
+        self.forward = np.zeros_like(self.points)
+        if self.length > 1:
+            self.forward[:-1] = segments
+            self.forward[-1] = segments[-1]
+        norms = np.linalg.norm(self.forward, axis=1)
+        self.forward[norms > 0] /= norms[norms > 0][:, np.newaxis]
+
+        self.road_ids = np.full(self.length, -1, dtype=np.int64)
+        self.lane_ids = np.full(self.length, -1, dtype=np.int64)
+        if wmap is not None:
+            for i, (point, _) in enumerate(route):
+                waypoint = wmap.get_waypoint(_to_location(point))
+                if waypoint is None:
+                    continue
+                forward = waypoint.transform.rotation.get_forward_vector()
+                self.forward[i] = (forward.x, forward.y, forward.z)
+                self.road_ids[i] = waypoint.road_id
+                self.lane_ids[i] = waypoint.lane_id
+
+        self.headings = np.arctan2(self.forward[:, 1], self.forward[:, 0])
+
+        # Segments between consecutive points, used for the projections
+        self._segment_start = self.points[:-1, :2]
+        self._segment_vector = segments[:, :2] if self.length > 1 else np.zeros((0, 2))
+        self._segment_length_sq = np.einsum('ij,ij->i', self._segment_vector, self._segment_vector)
+
+        # Lane compatibility of the segments: roads and lane directions of both of their ends
+        self._segment_roads = np.stack((self.road_ids[:-1], self.road_ids[1:]), axis=1)
+        lane_signs = np.sign(self.lane_ids)
+        self._segment_lane_signs = np.stack((lane_signs[:-1], lane_signs[1:]), axis=1)
+
+    @staticmethod
+    def get_points(route):
+        """
+        Returns the (N, 3) array of positions of a route
+        """
+        points = np.zeros((len(route), 3))
+        for i, (point, _) in enumerate(route):
+            location = _to_location(point)
+            points[i] = (location.x, location.y, location.z)
+        return points
+
+    @staticmethod
+    def get_key(route):
+        """
+        Returns a hashable key identifying the route by its points
+        """
+        return np.round(RouteGeometry.get_points(route), 2).tobytes()
+
+    def _get_window(self, start_index, window):
+        """
+        Returns the index range [start, end) of a window of points
+        """
+        start_index = max(0, start_index)
+        end_index = self.length if window is None else min(start_index + window + 1, self.length)
+        return start_index, end_index
+
+    def get_closest_index(self, location, start_index=0, window=None, ignore_z=True):
+        """
+        Returns the index of the route point closest to the location, and its distance.
+        Only the points [start_index, start_index + window] are checked. On ties, the
+        furthest point along the route is returned.
+        """
+        start_index, end_index = self._get_window(start_index, window)
+        if start_index >= end_index:
+            return -1, float('inf')
+
+        position = np.array([location.x, location.y, location.z])
+        offsets = self.points[start_index:end_index] - position
+        if ignore_z:
+            offsets = offsets[:, :2]
+        distances = np.linalg.norm(offsets, axis=1)
+
+        last_closest = len(distances) - 1 - int(np.argmin(distances[::-1]))
+        return start_index + last_closest, float(distances[last_closest])
+
+    def get_passed_index(self, location, start_index=0, window=None):
+        """
+        Returns the furthest route point of the window that the location has already passed
+        (i.e. the location is in front of it, along the lane direction), or None
+        """
+        start_index, end_index = self._get_window(start_index, window)
+        position = np.array([location.x, location.y, location.z])
+        dots = np.einsum('ij,ij->i', position - self.points[start_index:end_index],
+                         self.forward[start_index:end_index])
+
+        passed = np.flatnonzero(dots > 0)
+        if len(passed) == 0:
+            return None
+        return start_index + int(passed[-1])
+
+    def get_distances_along_route(self, positions, road_ids=None, lane_ids=None,
+                                  max_distance=MAX_PROJECTION_DISTANCE):
+        """
+        Project many positions at once onto the route, returning their distance along it.
+
+        Each position is projected onto the closest segment of the route that is closer than
+        max_distance and, if the road and lane ids of the positions are given, whose road
+        matches the one of the position and whose lanes have the same direction.
+
+        Args:
+            positions (array): (K, 2) or (K, 3) array of positions
+            road_ids (array): (K,) road ids of the positions, or None to skip the lane compatibility check
+            lane_ids (array): (K,) lane ids of the positions, or None to skip the lane compatibility check
+            max_distance (float): maximum distance of a position to the route [m]
+
+        Returns:
+            (array, array): (K,) distances along the route [m] and (K,) flags, True if the position was
+            found along the route. Positions not found along the route get the route length.
+        """
+        positions = np.atleast_2d(np.asarray(positions, dtype=float))[:, :2]
+        route_length = self.accum_meters[-1] if self.length > 0 else 0.0
+        distances = np.full(len(positions), route_length)
+        found = np.zeros(len(positions), dtype=bool)
+        if self.length < 2 or len(positions) == 0:
+            return distances, found
+
+        # (K, M) projections of all positions onto all segments
+        offsets = positions[:, np.newaxis, :] - self._segment_start[np.newaxis, :, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.einsum('kmj,mj->km', offsets, self._segment_vector) / self._segment_length_sq
+        ratios = np.clip(np.nan_to_num(ratios), 0.0, 1.0)
+        lateral = offsets - ratios[:, :, np.newaxis] * self._segment_vector[np.newaxis, :, :]
+        lateral_sq = np.einsum('kmj,kmj->km', lateral, lateral)
+        candidates = lateral_sq < max_distance ** 2
+
+        if road_ids is not None and lane_ids is not None:
+            road_ids = np.asarray(road_ids)[:, np.newaxis, np.newaxis]
+            lane_signs = np.sign(np.asarray(lane_ids))[:, np.newaxis, np.newaxis]
+            candidates &= np.any(self._segment_roads[np.newaxis] == road_ids, axis=2)
+            candidates &= np.any(self._segment_lane_signs[np.newaxis] == lane_signs, axis=2)
+
+        found = np.any(candidates, axis=1)
+        rows = np.flatnonzero(found)
+        segments = np.argmin(np.where(candidates[rows], lateral_sq[rows], np.inf), axis=1)
+        segment_lengths = self.accum_meters[segments + 1] - self.accum_meters[segments]
+        distances[rows] = self.accum_meters[segments] + ratios[rows, segments] * segment_lengths
+
+        return distances, found
+
+    def project(self, location, start_index=0, window=None):
+        """
+        Project a location (in 2D) onto the closest segment of the route.
+        Only the segments [start_index, start_index + window] are checked.
+        Returns a RouteProjection, or None if the route has no segments
+        """
+        start_index, end_index = self._get_window(start_index, window)
+        end_index = min(end_index, self.length - 1)
+        if start_index >= end_index:
+            return None
+
+        position = np.array([location.x, location.y])
+        starts = self._segment_start[start_index:end_index]
+        vectors = self._segment_vector[start_index:end_index]
+        lengths_sq = self._segment_length_sq[start_index:end_index]
+
+        offsets = position - starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.where(lengths_sq > 0, np.einsum('ij,ij->i', offsets, vectors) / lengths_sq, 0.0)
+        ratios = np.clip(ratios, 0.0, 1.0)
+        distances = np.linalg.norm(offsets - vectors * ratios[:, np.newaxis], axis=1)
+
+        closest = int(np.argmin(distances))
+        index = start_index + closest
+        segment_length = np.sqrt(lengths_sq[closest])
+        segment_meters = self.accum_meters[index + 1] - self.accum_meters[index]
+        progress = self.accum_meters[index] + ratios[closest] * segment_meters
+        if segment_length > 0:
+            cross = vectors[closest, 0] * offsets[closest, 1] - vectors[closest, 1] * offsets[closest, 0]
+            lateral_offset = cross / segment_length
+        else:
+            lateral_offset = float(distances[closest])
+
+        return RouteProjection(index, float(progress), float(lateral_offset), float(distances[closest]))
+
+    def project_near(self, location, previous_index=None):
+        """
+        Project a location tracked over time (e.g. an actor) onto the route, only checking the
+        segments close to its previous projection (the index of its RouteProjection).
+        If previous_index is None, the whole route is checked
+        """
+        if previous_index is None:
+            return self.project(location)
+        start_index = max(0, previous_index - TRACKING_BACKWARDS)
+        return self.project(location, start_index, TRACKING_WINDOW + TRACKING_BACKWARDS)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2019 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a structured log of the scenario executions.
+
+Each job appends one JSON record (one line) to the run log, with the time spent
+in each of its phases, statistics of its ticks and the outcome of its criteria.
+The records of a sweep can be aggregated with run_log_summary.py
+"""
+
+from __future__ import print_function
+
+import contextlib
+import json
+import time
+
+import numpy as np
+
+from srunner.scenariomanager.random_streams import RandomStreams
+
+
+class RunLog(object):
+
+    """
+    JSONL sink of per-job metrics.
+
+    The phases of a job are measured with:
+        with run_log.measure(RunLog.WORLD_LOAD):
+            ...
+    A phase measured several times during a job accumulates its durations.
+    If no file is given, the measurements are taken but never written.
+    """
+
+    # Measured phases of a job. The setup time (from the start of the job until the scenario
+    # starts to tick) and the tick latencies are taken from the ScenarioManager
+    WORLD_LOAD = "world_load"   # Loading the world and waiting for it
+    SPAWN = "spawn"             # Spawning the ego vehicles and building the scenario
+    EXPORT = "export"           # Writing results, recordings and datasets
+
+    def __init__(self, file_name=None):
+        self._file_name = file_name
+        self._config = None
+        self._durations = {}
+        self._start_time = None
+
+    def start_job(self, config):
+        """
+        Reset the measurements for a new job
+        """
+        self._config = config
+        self._durations = {}
+        self._start_time = time.time()
+
+    def set_config(self, config):
+        """
+        Update the configuration of the current job (e.g. once a sample was applied to it)
+        """
+        self._config = config
+
+    def add_duration(self, phase, duration):
+        """
+        Add a duration [s] to a phase of the current job
+        """
+        self._durations[phase] = self._durations.get(phase, 0.0) + duration
+
+    @contextlib.contextmanager
+    def measure(self, phase):
+        """
+        Context manager measuring the wall time of a phase of the current job
+        """
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.add_duration(phase, time.time() - start_time)
+
+    @staticmethod
+    def _get_criteria(manager):
+        """
+        Returns the outcome of all criteria of the scenario run by the manager
+        """
+        criteria = []
+        if manager is None or manager.scenario is None or manager.scenario.test_criteria is None:
+            return criteria
+
+        for criterion in manager.scenario.get_criteria():
+            actor = criterion.actor
+            criteria.append({
+                'name': criterion.name,
+                'actor_id': actor.id if actor is not None else None,
+                'actor_type': actor.type_id if actor is not None else None,
+                'status': criterion.test_status,
+                'optional': criterion.optional,
+                'actual_value': criterion.actual_value,
+                'expected_value': criterion.expected_value_success
+            })
+        return criteria
+
+    def write(self, manager, result):
+        """
+        Append the record of the current job to the run log
+        """
+        if self._file_name is None or self._start_time is None:
+            return
+
+        end_time = time.time()
+        config = self._config
+        seed, job_id, repetition = RandomStreams.get_seed()
+
+        # Ignore the manager, if the job failed before its scenario was run
+        if manager.start_system_time is None or manager.start_system_time < self._start_time:
+            manager = None
+        tick_durations = manager.tick_durations if manager is not None else []
+        game_time = manager.scenario_duration_game if manager is not None else 0.0
+        if manager is not None:
+            # The duration of the scenario includes the export of its history, counted apart
+            wall_time = manager.scenario_duration_system - manager.export_duration
+            setup_time = manager.start_system_time - self._start_time
+            export_time = self._durations.get(self.EXPORT, 0.0) + manager.export_duration
+        else:
+            wall_time = 0.0
+            setup_time = end_time - self._start_time
+            export_time = self._durations.get(self.EXPORT, 0.0)
+
+        record = {
+            'name': config.name,
+            'type': config.type,
+            'town': config.town,
+            'seed': seed,
+            'job_id': job_id,
+            'repetition': repetition,
+            'parameters': dict(getattr(config, 'other_parameters', {})),
+            'result': bool(result),
+            'start_time': self._start_time,
+            'end_time': end_time,
+            'total_time': end_time - self._start_time,
+            'setup_time': setup_time,
+            'world_load_time': self._durations.get(self.WORLD_LOAD, 0.0),
+            'spawn_time': self._durations.get(self.SPAWN, 0.0),
+            'export_time': export_time,
+            'scenario_wall_time': wall_time,
+            'scenario_game_time': game_time,
+            'tick_count': manager.tick_count if manager is not None else 0,
+            'tick_latency_mean': float(np.mean(tick_durations)) if tick_durations else None,
+            'tick_latency_p95': float(np.percentile(tick_durations, 95)) if tick_durations else None,
+            'sim_wall_ratio': game_time / wall_time if wall_time > 0 else None,
+            'termination_reason': getattr(manager, 'termination_reason', None),
+            'criteria': self._get_criteria(manager)
+        }
+
+        try:
+            with open(self._file_name, 'a', encoding='utf-8') as fd:
+                fd.write(json.dumps(record, default=str) + "\n")
+        except (IOError, OSError) as e:
+            print("WARNING: Run log could not be written: {}".format(e))
+
+        self._config = None
+        self._start_time = None
+
+
+def read_run_log(file_name):
+    """
+    Returns all records of a run log. Incomplete lines (e.g. of a job that was killed) are skipped
+    """
+    records = []
+    with open(file_name, 'r', encoding='utf-8') as fd:
+        for line in fd:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass
+    return records
+
+
+def summarize_run_log(records):
+    """
+    Returns the throughput statistics of a list of run log records.
+    The wall time of the sweep goes from the start of its first job to the end of its last
+    one, so that jobs run by parallel workers are accounted for.
+    """
+    if not records:
+        return {}
+
+    def mean(key):
+        values = [record[key] for record in records if record.get(key) is not None]
+        return float(np.mean(values)) if values else None
+
+    sweep_time = max(r['end_time'] for r in records) - min(r['start_time'] for r in records)
+    game_time = sum(r['scenario_game_time'] for r in records)
+    ticks = sum(r['tick_count'] for r in records)
+    hours = sweep_time / 3600.0
+
+    return {
+        'jobs': len(records),
+        'success_rate': sum(1 for r in records if r['result']) / float(len(records)),
+        'sweep_time': sweep_time,
+        'jobs_per_hour': len(records) / hours if hours > 0 else None,
+        'sim_hours_per_hour': game_time / sweep_time if sweep_time > 0 else None,
+        'ticks_per_second': ticks / sweep_time if sweep_time > 0 else None,
+        'setup_time': mean('setup_time'),
+        'world_load_time': mean('world_load_time'),
+        'spawn_time': mean('spawn_time'),
+        'export_time': mean('export_time'),
+        'tick_latency_mean': mean('tick_latency_mean'),
+        'tick_latency_p95': mean('tick_latency_p95'),
+        'sim_wall_ratio': mean('sim_wall_ratio'),
+    }
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides surrogate safety indicators between an actor and a set of other
+actors (time to collision, post encroachment time, gap and deceleration rate to avoid
+a crash), computed at once for all of them from their boxes and velocities in 2D
+"""
+
+import numpy as np
+
+EPSILON = 1e-6
+
+# Signs of the corners of a box, along and across it (counterclockwise in CARLA)
+CORNER_SIGNS = np.array([[1, 1], [1, -1], [-1, -1], [-1, 1]], dtype=float)
+
+
+def get_box_corners(positions, yaws, extents):
+    """
+    Returns the (N, 4, 2) corners of the boxes with (N, 2) centers, (N,) yaws [rad] and (N, 2) half sizes
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    yaws = np.asarray(yaws, dtype=float).reshape(-1)
+    extents = np.asarray(extents, dtype=float).reshape(-1, 2)
+
+    forward = np.stack((np.cos(yaws), np.sin(yaws)), axis=1)
+    right = np.stack((-forward[:, 1], forward[:, 0]), axis=1)
+    along = CORNER_SIGNS[np.newaxis, :, 0:1] * extents[:, np.newaxis, 0:1]
+    across = CORNER_SIGNS[np.newaxis, :, 1:2] * extents[:, np.newaxis, 1:2]
+    return positions[:, np.newaxis, :] + along * forward[:, np.newaxis, :] + across * right[:, np.newaxis, :]
+
+
+def _get_point_segment_distances(points, starts, ends):
+    """
+    Returns the (N, P, S) distances of (N, P, 2) points to (N, S, 2) segments
+    """
+    segments = ends - starts
+    offsets = points[:, :, np.newaxis, :] - starts[:, np.newaxis, :, :]
+    lengths_sq = np.maximum(np.einsum('nsj,nsj->ns', segments, segments), EPSILON)
+    ratios = np.clip(np.einsum('npsj,nsj->nps', offsets, segments) / lengths_sq[:, np.newaxis, :], 0.0, 1.0)
+    return np.linalg.norm(offsets - ratios[..., np.newaxis] * segments[:, np.newaxis, :, :], axis=3)
+
+
+def get_box_distances(box, boxes):
+    """
+    Returns the (N,) distances between a (4, 2) box and (N, 4, 2) boxes, 0 if they overlap
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4, 2)
+    box = np.broadcast_to(np.asarray(box, dtype=float), boxes.shape)
+
+    # Separating axis test, with the directions of the sides of both boxes
+    axes = np.concatenate((box[:, 1:3] - box[:, 0:2], boxes[:, 1:3] - boxes[:, 0:2]), axis=1)
+    box_projections = np.einsum('naj,ncj->nac', axes, box)
+    boxes_projections = np.einsum('naj,ncj->nac', axes, boxes)
+    separated = np.any((box_projections.max(axis=2) < boxes_projections.min(axis=2)) |
+                       (boxes_projections.max(axis=2) < box_projections.min(axis=2)), axis=1)
+
+    box_ends = np.roll(box, -1, axis=1)
+    boxes_ends = np.roll(boxes, -1, axis=1)
+    distances = np.minimum(_get_point_segment_distances(box, boxes, boxes_ends).min(axis=(1, 2)),
+                           _get_point_segment_distances(boxes, box, box_ends).min(axis=(1, 2)))
+    return np.where(separated, distances, 0.0)
+
+
+def get_safety_metrics(position, yaw, extent, velocity, positions, yaws, extents, velocities):
+    """
+    Returns the surrogate safety indicators between an actor and N other actors,
+    as a dictionary of (N,) arrays:
+    - gap: distance between their boxes [m]
+    - ttc: time to collision, as the gap divided by the speed at which their centers get closer [s]
+    - pet: predicted post encroachment time, the time between both actors reaching the crossing
+        point of their paths, if they keep their velocities [s]
+    - drac: deceleration rate needed to stop getting closer before colliding [m/s2]
+    Unbounded values (e.g. actors getting further) are infinite, except the drac, which is 0.
+
+    The actor has a (2,) position, a yaw [rad], a (2,) half size and a (2,) velocity,
+    and the other actors arrays of them.
+    """
+    position = np.asarray(position, dtype=float).reshape(2)
+    velocity = np.asarray(velocity, dtype=float).reshape(2)
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    velocities = np.asarray(velocities, dtype=float).reshape(-1, 2)
+
+    box = get_box_corners(position, yaw, extent)[0]
+    gaps = get_box_distances(box, get_box_corners(positions, yaws, extents))
+
+    # Time to collision and deceleration rate to avoid a crash, from the closing speed
+    offsets = positions - position
+    relative_velocities = velocities - velocity
+    center_distances = np.maximum(np.linalg.norm(offsets, axis=1), EPSILON)
+    closing_speeds = -np.einsum('nj,nj->n', offsets, relative_velocities) / center_distances
+    closing = closing_speeds > EPSILON
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ttc = np.where(closing, gaps / np.where(closing, closing_speeds, 1.0), np.inf)
+        drac = np.where(closing, closing_speeds ** 2 / (2.0 * gaps), 0.0)
+    ttc[gaps <= 0.0] = 0.0
+
+    # Predicted post encroachment time, at the crossing point of both paths
+    determinants = velocities[:, 0] * velocity[1] - velocity[0] * velocities[:, 1]
+    crossing = np.abs(determinants) > EPSILON
+    safe_determinants = np.where(crossing, determinants, 1.0)
+    actor_times = (velocities[:, 0] * offsets[:, 1] - offsets[:, 0] * velocities[:, 1]) / safe_determinants
+    other_times = (velocity[0] * offsets[:, 1] - velocity[1] * offsets[:, 0]) / safe_determinants
+    crossing &= (actor_times >= 0.0) & (other_times >= 0.0)
+    pet = np.where(crossing, np.abs(actor_times - other_times), np.inf)
+
+    return {'gap': gaps, 'ttc': ttc, 'pet': pet, 'drac': drac}
@@ -18,6 +18,7 @@ import py_trees
 
 from srunner.autoagents.agent_wrapper import AgentWrapper
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.condition_evaluator import ConditionEvaluator
 from srunner.scenariomanager.result_writer import ResultOutputProvider
 from srunner.scenariomanager.timer import GameTime
 from srunner.scenariomanager.watchdog import Watchdog
@@ -43,10 +44,14 @@ class ScenarioManager(object):
     5. If needed, cleanup with manager.stop_scenario()
     """
 
-    def __init__(self, debug_mode=False, sync_mode=False, timeout=2.0):
+    def __init__(self, debug_mode=False, sync_mode=False, timeout=2.0, batch_criteria=False,
+                 termination_policy=None):
         """
         Setups up the parameters, which will be filled at load_scenario()
 
+        If batch_criteria is True, the criteria are evaluated by a CriteriaEngine
+        instead of as part of the scenario tree. If a TerminationPolicy is given,
+        the scenarios end as soon as one of its rules is met
         """
         self.scenario = None
         self.scenario_tree = None
@@ -57,6 +62,10 @@ class ScenarioManager(object):
         self._debug_mode = debug_mode
         self._agent = None
         self._sync_mode = sync_mode
+        self._batch_criteria = batch_criteria
+        self._criteria_engine = None
+        self._termination_policy = termination_policy
+        self.termination_reason = None
         self._watchdog = None
         self._timeout = timeout
 
@@ -66,6 +75,10 @@ class ScenarioManager(object):
         self.scenario_duration_game = 0.0
         self.start_system_time = None
         self.end_system_time = None
+        self.tick_count = 0
+        self.tick_durations = []
+        self.export_duration = 0.0
+        self._tick_system_time = None
 
         # align carla lane type with waymo lane type
         self.lane_type = {
@@ -84,6 +97,11 @@ class ScenarioManager(object):
         self.scenario_duration_game = 0.0
         self.start_system_time = None
         self.end_system_time = None
+        self.tick_count = 0
+        self.tick_durations = []
+        self.export_duration = 0.0
+        self._tick_system_time = None
+        self.termination_reason = None
         GameTime.restart()
 
     def cleanup(self):
@@ -102,6 +120,7 @@ class ScenarioManager(object):
             self._agent.cleanup()
             self._agent = None
 
+        ConditionEvaluator.cleanup()
         CarlaDataProvider.cleanup()
 
     def load_scenario(self, scenario, agent=None):
@@ -115,8 +134,13 @@ class ScenarioManager(object):
         self.scenario_class = scenario
         self.scenario = scenario.scenario
         self.scenario_tree = self.scenario.scenario_tree
+        self._criteria_engine = None
+        if self._batch_criteria and self.scenario.use_criteria_engine():
+            self._criteria_engine = self.scenario.criteria_engine
         self.ego_vehicles = scenario.ego_vehicles
         self.other_actors = scenario.other_actors
+        if self._termination_policy is not None:
+            self._termination_policy.setup(self.ego_vehicles, self.other_actors, self.scenario.get_criteria())
 
         # To print the scenario tree uncomment the next line
         # py_trees.display.render_dot_tree(self.scenario_tree)
@@ -273,7 +297,9 @@ class ScenarioManager(object):
 
         # Save data to waymo format
         if recordWaymo:
+            export_start_time = time.time()
             self._save_to_waymo(recordWaymo, config, data_id)
+            self.export_duration = time.time() - export_start_time
         self.cleanup()
 
         self.end_system_time = time.time()
@@ -283,7 +309,8 @@ class ScenarioManager(object):
                                         self.start_system_time
         self.scenario_duration_game = end_game_time - start_game_time
 
-        if self.scenario_tree.status == py_trees.common.Status.FAILURE:
+        if self.scenario_tree.status == py_trees.common.Status.FAILURE or \
+                (self._criteria_engine is not None and self._criteria_engine.status == py_trees.common.Status.FAILURE):
             print("ScenarioManager: Terminated due to failure")
 
     def _tick_scenario(self, timestamp):
@@ -295,6 +322,13 @@ class ScenarioManager(object):
         if self._timestamp_last_run < timestamp.elapsed_seconds and self._running:
             self._timestamp_last_run = timestamp.elapsed_seconds
 
+            # Wall time between two consecutive ticks of the scenario
+            self.tick_count += 1
+            tick_system_time = time.time()
+            if self._tick_system_time is not None:
+                self.tick_durations.append(tick_system_time - self._tick_system_time)
+            self._tick_system_time = tick_system_time
+
             self._watchdog.update()
 
             if self._debug_mode:
@@ -312,15 +346,25 @@ class ScenarioManager(object):
 
             # Tick scenario
             self.scenario_tree.tick_once()
+            criteria_status = py_trees.common.Status.RUNNING
+            if self._criteria_engine is not None:
+                criteria_status = self._criteria_engine.tick()
 
             if self._debug_mode:
                 print("\n")
                 py_trees.display.print_ascii_tree(self.scenario_tree, show_status=True)
                 sys.stdout.flush()
 
-            if self.scenario_tree.status != py_trees.common.Status.RUNNING:
+            if self.scenario_tree.status != py_trees.common.Status.RUNNING or \
+                    criteria_status != py_trees.common.Status.RUNNING:
                 self._running = False
 
+            elif self._termination_policy is not None:
+                self.termination_reason = self._termination_policy.check(GameTime.get_time())
+                if self.termination_reason is not None:
+                    print("ScenarioManager: Terminated early ({})".format(self.termination_reason))
+                    self._running = False
+
         if self._sync_mode and self._running and self._watchdog.get_status():
             CarlaDataProvider.get_world().tick()
 
@@ -346,6 +390,7 @@ class ScenarioManager(object):
 
         failure = False
         timeout = False
+        terminated = False
         result = "SUCCESS"
 
         if self.scenario.test_criteria is None:
@@ -365,7 +410,13 @@ class ScenarioManager(object):
             timeout = True
             result = "TIMEOUT"
 
+        # The criteria still running when the termination policy ended the scenario are
+        # terminated as successful, but the scenario didn't end by itself
+        if self.termination_reason is not None and not failure:
+            terminated = True
+            result = "TERMINATED"
+
         output = ResultOutputProvider(self, result, stdout, filename, junit, json)
         output.write()
 
-        return failure or timeout
+        return failure or timeout or terminated
@@ -15,11 +15,9 @@ The atomic behaviors are implemented with py_trees.
 
 from __future__ import print_function
 
-import copy
 import math
 import operator
 import os
-import random
 import time
 import subprocess
 
@@ -29,14 +27,18 @@ from py_trees.blackboard import Blackboard
 import networkx
 
 import carla
-from agents.navigation.basic_agent import BasicAgent, LocalPlanner
+from agents.navigation.basic_agent import BasicAgent
 from agents.navigation.local_planner import RoadOption
-from agents.navigation.global_route_planner import GlobalRoutePlanner
 from agents.tools.misc import is_within_distance
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.actor_state_registry import ActorStateRegistry
 from srunner.scenariomanager.actorcontrols.actor_control import ActorControl
+from srunner.scenariomanager.batched_local_planner import BatchedLocalPlanner
+from srunner.scenariomanager.random_streams import RandomStreams
+from srunner.scenariomanager.route_distance_tracker import RouteDistanceTracker
 from srunner.scenariomanager.timer import GameTime
+from srunner.scenariomanager.traffic_light_plan import TrafficLightPlan
 from srunner.tools.scenario_helper import detect_lane_obstacle
 from srunner.tools.scenario_helper import generate_target_waypoint_list_multilane
 
@@ -46,15 +48,19 @@ import srunner.tools as sr_tools
 EPSILON = 0.001
 
 
-def calculate_distance(location, other_location, global_planner=None):
+def calculate_distance(location, other_location, global_planner=None, route_tracker=None):
     """
     Method to calculate the distance between to locations
 
     Note: It uses the direct distance between the current location and the
           target location to estimate the time to arrival.
           To be accurate, it would have to use the distance along the
-          (shortest) route between the two locations.
+          (shortest) route between the two locations, given by the global planner,
+          or incrementally by a RouteDistanceTracker if the locations are tracked every tick.
     """
+    if route_tracker:
+        return route_tracker.get_distance(location, other_location)
+
     if global_planner:
         distance = 0
 
@@ -120,14 +126,10 @@ class AtomicBehavior(py_trees.behaviour.Behaviour):
         Check whether WF for this actor is running and terminate all active WFs
         """
         if self._actor is not None:
-            try:
-                check_attr = operator.attrgetter("running_WF_actor_{}".format(self._actor.id))
-                terminate_wf = copy.copy(check_attr(py_trees.blackboard.Blackboard()))
-                py_trees.blackboard.Blackboard().set(
-                    "terminate_WF_actor_{}".format(self._actor.id), terminate_wf, overwrite=True)
-            except AttributeError:
-                # It is ok to continue, if the Blackboard variable does not exist
-                pass
+            # It is ok to continue, if no WF was started for this actor
+            follower_state = ActorStateRegistry.get_follower_state(self._actor.id)
+            if follower_state is not None:
+                follower_state.terminate[:] = follower_state.running
         self.logger.debug("%s.initialise()" % (self.__class__.__name__))
 
     def terminate(self, new_status):
@@ -347,20 +349,12 @@ class ChangeActorControl(AtomicBehavior):
             py_trees.common.Status.SUCCESS
         """
 
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
-        if actor_dict:
-            if self._actor.id in actor_dict:
-                actor_dict[self._actor.id].reset()
+        if self._actor.id in actor_dict:
+            actor_dict[self._actor.id].reset()
 
         actor_dict[self._actor.id] = self._actor_control
-        py_trees.blackboard.Blackboard().set("ActorsWithController", actor_dict, overwrite=True)
 
         return py_trees.common.Status.SUCCESS
 
@@ -391,13 +385,7 @@ class UpdateAllActorControls(AtomicBehavior):
             py_trees.common.Status.RUNNING
         """
 
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         for actor_id in actor_dict:
             actor_dict[actor_id].run_step()
@@ -485,13 +473,7 @@ class ChangeActorTargetSpeed(AtomicBehavior):
         May throw if actor is not available as key for the ActorsWithController
         dictionary from Blackboard.
         """
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             raise RuntimeError("Actor not found in ActorsWithController BlackBoard")
@@ -527,11 +509,7 @@ class ChangeActorTargetSpeed(AtomicBehavior):
             py_trees.common.Status.FAILURE, if the actor is not found in ActorsWithController Blackboard dictionary.
             py_trees.common.Status.FAILURE, else.
         """
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             return py_trees.common.Status.FAILURE
@@ -617,13 +595,7 @@ class SyncArrivalOSC(AtomicBehavior):
         May throw if actor is not available as key for the ActorsWithController
         dictionary from Blackboard.
         """
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             raise RuntimeError("Actor not found in ActorsWithController BlackBoard")
@@ -654,11 +626,7 @@ class SyncArrivalOSC(AtomicBehavior):
         positions at the same time.
         """
 
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             return py_trees.common.Status.FAILURE
@@ -699,11 +667,7 @@ class SyncArrivalOSC(AtomicBehavior):
         is needed to avoid interfering with other running behaviors
         """
         if not self._final_speed_set:
-            try:
-                check_actors = operator.attrgetter("ActorsWithController")
-                actor_dict = check_actors(py_trees.blackboard.Blackboard())
-            except AttributeError:
-                pass
+            actor_dict = ActorStateRegistry.get_controllers()
 
             if actor_dict and self._actor.id in actor_dict:
 
@@ -771,13 +735,7 @@ class ChangeActorWaypoints(AtomicBehavior):
         May throw if actor is not available as key for the ActorsWithController
         dictionary from Blackboard.
         """
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             raise RuntimeError("Actor not found in ActorsWithController BlackBoard")
@@ -793,7 +751,8 @@ class ChangeActorWaypoints(AtomicBehavior):
 
         # Obtain final route, considering the routing option
         # At the moment everything besides "shortest" will use the CARLA GlobalPlanner
-        grp = GlobalRoutePlanner(CarlaDataProvider.get_world().get_map(), 2.0)
+        grp = CarlaDataProvider.get_route_planner(2.0)
+        grp.reset()
         route = []
         for i, _ in enumerate(carla_route_elements):
             if carla_route_elements[i][1] == "shortest":
@@ -849,11 +808,7 @@ class ChangeActorWaypoints(AtomicBehavior):
             py_trees.common.Status.FAILURE, if the actor is not found in ActorsWithController Blackboard dictionary.
             py_trees.common.Status.FAILURE, else.
         """
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             return py_trees.common.Status.FAILURE
@@ -940,13 +895,7 @@ class ChangeActorLateralMotion(AtomicBehavior):
         May throw if actor is not available as key for the ActorsWithController
         dictionary from Blackboard.
         """
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             raise RuntimeError("Actor not found in ActorsWithController BlackBoard")
@@ -980,11 +929,7 @@ class ChangeActorLateralMotion(AtomicBehavior):
             py_trees.common.Status.FAILURE, else.
         """
 
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             return py_trees.common.Status.FAILURE
@@ -1086,13 +1031,7 @@ class ChangeActorLaneOffset(AtomicBehavior):
         May throw if actor is not available as key for the ActorsWithController
         dictionary from Blackboard.
         """
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             raise RuntimeError("Actor not found in ActorsWithController BlackBoard")
@@ -1113,11 +1052,7 @@ class ChangeActorLaneOffset(AtomicBehavior):
             py_trees.common.Status.FAILURE, if the actor is not found in ActorsWithController Blackboard dictionary.
             py_trees.common.Status.RUNNING, else.
         """
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or not self._actor.id in actor_dict:
             return py_trees.common.Status.FAILURE
@@ -1185,11 +1120,7 @@ class ChangeActorLaneOffset(AtomicBehavior):
         """
 
         if not self._overwritten:
-            try:
-                check_actors = operator.attrgetter("ActorsWithController")
-                actor_dict = check_actors(py_trees.blackboard.Blackboard())
-            except AttributeError:
-                pass
+            actor_dict = ActorStateRegistry.get_controllers()
 
             if actor_dict and self._actor.id in actor_dict:
                 actor_dict[self._actor.id].update_offset(0)
@@ -1736,7 +1667,8 @@ class ChangeNoiseParameters(AtomicBehavior):
         self._dynamic_mean_for_steer = dynamic_mean_for_steer
         self._dynamic_mean_for_throttle = dynamic_mean_for_throttle
 
-        self._noise_to_apply = abs(random.gauss(self._noise_mean, self._noise_std))
+        self._noise_to_apply = abs(RandomStreams.get(RandomStreams.CONTROL_NOISE).normal(
+            self._noise_mean, self._noise_std))
 
     def update(self):
         """
@@ -1870,8 +1802,10 @@ class WaypointFollower(AtomicBehavior):
         _avoid_collision (bool): Enable/Disable(=default) collision avoidance for vehicles/bikes. Defaults to False.
         _actor_dict: Dictonary of all actors, and their corresponding plans (e.g. {actor: plan}).
         _local_planner_dict: Dictonary of all actors, and their corresponding local planners.
-            Either "Walker" for pedestrians, or a carla.agent.navigation.LocalPlanner for other actors.
-        _args_lateral_dict: Parameters for the PID of the used carla.agent.navigation.LocalPlanner.
+            Either "Walker" for pedestrians, or the BatchedLocalPlanner for other actors.
+        _local_planner (BatchedLocalPlanner): Local planner computing the controls of all vehicles at once,
+            which are applied in a single batch.
+        _args_lateral_dict: Parameters for the lateral PID of the local planner.
         _unique_id: Unique ID of the behavior based on timestamp in nanoseconds.
 
     Note:
@@ -1900,6 +1834,8 @@ class WaypointFollower(AtomicBehavior):
         self._args_lateral_dict = {'K_P': 1.0, 'K_D': 0.01, 'K_I': 0.0, 'dt': 0.05}
         self._avoid_collision = avoid_collision
         self._unique_id = 0
+        self._follower_state = None
+        self._local_planner = None
 
     def initialise(self):
         """
@@ -1910,20 +1846,12 @@ class WaypointFollower(AtomicBehavior):
         """
         super(WaypointFollower, self).initialise()
         self._unique_id = int(round(time.time() * 1e9))
-        try:
-            # check whether WF for this actor is already running and add new WF to running_WF list
-            check_attr = operator.attrgetter("running_WF_actor_{}".format(self._actor.id))
-            running = check_attr(py_trees.blackboard.Blackboard())
-            active_wf = copy.copy(running)
-            active_wf.append(self._unique_id)
-            py_trees.blackboard.Blackboard().set(
-                "running_WF_actor_{}".format(self._actor.id), active_wf, overwrite=True)
-        except AttributeError:
-            # no WF is active for this actor
-            py_trees.blackboard.Blackboard().set("terminate_WF_actor_{}".format(self._actor.id), [], overwrite=True)
-            py_trees.blackboard.Blackboard().set(
-                "running_WF_actor_{}".format(self._actor.id), [self._unique_id], overwrite=True)
 
+        # Add the new WF to the running WFs of this actor
+        self._follower_state = ActorStateRegistry.get_follower_state(self._actor.id, create=True)
+        self._follower_state.running.append(self._unique_id)
+
+        self._local_planner = BatchedLocalPlanner(self._args_lateral_dict)
         for actor in self._actor_dict:
             self._apply_local_planner(actor)
         return True
@@ -1931,7 +1859,7 @@ class WaypointFollower(AtomicBehavior):
     def _apply_local_planner(self, actor):
         """
         Convert the plan into locations for walkers (pedestrians), or to a waypoint list for other actors.
-        For non-walkers, activate the carla.agent.navigation.LocalPlanner module.
+        Non-walkers are added to the BatchedLocalPlanner of this behavior.
         """
         if self._target_speed is None:
             self._target_speed = CarlaDataProvider.get_velocity(actor)
@@ -1946,24 +1874,17 @@ class WaypointFollower(AtomicBehavior):
                 else:
                     self._actor_dict[actor] = [element[0].transform.location for element in self._plan]
         else:
-            local_planner = LocalPlanner(  # pylint: disable=undefined-variable
-                actor, opt_dict={
-                    'target_speed': self._target_speed * 3.6,
-                    'lateral_control_dict': self._args_lateral_dict})
-
-            if self._plan is not None:
-                if isinstance(self._plan[0], carla.Location):
-                    plan = []
-                    for location in self._plan:
-                        waypoint = CarlaDataProvider.get_map().get_waypoint(location,
-                                                                            project_to_road=True,
-                                                                            lane_type=carla.LaneType.Any)
-                        plan.append((waypoint, RoadOption.LANEFOLLOW))
-                    local_planner.set_global_plan(plan)
-                else:
-                    local_planner.set_global_plan(self._plan)
-
-            self._local_planner_dict[actor] = local_planner
+            plan = self._plan
+            if plan is not None and isinstance(plan[0], carla.Location):
+                plan = []
+                for location in self._plan:
+                    waypoint = CarlaDataProvider.get_map().get_waypoint(location,
+                                                                        project_to_road=True,
+                                                                        lane_type=carla.LaneType.Any)
+                    plan.append((waypoint, RoadOption.LANEFOLLOW))
+            self._local_planner.add(actor, self._target_speed * 3.6, plan)
+
+            self._local_planner_dict[actor] = self._local_planner
             self._actor_dict[actor] = self._plan
 
     def update(self):
@@ -1972,11 +1893,8 @@ class WaypointFollower(AtomicBehavior):
         """
         new_status = py_trees.common.Status.RUNNING
 
-        check_term = operator.attrgetter("terminate_WF_actor_{}".format(self._actor.id))
-        terminate_wf = check_term(py_trees.blackboard.Blackboard())
-
-        check_run = operator.attrgetter("running_WF_actor_{}".format(self._actor.id))
-        active_wf = check_run(py_trees.blackboard.Blackboard())
+        terminate_wf = self._follower_state.terminate
+        active_wf = self._follower_state.running
 
         # Termination of WF if the WFs unique_id is listed in terminate_wf
         # only one WF should be active, therefore all previous WF have to be terminated
@@ -1984,35 +1902,25 @@ class WaypointFollower(AtomicBehavior):
             terminate_wf.remove(self._unique_id)
             if self._unique_id in active_wf:
                 active_wf.remove(self._unique_id)
-
-            py_trees.blackboard.Blackboard().set(
-                "terminate_WF_actor_{}".format(self._actor.id), terminate_wf, overwrite=True)
-            py_trees.blackboard.Blackboard().set(
-                "running_WF_actor_{}".format(self._actor.id), active_wf, overwrite=True)
             new_status = py_trees.common.Status.SUCCESS
             return new_status
 
         if self._blackboard_queue_name is not None:
             while not self._queue.empty():
                 actor = self._queue.get()
-                if actor is not None and actor not in self._actor_dict:
+                # Actors recycled by an ActorSource come back to the queue, and restart the plan
+                if actor is not None:
                     self._apply_local_planner(actor)
 
         success = True
+        vehicles = []
         for actor in self._local_planner_dict:
             local_planner = self._local_planner_dict[actor] if actor else None
-            if actor is not None and actor.is_alive and local_planner is not None:
-                # Check if the actor is a vehicle/bike
+            if (actor is not None and actor.is_alive and local_planner is not None
+                    and not CarlaDataProvider.is_parked(actor)):
+                # Check if the actor is a vehicle/bike. Their controls are computed together
                 if not isinstance(actor, carla.Walker):
-                    control = local_planner.run_step(debug=False)
-                    if self._avoid_collision and detect_lane_obstacle(actor):
-                        control.throttle = 0.0
-                        control.brake = 1.0
-                    actor.apply_control(control)
-                    # Check if the actor reached the end of the plan
-                    # @TODO replace access to private _waypoints_queue with public getter
-                    if local_planner._waypoints_queue:  # pylint: disable=protected-access
-                        success = False
+                    vehicles.append(actor)
                 # If the actor is a pedestrian, we have to use the WalkerAIController
                 # The walker is sent to the next waypoint in its plan
                 else:
@@ -2036,6 +1944,18 @@ class WaypointFollower(AtomicBehavior):
                         control.direction = CarlaDataProvider.get_transform(actor).rotation.get_forward_vector()
                         actor.apply_control(control)
 
+        if vehicles:
+            batch = []
+            for actor, control in zip(vehicles, self._local_planner.run_step(vehicles)):
+                if self._avoid_collision and detect_lane_obstacle(actor):
+                    control.throttle = 0.0
+                    control.brake = 1.0
+                batch.append(carla.command.ApplyVehicleControl(actor, control))
+                # Check if the actor reached the end of the plan
+                if not self._local_planner.done(actor):
+                    success = False
+            CarlaDataProvider.get_client().apply_batch(batch)
+
         if success:
             new_status = py_trees.common.Status.SUCCESS
 
@@ -2050,11 +1970,8 @@ class WaypointFollower(AtomicBehavior):
             if actor is not None and actor.is_alive:
                 control, _ = get_actor_control(actor)
                 actor.apply_control(control)
-                local_planner = self._local_planner_dict[actor]
-                if local_planner is not None and local_planner != "Walker":
-                    local_planner.reset_vehicle()
-                    local_planner = None
 
+        self._local_planner = None
         self._local_planner_dict = {}
         self._actor_dict = {}
         super(WaypointFollower, self).terminate(new_status)
@@ -2349,48 +2266,66 @@ class ActorSource(AtomicBehavior):
     - threshold: Min available free distance between other actors and the spawn location
     - blackboard_queue_name: Name of the blackboard used to control this behavior
     - actor_limit [optional]: Maximum number of actors to be spawned (default=7)
+    - spawn_interval [optional]: Minimum time between two spawns [s] (default=0)
+    - pool_size [optional]: Number of actors created (out of sight) at the start, and moved
+        to the spawn point instead of being spawned (default=0). Actors parked by an ActorSink
+        with recycle=True are also reused
+
+    The occupancy of the spawn point is checked with the actors registered in the CarlaDataProvider.
 
     A parallel termination behavior has to be used.
     """
 
     def __init__(self, actor_type_list, transform, threshold, blackboard_queue_name,
-                 actor_limit=7, name="ActorSource"):
+                 actor_limit=7, spawn_interval=0.0, pool_size=0, name="ActorSource"):
         """
         Setup class members
         """
         super(ActorSource, self).__init__(name)
-        self._world = CarlaDataProvider.get_world()
         self._actor_types = actor_type_list
         self._spawn_point = transform
         self._threshold = threshold
         self._queue = Blackboard().get(blackboard_queue_name)
         self._actor_limit = actor_limit
-        self._last_blocking_actor = None
+        self._spawn_interval = spawn_interval
+        self._pool_size = pool_size
+        self._last_spawn_time = None
+
+    def initialise(self):
+        """
+        Create the pool of actors
+        """
+        if self._pool_size > 0:
+            rng = RandomStreams.get(RandomStreams.ACTOR_SOURCE)
+            amounts = {}
+            for _ in range(min(self._pool_size, self._actor_limit)):
+                model = rng.choice(self._actor_types)
+                amounts[model] = amounts.get(model, 0) + 1
+            for model, amount in amounts.items():
+                CarlaDataProvider.create_parked_actors(model, amount)
+            self._pool_size = 0
+        super(ActorSource, self).initialise()
 
     def update(self):
         new_status = py_trees.common.Status.RUNNING
-        if self._actor_limit > 0:
-            world_actors = self._world.get_actors()
-            spawn_point_blocked = False
-            if (self._last_blocking_actor and
-                    self._spawn_point.location.distance(self._last_blocking_actor.get_location()) < self._threshold):
-                spawn_point_blocked = True
-
-            if not spawn_point_blocked:
-                for actor in world_actors:
-                    if self._spawn_point.location.distance(actor.get_location()) < self._threshold:
-                        spawn_point_blocked = True
-                        self._last_blocking_actor = actor
-                        break
+        if self._actor_limit <= 0:
+            return new_status
 
-            if not spawn_point_blocked:
-                try:
-                    new_actor = CarlaDataProvider.request_new_actor(
-                        np.random.choice(self._actor_types), self._spawn_point)
-                    self._actor_limit -= 1
-                    self._queue.put(new_actor)
-                except:                             # pylint: disable=bare-except
-                    print("ActorSource unable to spawn actor")
+        if (self._last_spawn_time is not None
+                and GameTime.get_time() - self._last_spawn_time < self._spawn_interval):
+            return new_status
+
+        if CarlaDataProvider.get_actors_in_radius(self._spawn_point.location, self._threshold):
+            return new_status
+
+        self._last_spawn_time = GameTime.get_time()
+        try:
+            new_actor = CarlaDataProvider.request_new_actor(
+                RandomStreams.get(RandomStreams.ACTOR_SOURCE).choice(self._actor_types), self._spawn_point)
+            self._actor_limit -= 1
+            self._queue.put(new_actor)
+        except:                             # pylint: disable=bare-except
+            print("ActorSource unable to spawn actor")
         return new_status
 
 
@@ -2404,21 +2339,24 @@ class ActorSink(AtomicBehavior):
     - actor_type_list: Type of CARLA actors to be spawned
     - sink_location: Location (carla.location) at which actors will be deleted
     - threshold: Distance around sink_location in which actors will be deleted
+    - recycle [optional]: If True, the actors are parked (out of sight), to be reused by an ActorSource,
+        instead of being destroyed (default=False)
 
     A parallel termination behavior has to be used.
     """
 
-    def __init__(self, sink_location, threshold, name="ActorSink"):
+    def __init__(self, sink_location, threshold, recycle=False, name="ActorSink"):
         """
         Setup class members
         """
         super(ActorSink, self).__init__(name)
         self._sink_location = sink_location
         self._threshold = threshold
+        self._recycle = recycle
 
     def update(self):
         new_status = py_trees.common.Status.RUNNING
-        CarlaDataProvider.remove_actors_in_surrounding(self._sink_location, self._threshold)
+        CarlaDataProvider.remove_actors_in_surrounding(self._sink_location, self._threshold, park=self._recycle)
         return new_status
 
 
@@ -2475,287 +2413,120 @@ class TrafficLightManipulator(AtomicBehavior):
 
     """
     Atomic behavior that manipulates traffic lights around the ego_vehicle to trigger scenarios 7 to 10.
-    This is done by setting 2 of the traffic light at the intersection to green (with some complex precomputation
-    to set everything up).
+    This is done by setting 2 of the traffic light at the intersection to green, following a TrafficLightPlan.
+
+    The plan is best compiled when the scenario is built (see TrafficLightPlan.compile). Otherwise, it is
+    compiled when the behavior starts, for the junction ahead of the ego_vehicle. At runtime, only the
+    event of the next phase of the plan is checked.
 
     Important parameters:
     - ego_vehicle: CARLA actor that controls this behavior
     - subtype: string that gathers information of the route and scenario number
-      (check SUBTYPE_CONFIG_TRANSLATION below)
-    """
-
-    RED = carla.TrafficLightState.Red
-    YELLOW = carla.TrafficLightState.Yellow
-    GREEN = carla.TrafficLightState.Green
-
-    # Time constants
-    RED_TIME = 1.5  # Minimum time the ego vehicle waits in red (seconds)
-    YELLOW_TIME = 2  # Time spent at yellow state (seconds)
-    RESET_TIME = 6  # Time waited before resetting all the junction (seconds)
-
-    # Experimental values
-    TRIGGER_DISTANCE = 10  # Distance that makes all vehicles in the lane enter the junction (meters)
-    DIST_TO_WAITING_TIME = 0.04  # Used to wait longer at larger intersections (s/m)
-
-    INT_CONF_OPP1 = {'ego': RED, 'ref': RED, 'left': RED, 'right': RED, 'opposite': GREEN}
-    INT_CONF_OPP2 = {'ego': GREEN, 'ref': GREEN, 'left': RED, 'right': RED, 'opposite': GREEN}
-    INT_CONF_LFT1 = {'ego': RED, 'ref': RED, 'left': GREEN, 'right': RED, 'opposite': RED}
-    INT_CONF_LFT2 = {'ego': GREEN, 'ref': GREEN, 'left': GREEN, 'right': RED, 'opposite': RED}
-    INT_CONF_RGT1 = {'ego': RED, 'ref': RED, 'left': RED, 'right': GREEN, 'opposite': RED}
-    INT_CONF_RGT2 = {'ego': GREEN, 'ref': GREEN, 'left': RED, 'right': GREEN, 'opposite': RED}
-
-    INT_CONF_REF1 = {'ego': GREEN, 'ref': GREEN, 'left': RED, 'right': RED, 'opposite': RED}
-    INT_CONF_REF2 = {'ego': YELLOW, 'ref': YELLOW, 'left': RED, 'right': RED, 'opposite': RED}
-
-    # Depending on the scenario, IN ORDER OF IMPORTANCE, the traffic light changed
-    # The list has to contain only items of the INT_CONF
-    SUBTYPE_CONFIG_TRANSLATION = {
-        'S7left': ['left', 'opposite', 'right'],
-        'S7right': ['left', 'opposite'],
-        'S7opposite': ['right', 'left', 'opposite'],
-        'S8left': ['opposite'],
-        'S9right': ['left', 'opposite']
-    }
-
-    CONFIG_TLM_TRANSLATION = {
-        'left': [INT_CONF_LFT1, INT_CONF_LFT2],
-        'right': [INT_CONF_RGT1, INT_CONF_RGT2],
-        'opposite': [INT_CONF_OPP1, INT_CONF_OPP2]
-    }
-
-    def __init__(self, ego_vehicle, subtype, debug=False, name="TrafficLightManipulator"):
+      (check TrafficLightPlan.SUBTYPE_CONFIG_TRANSLATION)
+    - plan [optional]: precompiled TrafficLightPlan of the junction
+    """
+
+    def __init__(self, ego_vehicle, subtype, plan=None, debug=False, name="TrafficLightManipulator"):
         super(TrafficLightManipulator, self).__init__(name)
         self.ego_vehicle = ego_vehicle
         self.subtype = subtype
-        self.current_step = 1
         self.debug = debug
+        self._compiled_plan = plan
 
-        self.traffic_light = None
-        self.annotations = None
-        self.configuration = None
-        self.prev_junction_state = None
-        self.junction_location = None
-        self.seconds_waited = 0
-        self.prev_time = None
-        self.max_trigger_distance = None
-        self.waiting_time = None
-        self.inside_junction = False
+        self._plan = None
+        self._phase = 0
+        self._phase_start_time = None
+        self._max_trigger_distance = None
+        self._inside_junction = False
+        self._prev_junction_state = None
 
         self.logger.debug("%s.__init__()" % (self.__class__.__name__))
 
-    def update(self):
+    def initialise(self):
+        """
+        Start the plan from its first phase
+        """
+        self._plan = self._compiled_plan
+        self._phase = 0
+        self._phase_start_time = None
+        self._max_trigger_distance = None
+        self._inside_junction = False
+        self._prev_junction_state = None
+        super(TrafficLightManipulator, self).initialise()
 
+    def update(self):
         new_status = py_trees.common.Status.RUNNING
 
-        # 1) Set up the parameters
-        if self.current_step == 1:
-
-            # Traffic light affecting the ego vehicle
-            self.traffic_light = CarlaDataProvider.get_next_traffic_light(self.ego_vehicle, use_cached_location=False)
-            if not self.traffic_light:
-                # nothing else to do in this iteration...
+        if self._plan is None:
+            location = self.ego_vehicle.get_transform().location
+            self._plan = TrafficLightPlan.compile(self.subtype, location, self.debug)
+            if self._plan is None:
+                # No traffic light ahead yet, nothing else to do in this iteration...
                 return new_status
 
-            # "Topology" of the intersection
-            self.annotations = CarlaDataProvider.annotate_trafficlight_in_group(self.traffic_light)
-
-            # Which traffic light will be modified (apart from the ego lane)
-            self.configuration = self.get_traffic_light_configuration(self.subtype, self.annotations)
-            if self.configuration is None:
-                self.current_step = 0  # End the behavior
+        # Apply all phases whose event happened
+        while self._phase < len(self._plan.phases):
+            phase = self._plan.phases[self._phase]
+            happened = self._check_event(phase)
+            if happened is None:
+                # Something failed
+                break
+            if not happened:
                 return new_status
 
-            # Modify the intersection. Store the previous state
-            self.prev_junction_state = self.set_intersection_state(self.INT_CONF_REF1)
+            if phase.states is None:
+                break
+            prev_state = CarlaDataProvider.update_light_states(
+                self._plan.traffic_light, self._plan.annotations, phase.states, freeze=True)
+            if self._prev_junction_state is None:
+                self._prev_junction_state = prev_state
+            self._phase_start_time = GameTime.get_time()
+            self._phase += 1
 
-            self.current_step += 1
             if self.debug:
-                print("--- All set up")
-
-        # 2) Modify the ego lane to yellow when closeby
-        elif self.current_step == 2:
-
-            ego_location = CarlaDataProvider.get_location(self.ego_vehicle)
-
-            if self.junction_location is None:
-                ego_waypoint = CarlaDataProvider.get_map().get_waypoint(ego_location)
-                junction_waypoint = ego_waypoint.next(0.5)[0]
-                while not junction_waypoint.is_junction:
-                    next_wp = junction_waypoint.next(0.5)[0]
-                    junction_waypoint = next_wp
-                self.junction_location = junction_waypoint.transform.location
-
-            distance = ego_location.distance(self.junction_location)
-
-            # Failure check
-            if self.max_trigger_distance is None:
-                self.max_trigger_distance = distance + 1
-            if distance > self.max_trigger_distance:
-                self.current_step = 0
-
-            elif distance < self.TRIGGER_DISTANCE:
-                _ = self.set_intersection_state(self.INT_CONF_REF2)
-                self.current_step += 1
+                print("--- Phase {} of the traffic light plan started".format(self._phase))
 
+        # At the end (or if something failed), reset to the previous state
+        if self._prev_junction_state:
+            CarlaDataProvider.reset_lights(self._prev_junction_state)
             if self.debug:
-                print("--- Distance until traffic light changes: {}".format(distance))
-
-        # 3) Modify the ego lane to red and the chosen one to green after several seconds
-        elif self.current_step == 3:
-
-            if self.passed_enough_time(self.YELLOW_TIME):
-                _ = self.set_intersection_state(self.CONFIG_TLM_TRANSLATION[self.configuration][0])
-
-                self.current_step += 1
-
-        # 4) Wait a bit to let vehicles enter the intersection, then set the ego lane to green
-        elif self.current_step == 4:
-
-            # Get the time in red, dependent on the intersection dimensions
-            if self.waiting_time is None:
-                self.waiting_time = self.get_waiting_time(self.annotations, self.configuration)
-
-            if self.passed_enough_time(self.waiting_time):
-                _ = self.set_intersection_state(self.CONFIG_TLM_TRANSLATION[self.configuration][1])
+                print("--- Returning the intersection to its previous state")
 
-                self.current_step += 1
-
-        # 5) Wait for the end of the intersection
-        elif self.current_step == 5:
-            # the traffic light has been manipulated, wait until the vehicle finsihes the intersection
-            ego_location = CarlaDataProvider.get_location(self.ego_vehicle)
-            ego_waypoint = CarlaDataProvider.get_map().get_waypoint(ego_location)
-
-            if not self.inside_junction:
-                if ego_waypoint.is_junction:
-                    # Wait for the ego_vehicle to enter a junction
-                    self.inside_junction = True
-                else:
-                    if self.debug:
-                        print("--- Waiting to ENTER a junction")
-
-            else:
-                if ego_waypoint.is_junction:
-                    if self.debug:
-                        print("--- Waiting to EXIT a junction")
-                else:
-                    # And to leave it
-                    self.inside_junction = False
-                    self.current_step += 1
-
-        # 6) At the end (or if something failed), reset to the previous state
-        else:
-            if self.prev_junction_state:
-                CarlaDataProvider.reset_lights(self.prev_junction_state)
-                if self.debug:
-                    print("--- Returning the intersection to its previous state")
-
-            self.variable_cleanup()
-            new_status = py_trees.common.Status.SUCCESS
-
-        return new_status
+        self._plan = None
+        return py_trees.common.Status.SUCCESS
 
-    def passed_enough_time(self, time_limit):
+    def _check_event(self, phase):
         """
-        Returns true or false depending on the time that has passed from the
-        first time this function was called
+        Returns whether the event of a phase happened, or None if the ego_vehicle didn't behave as planned
         """
-        # Start the timer
-        if self.prev_time is None:
-            self.prev_time = GameTime.get_time()
-
-        timestamp = GameTime.get_time()
-        self.seconds_waited += (timestamp - self.prev_time)
-        self.prev_time = timestamp
-
-        if self.debug:
-            print("--- Waited seconds: {}".format(self.seconds_waited))
-
-        if self.seconds_waited >= time_limit:
-            self.seconds_waited = 0
-            self.prev_time = None
-
+        if phase.event == TrafficLightPlan.START:
             return True
-        return False
-
-    def set_intersection_state(self, choice):
-        """
-        Changes the intersection to the desired state
-        """
-        prev_state = CarlaDataProvider.update_light_states(
-            self.traffic_light,
-            self.annotations,
-            choice,
-            freeze=True)
-
-        return prev_state
-
-    def get_waiting_time(self, annotation, direction):
-        """
-        Calculates the time the ego traffic light will remain red
-        to let vehicles enter the junction
-        """
-
-        tl = annotation[direction][0]
-        ego_tl = annotation["ref"][0]
-
-        tl_location = CarlaDataProvider.get_trafficlight_trigger_location(tl)
-        ego_tl_location = CarlaDataProvider.get_trafficlight_trigger_location(ego_tl)
-
-        distance = ego_tl_location.distance(tl_location)
-
-        return self.RED_TIME + distance * self.DIST_TO_WAITING_TIME
-
-    def get_traffic_light_configuration(self, subtype, annotations):
-        """
-        Checks the list of possible altered traffic lights and gets
-        the first one that exists in the intersection
 
-        Important parameters:
-        - subtype: Subtype of the scenario
-        - annotations: list of the traffic light of the junction, with their direction (right, left...)
-        """
-        configuration = None
+        if phase.event == TrafficLightPlan.TIME:
+            return GameTime.get_time() - self._phase_start_time >= phase.value
 
-        if subtype in self.SUBTYPE_CONFIG_TRANSLATION:
-            possible_configurations = self.SUBTYPE_CONFIG_TRANSLATION[self.subtype]
-            while possible_configurations:
-                # Chose the first one and delete it
-                configuration = possible_configurations[0]
-                possible_configurations = possible_configurations[1:]
-                if configuration in annotations:
-                    if annotations[configuration]:
-                        # Found a valid configuration
-                        break
-                    else:
-                        # The traffic light doesn't exist, get another one
-                        configuration = None
-                else:
-                    if self.debug:
-                        print("This configuration name is wrong")
-                    configuration = None
+        ego_location = CarlaDataProvider.get_location(self.ego_vehicle)
+        if ego_location is None:
+            return False
 
-            if configuration is None and self.debug:
-                print("This subtype has no traffic light available")
-        else:
+        if phase.event == TrafficLightPlan.DISTANCE:
+            distance = ego_location.distance(self._plan.junction_location)
             if self.debug:
-                print("This subtype is unknown")
+                print("--- Distance until traffic light changes: {}".format(distance))
 
-        return configuration
+            # Failure check, the ego_vehicle is moving away from the junction
+            if self._max_trigger_distance is None:
+                self._max_trigger_distance = distance + 1
+            if distance > self._max_trigger_distance:
+                return None
+            return distance < phase.value
 
-    def variable_cleanup(self):
-        """
-        Resets all variables to the intial state
-        """
-        self.current_step = 1
-        self.traffic_light = None
-        self.annotations = None
-        self.configuration = None
-        self.prev_junction_state = None
-        self.junction_location = None
-        self.max_trigger_distance = None
-        self.waiting_time = None
-        self.inside_junction = False
+        # Wait for the ego_vehicle to enter a junction, and to leave it
+        in_junction = CarlaDataProvider.get_waypoint(ego_location).is_junction
+        if not self._inside_junction:
+            self._inside_junction = in_junction
+            return False
+        return not in_junction
 
 
 class ScenarioTriggerer(AtomicBehavior):
@@ -2787,8 +2558,8 @@ class ScenarioTriggerer(AtomicBehavior):
         self._triggered_scenarios = []  # List of already done scenarios
 
         self._current_index = 0
-        self._route_length = len(self._route)
         self._waypoints, _ = zip(*self._route)
+        self._route_geometry = CarlaDataProvider.get_route_geometry(self._route)
 
     def update(self):
         new_status = py_trees.common.Status.RUNNING
@@ -2797,20 +2568,8 @@ class ScenarioTriggerer(AtomicBehavior):
         if location is None:
             return new_status
 
-        lower_bound = self._current_index
-        upper_bound = min(self._current_index + self.WINDOWS_SIZE + 1, self._route_length)
-
-        shortest_distance = float('inf')
-        closest_index = -1
-
-        for index in range(lower_bound, upper_bound):
-            ref_waypoint = self._waypoints[index]
-            ref_location = ref_waypoint.location
-
-            dist_to_route = ref_location.distance(location)
-            if dist_to_route <= shortest_distance:
-                closest_index = index
-                shortest_distance = dist_to_route
+        closest_index, shortest_distance = self._route_geometry.get_closest_index(
+            location, self._current_index, self.WINDOWS_SIZE, ignore_z=False)
 
         if closest_index == -1 or shortest_distance == float('inf'):
             return new_status
@@ -2882,7 +2641,7 @@ class KeepLongitudinalGap(AtomicBehavior):
         self._gap_type = gap_type
         self._continues = continues
         self._freespace = freespace
-        self._global_rp = None
+        self._route_tracker = None
         max_speed_limit = 100
         self.max_speed = max_speed_limit if max_speed is None else float(max_speed)
         if freespace and self._gap_type == "distance":
@@ -2891,13 +2650,7 @@ class KeepLongitudinalGap(AtomicBehavior):
         self._start_time = None
 
     def initialise(self):
-        actor_dict = {}
-
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or self._actor.id not in actor_dict:
             raise RuntimeError("Actor not found in ActorsWithController BlackBoard")
@@ -2905,7 +2658,7 @@ class KeepLongitudinalGap(AtomicBehavior):
         self._start_time = GameTime.get_time()
         actor_dict[self._actor.id].update_target_speed(self.max_speed, start_time=self._start_time)
 
-        self._global_rp = GlobalRoutePlanner(CarlaDataProvider.get_world().get_map(), 1.0)
+        self._route_tracker = RouteDistanceTracker(CarlaDataProvider.get_route_planner(1.0))
 
         super(KeepLongitudinalGap, self).initialise()
 
@@ -2913,11 +2666,7 @@ class KeepLongitudinalGap(AtomicBehavior):
         """
         keeps track of gap and update the controller accordingly
         """
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
+        actor_dict = ActorStateRegistry.get_controllers()
 
         if not actor_dict or self._actor.id not in actor_dict:
             return py_trees.common.Status.FAILURE
@@ -2933,7 +2682,7 @@ class KeepLongitudinalGap(AtomicBehavior):
         gap = sr_tools.scenario_helper.get_distance_between_actors(self._actor, self._reference_actor,
                                                                    distance_type="longitudinal",
                                                                    freespace=self._freespace,
-                                                                   global_planner=self._global_rp)
+                                                                   route_tracker=self._route_tracker)
         actor_transform = CarlaDataProvider.get_transform(self._actor)
         ref_actor_transform = CarlaDataProvider.get_transform(self._reference_actor)
         if is_within_distance(ref_actor_transform, actor_transform, float('inf'), [0, 90]) and \
@@ -24,6 +24,8 @@ import shapely.geometry
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.collision_manager import CollisionManager
+from srunner.scenariomanager.safety_metrics import get_safety_metrics
 from srunner.scenariomanager.timer import GameTime
 from srunner.scenariomanager.traffic_events import TrafficEvent, TrafficEventType
 
@@ -42,6 +44,7 @@ class Criterion(py_trees.behaviour.Behaviour):
     - actual_value: Actual result after running the scenario
     - test_status: Used to access the result of the criterion
     - optional: Indicates if a criterion is optional (not used for overall analysis)
+    - details: Additional results of the criterion (e.g. time series), added to the JSON results
     """
 
     def __init__(self,
@@ -52,7 +55,7 @@ class Criterion(py_trees.behaviour.Behaviour):
                  optional=False,
                  terminate_on_failure=False):
         super(Criterion, self).__init__(name)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._terminate_on_failure = terminate_on_failure
 
         self.name = name
@@ -63,12 +66,21 @@ class Criterion(py_trees.behaviour.Behaviour):
         self.actual_value = 0
         self.optional = optional
         self.list_traffic_events = []
+        self.details = None
+
+    def _debug(self, msg, *args):
+        """
+        Log a debug message, formatted with its arguments only if the debug messages of
+        py_trees are enabled, as the criteria log one at each update
+        """
+        if py_trees.logging.level < py_trees.logging.Level.INFO:
+            self.logger.debug(msg % args)
 
     def initialise(self):
         """
         Initialise the criterion. Can be extended by the user-derived class
         """
-        self.logger.debug("%s.initialise()" % (self.__class__.__name__))
+        self._debug("%s.initialise()", self.__class__.__name__)
 
     def terminate(self, new_status):
         """
@@ -77,7 +89,7 @@ class Criterion(py_trees.behaviour.Behaviour):
         if self.test_status in ('RUNNING', 'INIT'):
             self.test_status = "SUCCESS"
 
-        self.logger.debug("%s.terminate()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.terminate()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
 
 class MaxVelocityTest(Criterion):
@@ -118,7 +130,7 @@ class MaxVelocityTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -185,7 +197,7 @@ class DrivenDistanceTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -269,7 +281,7 @@ class AverageVelocityTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -287,6 +299,9 @@ class CollisionTest(Criterion):
     """
     This class contains an atomic test for collisions.
 
+    The collision sensor of the actor is shared with the other collision tests of the same actor
+    (see CollisionManager), and its events are processed once per tick, in update().
+
     Args:
     - actor (carla.Actor): CARLA actor to be used for this test
     - other_actor (carla.Actor): only collisions with this actor will be registered
@@ -306,12 +321,7 @@ class CollisionTest(Criterion):
         Construction with sensor setup
         """
         super(CollisionTest, self).__init__(name, actor, 0, None, optional, terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
-
-        world = self.actor.get_world()
-        blueprint = world.get_blueprint_library().find('sensor.other.collision')
-        self._collision_sensor = world.spawn_actor(blueprint, carla.Transform(), attach_to=self.actor)
-        self._collision_sensor.listen(lambda event: self._count_collisions(weakref.ref(self), event))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
         self.other_actor = other_actor
         self.other_actor_type = other_actor_type
@@ -319,59 +329,66 @@ class CollisionTest(Criterion):
         self.last_id = None
         self.collision_time = None
 
+        CollisionManager.register(self.actor, self._count_collisions)
+        self._registered = True
+
     def update(self):
         """
         Check collision count
         """
         new_status = py_trees.common.Status.RUNNING
 
+        # Process the collisions of the actor since the last tick
+        CollisionManager.tick(self.actor)
+
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        actor_location = CarlaDataProvider.get_location(self.actor)
-        new_registered_collisions = []
-
-        # Loops through all the previous registered collisions
-        for collision_location in self.registered_collisions:
-
-            # Get the distance to the collision point
-            distance_vector = actor_location - collision_location
-            distance = math.sqrt(math.pow(distance_vector.x, 2) + math.pow(distance_vector.y, 2))
-
-            # If far away from a previous collision, forget it
-            if distance <= self.MAX_AREA_OF_COLLISION:
-                new_registered_collisions.append(collision_location)
-
-        self.registered_collisions = new_registered_collisions
+        # If far away from a previous collision, forget it
+        if self.registered_collisions:
+            actor_location = CarlaDataProvider.get_location(self.actor)
+            self.registered_collisions = [
+                collision_location for collision_location in self.registered_collisions
+                if self._get_2d_distance(actor_location, collision_location) <= self.MAX_AREA_OF_COLLISION]
 
         if self.last_id and GameTime.get_time() - self.collision_time > self.MAX_ID_TIME:
             self.last_id = None
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
     def terminate(self, new_status):
         """
-        Cleanup sensor
+        Stop listening to the collision sensor
         """
-        if self._collision_sensor is not None:
-            self._collision_sensor.destroy()
-        self._collision_sensor = None
+        if self._registered:
+            CollisionManager.unregister(self.actor, self._count_collisions)
+        self._registered = False
 
         super(CollisionTest, self).terminate(new_status)
 
     @staticmethod
-    def _count_collisions(weak_self, event):     # pylint: disable=too-many-return-statements
+    def _get_2d_distance(location, other_location):
         """
-        Callback to update collision count
+        Returns the distance between two locations, ignoring their height
         """
-        self = weak_self()
-        if not self:
-            return
+        return math.hypot(location.x - other_location.x, location.y - other_location.y)
 
+    def _count_collisions(self, events):
+        """
+        Callback to update collision count, with the collisions of the actor
+        since the last tick (one event per collided object)
+        """
         actor_location = CarlaDataProvider.get_location(self.actor)
 
+        for event in events:
+            self._count_collision(event, actor_location)
+
+    def _count_collision(self, event, actor_location):     # pylint: disable=too-many-return-statements
+        """
+        Update the collision count with a single collision event
+        """
         # Ignore the current one if it is the same id as before
         if self.last_id == event.other_actor.id:
             return
@@ -392,11 +409,7 @@ class CollisionTest(Criterion):
 
         # Ignore it if its too close to a previous collision (avoid micro collisions)
         for collision_location in self.registered_collisions:
-
-            distance_vector = actor_location - collision_location
-            distance = math.sqrt(math.pow(distance_vector.x, 2) + math.pow(distance_vector.y, 2))
-
-            if distance <= self.MIN_AREA_OF_COLLISION:
+            if self._get_2d_distance(actor_location, collision_location) <= self.MIN_AREA_OF_COLLISION:
                 return
 
         if ('static' in event.other_actor.type_id or 'traffic' in event.other_actor.type_id) \
@@ -436,6 +449,136 @@ class CollisionTest(Criterion):
             self.last_id = event.other_actor.id
 
 
+class SurrogateSafetyTest(Criterion):
+
+    """
+    This class computes surrogate safety indicators between the actor and all other actors
+    closer than max_distance, every tick: time to collision (ttc), predicted post encroachment
+    time (pet), gap between their bounding boxes and deceleration rate to avoid a crash (drac).
+    See srunner.scenariomanager.safety_metrics.
+
+    The test fails if the time to collision goes below min_ttc, and its actual value is the
+    minimum time to collision. The time series of the most critical values of each tick, and
+    the summary of each actor, are stored as the details of the criterion.
+
+    Args:
+    - actor (carla.Actor): CARLA actor to be used for this test
+    - min_ttc (float): minimum time to collision allowed [s]
+    - max_distance (float): actors further than this distance are ignored [m]
+    - terminate_on_failure [optional]: If True, the complete scenario will terminate upon failure of this test
+    - optional [optional]: If True, the result is not considered for an overall pass/fail result
+    """
+
+    METRICS = ('ttc', 'pet', 'gap', 'drac')
+
+    def __init__(self, actor, min_ttc=1.5, max_distance=50, optional=True,
+                 name="SurrogateSafetyTest", terminate_on_failure=False):
+        """
+        Setup actor and thresholds
+        """
+        super(SurrogateSafetyTest, self).__init__(name, actor, min_ttc, None, optional, terminate_on_failure)
+        self._debug("%s.__init__()", self.__class__.__name__)
+        self._max_distance = max_distance
+        self.actual_value = float('inf')
+
+        self._times = []
+        self._series = {metric: [] for metric in self.METRICS}
+        self._critical_actors = []
+        self._actor_summaries = {}
+        self._time_below_ttc = 0.0
+        self._min_ttc = float('inf')
+        self._last_time = None
+
+    def update(self):
+        """
+        Compute the indicators with all close actors
+        """
+        new_status = py_trees.common.Status.RUNNING
+
+        if self._terminate_on_failure and (self.test_status == "FAILURE"):
+            new_status = py_trees.common.Status.FAILURE
+
+        time = GameTime.get_time()
+        delta_time = time - self._last_time if self._last_time is not None else 0.0
+        self._last_time = time
+
+        # Without history, there are no states
+        states = CarlaDataProvider.get_actor_states()
+        if states is not None:
+            index = np.flatnonzero(states["ids"] == self.actor.id)
+            if len(index) > 0:
+                self._add_metrics(states, index[0], time, delta_time)
+
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
+
+        return new_status
+
+    def _add_metrics(self, states, index, time, delta_time):
+        """
+        Add the indicators of a tick, with the states of all actors. delta_time is the
+        time since the previous tick
+        """
+        position = states["positions"][index]
+        others = np.linalg.norm(states["positions"] - position, axis=1) < self._max_distance
+        others[index] = False
+        if not np.any(others):
+            return
+
+        metrics = get_safety_metrics(position, states["yaws"][index], states["extents"][index],
+                                     states["velocities"][index], states["positions"][others],
+                                     states["yaws"][others], states["extents"][others], states["velocities"][others])
+        ids = states["ids"][others]
+
+        self._times.append(time)
+        for metric in self.METRICS:
+            values = metrics[metric]
+            self._series[metric].append(float(values.max() if metric == 'drac' else values.min()))
+        self._critical_actors.append(int(ids[np.argmin(metrics['ttc'])]))
+
+        for i, actor_id in enumerate(ids):
+            summary = self._actor_summaries.setdefault(int(actor_id), {
+                'min_ttc': float('inf'), 'min_pet': float('inf'), 'min_gap': float('inf'), 'max_drac': 0.0})
+            summary['min_ttc'] = min(summary['min_ttc'], float(metrics['ttc'][i]))
+            summary['min_pet'] = min(summary['min_pet'], float(metrics['pet'][i]))
+            summary['min_gap'] = min(summary['min_gap'], float(metrics['gap'][i]))
+            summary['max_drac'] = max(summary['max_drac'], float(metrics['drac'][i]))
+
+        min_ttc = self._series['ttc'][-1]
+        self._min_ttc = min(self._min_ttc, min_ttc)
+        self.actual_value = round(self._min_ttc, 2)
+        if min_ttc < self.expected_value_success:
+            self._time_below_ttc += delta_time
+            self.test_status = "FAILURE"
+
+    def terminate(self, new_status):
+        """
+        Store the time series and summaries of the indicators as the details of the criterion
+        """
+        def to_json(value):
+            return value if np.isfinite(value) else None
+
+        self.details = {
+            'time': self._times,
+            'critical_actor': self._critical_actors,
+            'summary': {
+                'min_ttc': to_json(min(self._series['ttc'], default=float('inf'))),
+                'min_pet': to_json(min(self._series['pet'], default=float('inf'))),
+                'min_gap': to_json(min(self._series['gap'], default=float('inf'))),
+                'max_drac': to_json(max(self._series['drac'], default=0.0)),
+                'time_below_min_ttc': self._time_below_ttc,
+            },
+            'actors': {str(actor_id): {key: to_json(value) for key, value in summary.items()}
+                       for actor_id, summary in self._actor_summaries.items()},
+        }
+        for metric in self.METRICS:
+            self.details[metric] = [to_json(value) for value in self._series[metric]]
+
+        # Without any time to collision, there is no actual value
+        self.actual_value = to_json(round(self._min_ttc, 2))
+
+        super(SurrogateSafetyTest, self).terminate(new_status)
+
+
 class ActorSpeedAboveThresholdTest(Criterion):
 
     """
@@ -454,7 +597,7 @@ class ActorSpeedAboveThresholdTest(Criterion):
         Class constructor.
         """
         super(ActorSpeedAboveThresholdTest, self).__init__(name, actor, 0, terminate_on_failure=terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._speed_threshold = speed_threshold
         self._below_threshold_max_time = below_threshold_max_time
@@ -484,7 +627,7 @@ class ActorSpeedAboveThresholdTest(Criterion):
 
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -525,7 +668,7 @@ class KeepLaneTest(Criterion):
         Construction with sensor setup
         """
         super(KeepLaneTest, self).__init__(name, actor, 0, None, optional)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
         world = self.actor.get_world()
         blueprint = world.get_blueprint_library().find('sensor.other.lane_invasion')
@@ -546,7 +689,7 @@ class KeepLaneTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -587,7 +730,7 @@ class ReachedRegionTest(Criterion):
         [min_x,min_y] and [max_x,max_y]
         """
         super(ReachedRegionTest, self).__init__(name, actor, 0)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._min_x = min_x
         self._max_x = max_x
@@ -616,7 +759,7 @@ class ReachedRegionTest(Criterion):
         if self.test_status == "SUCCESS":
             new_status = py_trees.common.Status.SUCCESS
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -642,9 +785,8 @@ class OffRoadTest(Criterion):
         Setup of the variables
         """
         super(OffRoadTest, self).__init__(name, actor, 0, None, optional, terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
-        self._map = CarlaDataProvider.get_map()
         self._offroad = False
 
         self._duration = duration
@@ -665,20 +807,25 @@ class OffRoadTest(Criterion):
 
         current_location = CarlaDataProvider.get_location(self.actor)
 
-        # Get the waypoint at the current location to see if the actor is offroad
-        drive_waypoint = self._map.get_waypoint(
-            current_location,
-            project_to_road=False
-        )
-        park_waypoint = self._map.get_waypoint(
-            current_location,
-            project_to_road=False,
-            lane_type=carla.LaneType.Parking
-        )
-        if drive_waypoint or park_waypoint:
-            self._offroad = False
+        # Get the lane type at the current location to see if the actor is offroad,
+        # querying the waypoints only if it is unknown
+        current_lane = CarlaDataProvider.get_lane_type(current_location)
+        if current_lane is not None:
+            self._offroad = current_lane[0] not in (carla.LaneType.Driving, carla.LaneType.Parking)
         else:
-            self._offroad = True
+            drive_waypoint = CarlaDataProvider.get_waypoint(
+                current_location,
+                project_to_road=False
+            )
+            park_waypoint = CarlaDataProvider.get_waypoint(
+                current_location,
+                project_to_road=False,
+                lane_type=carla.LaneType.Parking
+            )
+            if drive_waypoint or park_waypoint:
+                self._offroad = False
+            else:
+                self._offroad = True
 
         # Counts the time offroad
         if self._offroad:
@@ -697,7 +844,7 @@ class OffRoadTest(Criterion):
         if self._terminate_on_failure and self.test_status == "FAILURE":
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -721,9 +868,8 @@ class EndofRoadTest(Criterion):
         Setup of the variables
         """
         super(EndofRoadTest, self).__init__(name, actor, 0, None, optional, terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
-        self._map = CarlaDataProvider.get_map()
         self._end_of_road = False
 
         self._duration = duration
@@ -743,7 +889,7 @@ class EndofRoadTest(Criterion):
         new_status = py_trees.common.Status.RUNNING
 
         current_location = CarlaDataProvider.get_location(self.actor)
-        current_waypoint = self._map.get_waypoint(current_location)
+        current_waypoint = CarlaDataProvider.get_waypoint(current_location)
 
         # Get the current road id
         if self._road_id is None:
@@ -766,7 +912,7 @@ class EndofRoadTest(Criterion):
                     self.actual_value += 1
                     return py_trees.common.Status.SUCCESS
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -791,10 +937,9 @@ class OnSidewalkTest(Criterion):
         Construction with sensor setup
         """
         super(OnSidewalkTest, self).__init__(name, actor, 0, None, optional, terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
         self._actor = actor
-        self._map = CarlaDataProvider.get_map()
         self._onsidewalk_active = False
         self._outside_lane_active = False
 
@@ -826,16 +971,21 @@ class OnSidewalkTest(Criterion):
         # Some of the vehicle parameters
         current_tra = CarlaDataProvider.get_transform(self._actor)
         current_loc = current_tra.location
-        current_wp = self._map.get_waypoint(current_loc, lane_type=carla.LaneType.Any)
+        current_wp = None
+        current_lane = CarlaDataProvider.get_lane_type(current_loc)
+        if current_lane is None:
+            current_wp = CarlaDataProvider.get_waypoint(current_loc, lane_type=carla.LaneType.Any)
+            current_lane = (current_wp.lane_type, current_wp.is_junction)
+        current_lane_type, current_is_junction = current_lane
 
         # Case 1) Car center is at a sidewalk
-        if current_wp.lane_type == carla.LaneType.Sidewalk:
+        if current_lane_type == carla.LaneType.Sidewalk:
             if not self._onsidewalk_active:
                 self._onsidewalk_active = True
                 self._sidewalk_start_location = current_loc
 
         # Case 2) Not inside allowed zones (Driving and Parking)
-        elif current_wp.lane_type not in (carla.LaneType.Driving, carla.LaneType.Parking):
+        elif current_lane_type not in (carla.LaneType.Driving, carla.LaneType.Parking):
 
             # Get the vertices of the vehicle
             heading_vec = current_tra.get_forward_vector()
@@ -853,19 +1003,10 @@ class OnSidewalkTest(Criterion):
                 current_loc + carla.Location(-1 * x_boundary_vector - y_boundary_vector),
                 current_loc + carla.Location(-1 * x_boundary_vector + y_boundary_vector)]
 
-            bbox_wp = [
-                self._map.get_waypoint(bbox[0], lane_type=carla.LaneType.Any),
-                self._map.get_waypoint(bbox[1], lane_type=carla.LaneType.Any),
-                self._map.get_waypoint(bbox[2], lane_type=carla.LaneType.Any),
-                self._map.get_waypoint(bbox[3], lane_type=carla.LaneType.Any)]
-
-            lane_type_list = [bbox_wp[0].lane_type, bbox_wp[1].lane_type, bbox_wp[2].lane_type, bbox_wp[3].lane_type]
+            lane_type_list = [self._get_lane_type(corner) for corner in bbox]
 
             # Case 2.1) Not quite outside yet
-            if bbox_wp[0].lane_type == (carla.LaneType.Driving or carla.LaneType.Parking) \
-                or bbox_wp[1].lane_type == (carla.LaneType.Driving or carla.LaneType.Parking) \
-                or bbox_wp[2].lane_type == (carla.LaneType.Driving or carla.LaneType.Parking) \
-                    or bbox_wp[3].lane_type == (carla.LaneType.Driving or carla.LaneType.Parking):
+            if carla.LaneType.Driving in lane_type_list:
 
                 self._onsidewalk_active = False
                 self._outside_lane_active = False
@@ -877,6 +1018,8 @@ class OnSidewalkTest(Criterion):
                     self._sidewalk_start_location = current_loc
 
             else:
+                if current_wp is None:
+                    current_wp = CarlaDataProvider.get_waypoint(current_loc, lane_type=carla.LaneType.Any)
                 distance_vehicle_wp = current_loc.distance(current_wp.transform.location)
 
                 # Case 2.3) Outside lane
@@ -894,7 +1037,9 @@ class OnSidewalkTest(Criterion):
         # Case 3) Driving and Parking conditions
         else:
             # Check for false positives at junctions
-            if current_wp.is_junction:
+            if current_is_junction:
+                if current_wp is None:
+                    current_wp = CarlaDataProvider.get_waypoint(current_loc, lane_type=carla.LaneType.Any)
                 distance_vehicle_wp = math.sqrt(
                     math.pow(current_wp.transform.location.x - current_loc.x, 2) +
                     math.pow(current_wp.transform.location.y - current_loc.y, 2))
@@ -965,7 +1110,7 @@ class OnSidewalkTest(Criterion):
             self._wrong_outside_lane_distance = 0
             self.list_traffic_events.append(outsidelane_event)
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -1005,6 +1150,16 @@ class OnSidewalkTest(Criterion):
 
         super(OnSidewalkTest, self).terminate(new_status)
 
+    @staticmethod
+    def _get_lane_type(location):
+        """
+        Returns the lane type at a location
+        """
+        lane = CarlaDataProvider.get_lane_type(location)
+        if lane is not None:
+            return lane[0]
+        return CarlaDataProvider.get_waypoint(location, lane_type=carla.LaneType.Any).lane_type
+
     def _set_event_message(self, event, location, distance):
         """
         Sets the message of the event
@@ -1055,7 +1210,7 @@ class OutsideRouteLanesTest(Criterion):
         Constructor
         """
         super(OutsideRouteLanesTest, self).__init__(name, actor, 0, None, optional)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
         self._actor = actor
         self._route = route
@@ -1124,7 +1279,7 @@ class OutsideRouteLanesTest(Criterion):
                 if self._outside_lane_active or self._wrong_lane_active:
                     self._wrong_distance += new_dist
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -1133,8 +1288,16 @@ class OutsideRouteLanesTest(Criterion):
         Detects if the ego_vehicle is outside driving lanes
         """
 
-        current_driving_wp = self._map.get_waypoint(location, lane_type=carla.LaneType.Driving, project_to_road=True)
-        current_parking_wp = self._map.get_waypoint(location, lane_type=carla.LaneType.Parking, project_to_road=True)
+        # Inside a driving or parking lane, the closest one is the one the actor is at
+        current_lane = CarlaDataProvider.get_lane_type(location)
+        if current_lane is not None and current_lane[0] in (carla.LaneType.Driving, carla.LaneType.Parking):
+            self._outside_lane_active = False
+            return
+
+        current_driving_wp = CarlaDataProvider.get_waypoint(
+            location, lane_type=carla.LaneType.Driving, project_to_road=True)
+        current_parking_wp = CarlaDataProvider.get_waypoint(
+            location, lane_type=carla.LaneType.Parking, project_to_road=True)
 
         driving_distance = location.distance(current_driving_wp.transform.location)
         if current_parking_wp is not None:  # Some towns have no parking
@@ -1156,7 +1319,8 @@ class OutsideRouteLanesTest(Criterion):
         Detects if the ego_vehicle has invaded a wrong lane
         """
 
-        current_waypoint = self._map.get_waypoint(location, lane_type=carla.LaneType.Driving, project_to_road=True)
+        current_waypoint = CarlaDataProvider.get_waypoint(
+            location, lane_type=carla.LaneType.Driving, project_to_road=True)
         current_lane_id = current_waypoint.lane_id
         current_road_id = current_waypoint.road_id
 
@@ -1245,7 +1409,7 @@ class WrongLaneTest(Criterion):
         Construction with sensor setup
         """
         super(WrongLaneTest, self).__init__(name, actor, 0, None, optional)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
 
         self._actor = actor
         self._map = CarlaDataProvider.get_map()
@@ -1268,7 +1432,7 @@ class WrongLaneTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        lane_waypoint = self._map.get_waypoint(self._actor.get_location())
+        lane_waypoint = CarlaDataProvider.get_waypoint(CarlaDataProvider.get_location(self._actor))
         current_lane_id = lane_waypoint.lane_id
         current_road_id = lane_waypoint.road_id
 
@@ -1348,7 +1512,7 @@ class WrongLaneTest(Criterion):
         self._last_road_id = current_road_id
         self._previous_lane_waypoint = lane_waypoint
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -1416,7 +1580,7 @@ class InRadiusRegionTest(Criterion):
         """
         """
         super(InRadiusRegionTest, self).__init__(name, actor, 0)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._x = x     # pylint: disable=invalid-name
         self._y = y     # pylint: disable=invalid-name
@@ -1445,7 +1609,7 @@ class InRadiusRegionTest(Criterion):
         if self.test_status == "SUCCESS":
             new_status = py_trees.common.Status.SUCCESS
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -1470,7 +1634,7 @@ class InRouteTest(Criterion):
         """
         """
         super(InRouteTest, self).__init__(name, actor, 0, terminate_on_failure=terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._route = route
         self._offroad_max = offroad_max
@@ -1481,24 +1645,12 @@ class InRouteTest(Criterion):
             self._offroad_min = self._offroad_min
 
         self._world = CarlaDataProvider.get_world()
-        self._waypoints, _ = zip(*self._route)
-        self._route_length = len(self._route)
+        self._route_geometry = CarlaDataProvider.get_route_geometry(self._route)
+        self._accum_meters = self._route_geometry.accum_meters
         self._current_index = 0
         self._out_route_distance = 0
         self._in_safe_route = True
 
-        self._accum_meters = []
-        prev_wp = self._waypoints[0]
-        for i, wp in enumerate(self._waypoints):
-            d = wp.distance(prev_wp)
-            if i > 0:
-                accum = self._accum_meters[i - 1]
-            else:
-                accum = 0
-
-            self._accum_meters.append(d + accum)
-            prev_wp = wp
-
         # Blackboard variable
         blackv = py_trees.blackboard.Blackboard()
         _ = blackv.set("InRoute", True)
@@ -1520,17 +1672,9 @@ class InRouteTest(Criterion):
 
             off_route = True
 
-            shortest_distance = float('inf')
-            closest_index = -1
-
             # Get the closest distance
-            for index in range(self._current_index,
-                               min(self._current_index + self.WINDOWS_SIZE + 1, self._route_length)):
-                ref_waypoint = self._waypoints[index]
-                distance = math.sqrt(((location.x - ref_waypoint.x) ** 2) + ((location.y - ref_waypoint.y) ** 2))
-                if distance <= shortest_distance:
-                    closest_index = index
-                    shortest_distance = distance
+            closest_index, shortest_distance = self._route_geometry.get_closest_index(
+                location, self._current_index, self.WINDOWS_SIZE)
 
             if closest_index == -1 or shortest_distance == float('inf'):
                 return new_status
@@ -1576,7 +1720,7 @@ class InRouteTest(Criterion):
                 self.actual_value += 1
                 new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -1598,28 +1742,17 @@ class RouteCompletionTest(Criterion):
         """
         """
         super(RouteCompletionTest, self).__init__(name, actor, 100, terminate_on_failure=terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._route = route
-        self._map = CarlaDataProvider.get_map()
 
         self._wsize = self.WINDOWS_SIZE
         self._current_index = 0
-        self._route_length = len(self._route)
         self._waypoints, _ = zip(*self._route)
         self.target = self._waypoints[-1]
 
-        self._accum_meters = []
-        prev_wp = self._waypoints[0]
-        for i, wp in enumerate(self._waypoints):
-            d = wp.distance(prev_wp)
-            if i > 0:
-                accum = self._accum_meters[i - 1]
-            else:
-                accum = 0
-
-            self._accum_meters.append(d + accum)
-            prev_wp = wp
+        self._route_geometry = CarlaDataProvider.get_route_geometry(self._route)
+        self._accum_meters = self._route_geometry.accum_meters
 
         self._traffic_event = TrafficEvent(event_type=TrafficEventType.ROUTE_COMPLETION)
         self.list_traffic_events.append(self._traffic_event)
@@ -1640,24 +1773,19 @@ class RouteCompletionTest(Criterion):
 
         elif self.test_status in ('RUNNING', 'INIT'):
 
-            for index in range(self._current_index, min(self._current_index + self._wsize + 1, self._route_length)):
-                # Get the dot product to know if it has passed this location
-                ref_waypoint = self._waypoints[index]
-                wp = self._map.get_waypoint(ref_waypoint)
-                wp_dir = wp.transform.get_forward_vector()          # Waypoint's forward vector
-                wp_veh = location - ref_waypoint                    # vector waypoint - vehicle
-                dot_ve_wp = wp_veh.x * wp_dir.x + wp_veh.y * wp_dir.y + wp_veh.z * wp_dir.z
-
-                if dot_ve_wp > 0:
-                    # good! segment completed!
-                    self._current_index = index
-                    self._percentage_route_completed = 100.0 * float(self._accum_meters[self._current_index]) \
-                        / float(self._accum_meters[-1])
-                    self._traffic_event.set_dict({
-                        'route_completed': self._percentage_route_completed})
-                    self._traffic_event.set_message(
-                        "Agent has completed > {:.2f}% of the route".format(
-                            self._percentage_route_completed))
+            # Furthest route point the actor has passed (dot product with the lane direction)
+            index = self._route_geometry.get_passed_index(location, self._current_index, self._wsize)
+
+            if index is not None:
+                # good! segment completed!
+                self._current_index = index
+                self._percentage_route_completed = 100.0 * float(self._accum_meters[self._current_index]) \
+                    / float(self._accum_meters[-1])
+                self._traffic_event.set_dict({
+                    'route_completed': self._percentage_route_completed})
+                self._traffic_event.set_message(
+                    "Agent has completed > {:.2f}% of the route".format(
+                        self._percentage_route_completed))
 
             if self._percentage_route_completed > 99.0 and location.distance(self.target) < self.DISTANCE_THRESHOLD:
                 route_completion_event = TrafficEvent(event_type=TrafficEventType.ROUTE_COMPLETED)
@@ -1669,7 +1797,7 @@ class RouteCompletionTest(Criterion):
         elif self.test_status == "SUCCESS":
             new_status = py_trees.common.Status.SUCCESS
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
@@ -1700,20 +1828,27 @@ class RunningRedLightTest(Criterion):
         Init
         """
         super(RunningRedLightTest, self).__init__(name, actor, 0, terminate_on_failure=terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._world = actor.get_world()
         self._map = CarlaDataProvider.get_map()
         self._list_traffic_lights = []
+        self._stop_lines = []
+        self._light_grid = {}
         self._last_red_light_id = None
         self.actual_value = 0
         self.debug = False
 
+        # The stop lines of the lights are static, so they are computed once and the
+        # lights are indexed by their grid cell, to only check the ones near the actor
         all_actors = self._world.get_actors()
         for _actor in all_actors:
             if 'traffic_light' in _actor.type_id:
                 center, waypoints = self.get_traffic_light_waypoints(_actor)
+                index = len(self._list_traffic_lights)
                 self._list_traffic_lights.append((_actor, center, waypoints))
+                self._stop_lines.append([self.get_stop_line(wp) for wp in waypoints])
+                self._light_grid.setdefault(self._get_grid_cell(center), []).append(index)
 
     # pylint: disable=no-self-use
     def is_vehicle_crossing_line(self, seg1, seg2):
@@ -1745,56 +1880,32 @@ class RunningRedLightTest(Criterion):
         tail_far_pt = self.rotate_point(carla.Vector3D(-veh_extent - 1, 0.0, location.z), transform.rotation.yaw)
         tail_far_pt = location + carla.Location(tail_far_pt)
 
-        for traffic_light, center, waypoints in self._list_traffic_lights:
+        if self.debug:
+            self._draw_traffic_lights()
 
-            if self.debug:
-                z = 2.1
-                if traffic_light.state == carla.TrafficLightState.Red:
-                    color = carla.Color(155, 0, 0)
-                elif traffic_light.state == carla.TrafficLightState.Green:
-                    color = carla.Color(0, 155, 0)
-                else:
-                    color = carla.Color(155, 155, 0)
-                self._world.debug.draw_point(center + carla.Location(z=z), size=0.2, color=color, life_time=0.01)
-                for wp in waypoints:
-                    text = "{}.{}".format(wp.road_id, wp.lane_id)
-                    self._world.debug.draw_string(
-                        wp.transform.location + carla.Location(x=1, z=z), text, color=color, life_time=0.01)
-                    self._world.debug.draw_point(
-                        wp.transform.location + carla.Location(z=z), size=0.1, color=color, life_time=0.01)
+        tail_wp = None
+        ve_dir = transform.get_forward_vector()
 
-            center_loc = carla.Location(center)
+        for index in self._get_nearby_lights(location):
+            traffic_light = self._list_traffic_lights[index][0]
 
             if self._last_red_light_id and self._last_red_light_id == traffic_light.id:
                 continue
-            if center_loc.distance(location) > self.DISTANCE_LIGHT:
-                continue
             if traffic_light.state != carla.TrafficLightState.Red:
                 continue
 
-            for wp in waypoints:
-
+            if tail_wp is None:
                 tail_wp = self._map.get_waypoint(tail_far_pt)
 
+            for road_id, lane_id, wp_dir, stop_line in self._stop_lines[index]:
+
                 # Calculate the dot product (Might be unscaled, as only its sign is important)
-                ve_dir = CarlaDataProvider.get_transform(self._actor).get_forward_vector()
-                wp_dir = wp.transform.get_forward_vector()
                 dot_ve_wp = ve_dir.x * wp_dir.x + ve_dir.y * wp_dir.y + ve_dir.z * wp_dir.z
 
                 # Check the lane until all the "tail" has passed
-                if tail_wp.road_id == wp.road_id and tail_wp.lane_id == wp.lane_id and dot_ve_wp > 0:
-                    # This light is red and is affecting our lane
-                    yaw_wp = wp.transform.rotation.yaw
-                    lane_width = wp.lane_width
-                    location_wp = wp.transform.location
-
-                    lft_lane_wp = self.rotate_point(carla.Vector3D(0.4 * lane_width, 0.0, location_wp.z), yaw_wp + 90)
-                    lft_lane_wp = location_wp + carla.Location(lft_lane_wp)
-                    rgt_lane_wp = self.rotate_point(carla.Vector3D(0.4 * lane_width, 0.0, location_wp.z), yaw_wp - 90)
-                    rgt_lane_wp = location_wp + carla.Location(rgt_lane_wp)
-
-                    # Is the vehicle traversing the stop line?
-                    if self.is_vehicle_crossing_line((tail_close_pt, tail_far_pt), (lft_lane_wp, rgt_lane_wp)):
+                if tail_wp.road_id == road_id and tail_wp.lane_id == lane_id and dot_ve_wp > 0:
+                    # This light is red and is affecting our lane. Is the vehicle traversing the stop line?
+                    if self.is_vehicle_crossing_line((tail_close_pt, tail_far_pt), stop_line):
 
                         self.test_status = "FAILURE"
                         self.actual_value += 1
@@ -1819,10 +1930,66 @@ class RunningRedLightTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
 
+    def _get_grid_cell(self, location):
+        """
+        Returns the cell of the traffic light grid, of size DISTANCE_LIGHT, containing the location
+        """
+        return (int(math.floor(location.x / self.DISTANCE_LIGHT)), int(math.floor(location.y / self.DISTANCE_LIGHT)))
+
+    def _get_nearby_lights(self, location):
+        """
+        Returns the indexes of the traffic lights closer than DISTANCE_LIGHT to the location
+        """
+        cell_x, cell_y = self._get_grid_cell(location)
+        nearby_lights = []
+        for i in (cell_x - 1, cell_x, cell_x + 1):
+            for j in (cell_y - 1, cell_y, cell_y + 1):
+                for index in self._light_grid.get((i, j), []):
+                    center_loc = carla.Location(self._list_traffic_lights[index][1])
+                    if center_loc.distance(location) <= self.DISTANCE_LIGHT:
+                        nearby_lights.append(index)
+        return sorted(nearby_lights)
+
+    def _draw_traffic_lights(self):
+        """
+        Draw the state and the stop waypoints of all traffic lights
+        """
+        z = 2.1
+        for traffic_light, center, waypoints in self._list_traffic_lights:
+            if traffic_light.state == carla.TrafficLightState.Red:
+                color = carla.Color(155, 0, 0)
+            elif traffic_light.state == carla.TrafficLightState.Green:
+                color = carla.Color(0, 155, 0)
+            else:
+                color = carla.Color(155, 155, 0)
+            self._world.debug.draw_point(center + carla.Location(z=z), size=0.2, color=color, life_time=0.01)
+            for wp in waypoints:
+                text = "{}.{}".format(wp.road_id, wp.lane_id)
+                self._world.debug.draw_string(
+                    wp.transform.location + carla.Location(x=1, z=z), text, color=color, life_time=0.01)
+                self._world.debug.draw_point(
+                    wp.transform.location + carla.Location(z=z), size=0.1, color=color, life_time=0.01)
+
+    def get_stop_line(self, wp):
+        """
+        Returns the stop line at a stop waypoint of a traffic light, as a
+        (road_id, lane_id, lane direction, (left point, right point)) tuple
+        """
+        yaw_wp = wp.transform.rotation.yaw
+        lane_width = wp.lane_width
+        location_wp = wp.transform.location
+
+        lft_lane_wp = self.rotate_point(carla.Vector3D(0.4 * lane_width, 0.0, location_wp.z), yaw_wp + 90)
+        lft_lane_wp = location_wp + carla.Location(lft_lane_wp)
+        rgt_lane_wp = self.rotate_point(carla.Vector3D(0.4 * lane_width, 0.0, location_wp.z), yaw_wp - 90)
+        rgt_lane_wp = location_wp + carla.Location(rgt_lane_wp)
+
+        return wp.road_id, wp.lane_id, wp.transform.get_forward_vector(), (lft_lane_wp, rgt_lane_wp)
+
     def rotate_point(self, point, angle):
         """
         rotate a given point by a given angle
@@ -1880,15 +2047,19 @@ class RunningStopTest(Criterion):
     - actor: CARLA actor to be used for this test
     - terminate_on_failure [optional]: If True, the complete scenario will terminate upon failure of this test
     """
-    PROXIMITY_THRESHOLD = 50.0  # meters
     SPEED_THRESHOLD = 0.1
     WAYPOINT_STEP = 1.0  # meters
+    AFFECTED_STEPS = 20  # Number of waypoint steps before a stop sign affected by it
+
+    # Affected areas of the stop signs of the current town, computed once and shared by all instances
+    _stop_areas_key = None
+    _stop_areas = ({}, {})  # Stop volumes and stop lanes (see _compute_stop_areas)
 
     def __init__(self, actor, name="RunningStopTest", terminate_on_failure=False):
         """
         """
         super(RunningStopTest, self).__init__(name, actor, 0, terminate_on_failure=terminate_on_failure)
-        self.logger.debug("%s.__init__()" % (self.__class__.__name__))
+        self._debug("%s.__init__()", self.__class__.__name__)
         self._actor = actor
         self._world = CarlaDataProvider.get_world()
         self._map = CarlaDataProvider.get_map()
@@ -1903,6 +2074,74 @@ class RunningStopTest(Criterion):
             if 'traffic.stop' in _actor.type_id:
                 self._list_stop_signs.append(_actor)
 
+        self._stop_signs = {stop.id: stop for stop in self._list_stop_signs}
+        self._stop_volumes, self._stop_lanes = self._get_stop_areas()
+
+    def _get_stop_areas(self):
+        """
+        Returns the affected areas of the stop signs of the town, computing them if needed
+        """
+        key = (self._map.name, tuple(sorted(self._stop_signs)))
+        if RunningStopTest._stop_areas_key != key:
+            RunningStopTest._stop_areas = self._compute_stop_areas()
+            RunningStopTest._stop_areas_key = key
+        return RunningStopTest._stop_areas
+
+    def _compute_stop_areas(self):
+        """
+        Compute the area affected by each stop sign. Returns:
+        - a dictionary of the trigger volumes (center, extent) of the stop signs, by their id
+        - a dictionary by (road_id, lane_id) of the stop signs affecting that lane, as a list of
+          (stop id, min s, max s) tuples, with the range of the lane within AFFECTED_STEPS
+          waypoints before the trigger volume of the stop sign
+        """
+        stop_volumes = {}
+        stop_lanes = {}
+
+        for stop in self._list_stop_signs:
+            volume_center = stop.get_transform().transform(stop.trigger_volume.location)
+            volume_extent = stop.trigger_volume.extent
+            stop_volumes[stop.id] = (volume_center, volume_extent)
+
+            # Waypoints inside the trigger volume
+            waypoints = []
+            visited = set()
+            x_values = np.arange(volume_center.x - volume_extent.x, volume_center.x + volume_extent.x, 1.0)
+            y_values = np.arange(volume_center.y - volume_extent.y, volume_center.y + volume_extent.y, 1.0)
+            points = [volume_center] + [carla.Location(float(x), float(y), volume_center.z)
+                                        for x in x_values for y in y_values]
+            for point in points:
+                wp = self._map.get_waypoint(point)
+                if wp is None or not self.point_inside_boundingbox(
+                        wp.transform.location, volume_center, volume_extent):
+                    continue
+                wp_key = (wp.road_id, wp.lane_id, round(wp.s))
+                if wp_key not in visited:
+                    visited.add(wp_key)
+                    waypoints.append(wp)
+
+            # Walk back all lanes leading to them
+            lane_ranges = {}
+            for step in range(self.AFFECTED_STEPS + 1):
+                previous_wps = []
+                for wp in waypoints:
+                    lane = (wp.road_id, wp.lane_id)
+                    min_s, max_s = lane_ranges.get(lane, (wp.s, wp.s))
+                    lane_ranges[lane] = (min(min_s, wp.s), max(max_s, wp.s))
+                    if step == self.AFFECTED_STEPS:
+                        continue
+                    for previous_wp in wp.previous(self.WAYPOINT_STEP):
+                        wp_key = (previous_wp.road_id, previous_wp.lane_id, round(previous_wp.s))
+                        if wp_key not in visited:
+                            visited.add(wp_key)
+                            previous_wps.append(previous_wp)
+                waypoints = previous_wps
+
+            for lane, (min_s, max_s) in lane_ranges.items():
+                stop_lanes.setdefault(lane, []).append((stop.id, min_s, max_s))
+
+        return stop_volumes, stop_lanes
+
     @staticmethod
     def point_inside_boundingbox(point, bb_center, bb_extent):
         """
@@ -1929,38 +2168,30 @@ class RunningStopTest(Criterion):
 
         return am_ab > 0 and am_ab < ab_ab and am_ad > 0 and am_ad < ad_ad  # pylint: disable=chained-comparison
 
-    def is_actor_affected_by_stop(self, actor, stop, multi_step=20):
+    def _get_lane_stops(self, waypoint):
         """
-        Check if the given actor is affected by the stop
+        Returns the ids of the stop signs affecting the lane position of a waypoint
         """
-        affected = False
-        # first we run a fast coarse test
-        current_location = actor.get_location()
-        stop_location = stop.get_transform().location
-        if stop_location.distance(current_location) > self.PROXIMITY_THRESHOLD:
-            return affected
-
-        stop_t = stop.get_transform()
-        transformed_tv = stop_t.transform(stop.trigger_volume.location)
-
-        # slower and accurate test based on waypoint's horizon and geometric test
-        list_locations = [current_location]
-        waypoint = self._map.get_waypoint(current_location)
-        for _ in range(multi_step):
-            if waypoint:
-                next_wps = waypoint.next(self.WAYPOINT_STEP)
-                if not next_wps:
-                    break
-                waypoint = next_wps[0]
-                if not waypoint:
-                    break
-                list_locations.append(waypoint.transform.location)
+        stop_ids = []
+        for stop_id, min_s, max_s in self._stop_lanes.get((waypoint.road_id, waypoint.lane_id), []):
+            if min_s - self.WAYPOINT_STEP <= waypoint.s <= max_s + self.WAYPOINT_STEP:
+                stop_ids.append(stop_id)
+        return stop_ids
 
-        for actor_location in list_locations:
-            if self.point_inside_boundingbox(actor_location, transformed_tv, stop.trigger_volume.extent):
-                affected = True
+    def is_actor_affected_by_stop(self, actor, stop, waypoint=None):
+        """
+        Check if the given actor is affected by the stop, either because it is inside its
+        trigger volume or because it is on a lane leading to it.
+        The waypoint of the actor can be given to avoid querying the map
+        """
+        current_location = actor.get_location()
+        volume_center, volume_extent = self._stop_volumes[stop.id]
+        if self.point_inside_boundingbox(current_location, volume_center, volume_extent):
+            return True
 
-        return affected
+        if waypoint is None:
+            waypoint = CarlaDataProvider.get_waypoint(current_location)
+        return waypoint is not None and stop.id in self._get_lane_stops(waypoint)
 
     def _scan_for_stop_sign(self):
         target_stop_sign = None
@@ -1968,17 +2199,16 @@ class RunningStopTest(Criterion):
         ve_tra = CarlaDataProvider.get_transform(self._actor)
         ve_dir = ve_tra.get_forward_vector()
 
-        wp = self._map.get_waypoint(ve_tra.location)
+        wp = CarlaDataProvider.get_waypoint(ve_tra.location)
         wp_dir = wp.transform.get_forward_vector()
 
         dot_ve_wp = ve_dir.x * wp_dir.x + ve_dir.y * wp_dir.y + ve_dir.z * wp_dir.z
 
         if dot_ve_wp > 0:  # Ignore all when going in a wrong lane
-            for stop_sign in self._list_stop_signs:
-                if self.is_actor_affected_by_stop(self._actor, stop_sign):
-                    # this stop sign is affecting the vehicle
-                    target_stop_sign = stop_sign
-                    break
+            stop_ids = self._get_lane_stops(wp)
+            if stop_ids:
+                # this stop sign is affecting the vehicle
+                target_stop_sign = self._stop_signs[stop_ids[0]]
 
         return target_stop_sign
 
@@ -2040,6 +2270,6 @@ class RunningStopTest(Criterion):
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
 
-        self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+        self._debug("%s.update()[%s->%s]", self.__class__.__name__, self.status, new_status)
 
         return new_status
@@ -26,10 +26,12 @@ import math
 import py_trees
 import carla
 
-from agents.navigation.global_route_planner import GlobalRoutePlanner
 
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import calculate_distance
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.condition_evaluator import ConditionEvaluator
+from srunner.scenariomanager.lane_frame_tracker import LaneFrameTracker
+from srunner.scenariomanager.route_distance_tracker import RouteDistanceTracker
 from srunner.scenariomanager.timer import GameTime
 from srunner.tools.scenario_helper import get_distance_along_route
 
@@ -106,10 +108,10 @@ class InTriggerDistanceToOSCPosition(AtomicCondition):
         self._map = CarlaDataProvider.get_map()
 
         if self._along_route:
-            # Get the global route planner, used to calculate the route
-            self._grp = GlobalRoutePlanner(self._map, 0.5)
+            # Track the distance along the route, traced by the global route planner
+            self._route_tracker = RouteDistanceTracker(CarlaDataProvider.get_route_planner(0.5))
         else:
-            self._grp = None
+            self._route_tracker = None
 
     def initialise(self):
         if self._distance < 0:
@@ -134,7 +136,7 @@ class InTriggerDistanceToOSCPosition(AtomicCondition):
                 actor_location = self._map.get_waypoint(actor_location).transform.location
                 osc_location = self._map.get_waypoint(osc_location).transform.location
 
-            distance = calculate_distance(actor_location, osc_location, self._grp)
+            distance = calculate_distance(actor_location, osc_location, route_tracker=self._route_tracker)
 
             if self._comparison_operator(distance, self._distance):
                 new_status = py_trees.common.Status.SUCCESS
@@ -171,10 +173,10 @@ class InTimeToArrivalToOSCPosition(AtomicCondition):
         self._comparison_operator = comparison_operator
 
         if self._along_route:
-            # Get the global route planner, used to calculate the route
-            self._grp = GlobalRoutePlanner(self._map, 0.5)
+            # Track the distance along the route, traced by the global route planner
+            self._route_tracker = RouteDistanceTracker(CarlaDataProvider.get_route_planner(0.5))
         else:
-            self._grp = None
+            self._route_tracker = None
 
     def initialise(self):
         if self._time < 0:
@@ -203,7 +205,7 @@ class InTimeToArrivalToOSCPosition(AtomicCondition):
             actor_location = self._map.get_waypoint(actor_location).transform.location
             target_location = self._map.get_waypoint(target_location).transform.location
 
-        distance = calculate_distance(actor_location, target_location, self._grp)
+        distance = calculate_distance(actor_location, target_location, route_tracker=self._route_tracker)
 
         actor_velocity = CarlaDataProvider.get_velocity(self._actor)
 
@@ -344,6 +346,13 @@ class TriggerVelocity(AtomicCondition):
         self._target_velocity = target_velocity
         self._comparison_operator = comparison_operator
 
+    def initialise(self):
+        """
+        Evaluate the speed of the actor together with the rest of conditions
+        """
+        ConditionEvaluator.register(self, ConditionEvaluator.VELOCITY, self._actor)
+        super(TriggerVelocity, self).initialise()
+
     def update(self):
         """
         Gets the speed of the actor and compares it with the reference one
@@ -354,7 +363,7 @@ class TriggerVelocity(AtomicCondition):
         """
         new_status = py_trees.common.Status.RUNNING
 
-        actor_speed = CarlaDataProvider.get_velocity(self._actor)
+        actor_speed = ConditionEvaluator.get_value(self)
 
         if self._comparison_operator(actor_speed, self._target_velocity):
             new_status = py_trees.common.Status.SUCCESS
@@ -363,6 +372,13 @@ class TriggerVelocity(AtomicCondition):
 
         return new_status
 
+    def terminate(self, new_status):
+        """
+        Stop evaluating the speed of the actor
+        """
+        ConditionEvaluator.unregister(self)
+        super(TriggerVelocity, self).terminate(new_status)
+
 
 class TriggerAcceleration(AtomicCondition):
 
@@ -586,9 +602,24 @@ class InTriggerDistanceToVehicle(AtomicCondition):
         self._comparison_operator = comparison_operator
 
         if distance_type == "longitudinal":
-            self._global_rp = GlobalRoutePlanner(CarlaDataProvider.get_world().get_map(), 1.0)
+            self._route_tracker = RouteDistanceTracker(CarlaDataProvider.get_route_planner(1.0))
         else:
-            self._global_rp = None
+            self._route_tracker = None
+
+        # The cartesian distances are evaluated together with the rest of conditions
+        self._batched = distance_type in ("cartesianDistance", "euclidianDistance")
+
+    def initialise(self):
+        """
+        Register the cartesian distance between the actors to be evaluated every tick
+        """
+        if self._batched:
+            offset = 0.0
+            if self._freespace and isinstance(self._reference_actor, (carla.Vehicle, carla.Walker)):
+                offset = self._reference_actor.bounding_box.extent.x + self._actor.bounding_box.extent.x
+            ConditionEvaluator.register(self, ConditionEvaluator.DISTANCE, self._actor,
+                                        self._reference_actor, offset)
+        super(InTriggerDistanceToVehicle, self).initialise()
 
     def update(self):
         """
@@ -596,17 +627,22 @@ class InTriggerDistanceToVehicle(AtomicCondition):
         """
         new_status = py_trees.common.Status.RUNNING
 
-        location = CarlaDataProvider.get_location(self._actor)
-        reference_location = CarlaDataProvider.get_location(self._reference_actor)
+        if self._batched:
+            distance = ConditionEvaluator.get_value(self)
+            if distance is None:
+                return new_status
+        else:
+            location = CarlaDataProvider.get_location(self._actor)
+            reference_location = CarlaDataProvider.get_location(self._reference_actor)
 
-        if location is None or reference_location is None:
-            return new_status
+            if location is None or reference_location is None:
+                return new_status
 
-        distance = sr_tools.scenario_helper.get_distance_between_actors(self._actor,
-                                                                        self._reference_actor,
-                                                                        distance_type=self._distance_type,
-                                                                        freespace=self._freespace,
-                                                                        global_planner=self._global_rp)
+            distance = sr_tools.scenario_helper.get_distance_between_actors(self._actor,
+                                                                            self._reference_actor,
+                                                                            distance_type=self._distance_type,
+                                                                            freespace=self._freespace,
+                                                                            route_tracker=self._route_tracker)
 
         if self._comparison_operator(distance, self._distance):
             new_status = py_trees.common.Status.SUCCESS
@@ -615,6 +651,13 @@ class InTriggerDistanceToVehicle(AtomicCondition):
 
         return new_status
 
+    def terminate(self, new_status):
+        """
+        Stop evaluating the distance between the actors
+        """
+        ConditionEvaluator.unregister(self)
+        super(InTriggerDistanceToVehicle, self).terminate(new_status)
+
 
 class InTriggerDistanceToLocation(AtomicCondition):
 
@@ -690,13 +733,6 @@ class InTriggerDistanceToNextIntersection(AtomicCondition):
         self.logger.debug("%s.__init__()" % (self.__class__.__name__))
         self._actor = actor
         self._distance = distance
-        self._map = CarlaDataProvider.get_map()
-
-        waypoint = self._map.get_waypoint(self._actor.get_location())
-        while waypoint and not waypoint.is_intersection:
-            waypoint = waypoint.next(1)[-1]
-
-        self._final_location = waypoint.transform.location
 
     def update(self):
         """
@@ -704,10 +740,10 @@ class InTriggerDistanceToNextIntersection(AtomicCondition):
         """
         new_status = py_trees.common.Status.RUNNING
 
-        current_waypoint = self._map.get_waypoint(CarlaDataProvider.get_location(self._actor))
-        distance = calculate_distance(current_waypoint.transform.location, self._final_location)
+        current_waypoint = CarlaDataProvider.get_waypoint(CarlaDataProvider.get_location(self._actor))
+        junction = CarlaDataProvider.get_next_junction(current_waypoint) if current_waypoint else None
 
-        if distance < self._distance:
+        if junction is not None and junction.entry_distance < self._distance:
             new_status = py_trees.common.Status.SUCCESS
 
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
@@ -854,10 +890,26 @@ class InTimeToArrivalToVehicle(AtomicCondition):
         self._comparison_operator = comparison_operator
 
         if self._along_route:
-            # Get the global route planner, used to calculate the route
-            self._grp = GlobalRoutePlanner(self._map, 0.5)
+            # Track the distance along the route, traced by the global route planner
+            self._route_tracker = RouteDistanceTracker(CarlaDataProvider.get_route_planner(0.5))
         else:
-            self._grp = None
+            self._route_tracker = None
+
+    def initialise(self):
+        """
+        Register the time to arrival between the actors to be evaluated every tick,
+        unless it depends on their route
+        """
+        if not self._along_route:
+            offset = 0.0
+            if self._condition_freespace:
+                # Patch, as currently static objects have no bounding boxes
+                for actor in (self._actor, self._other_actor):
+                    if isinstance(actor, (carla.Vehicle, carla.Walker)):
+                        offset += actor.bounding_box.extent.x
+            ConditionEvaluator.register(self, ConditionEvaluator.TIME_TO_ARRIVAL, self._actor,
+                                        self._other_actor, offset)
+        super(InTimeToArrivalToVehicle, self).initialise()
 
     def update(self):
         """
@@ -865,6 +917,17 @@ class InTimeToArrivalToVehicle(AtomicCondition):
         """
         new_status = py_trees.common.Status.RUNNING
 
+        if not self._along_route:
+            time_to_arrival = ConditionEvaluator.get_value(self)
+            if time_to_arrival is None:
+                return new_status
+
+            if self._comparison_operator(time_to_arrival, self._time):
+                new_status = py_trees.common.Status.SUCCESS
+
+            self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
+            return new_status
+
         current_location = CarlaDataProvider.get_location(self._actor)
         other_location = CarlaDataProvider.get_location(self._other_actor)
 
@@ -888,12 +951,11 @@ class InTimeToArrivalToVehicle(AtomicCondition):
         current_velocity = CarlaDataProvider.get_velocity(self._actor)
         other_velocity = CarlaDataProvider.get_velocity(self._other_actor)
 
-        if self._along_route:
-            # Global planner needs a location at a driving lane
-            current_location = self._map.get_waypoint(current_location).transform.location
-            other_location = self._map.get_waypoint(other_location).transform.location
+        # Global planner needs a location at a driving lane
+        current_location = self._map.get_waypoint(current_location).transform.location
+        other_location = self._map.get_waypoint(other_location).transform.location
 
-        distance = calculate_distance(current_location, other_location, self._grp)
+        distance = calculate_distance(current_location, other_location, route_tracker=self._route_tracker)
 
         # if velocity is too small, simply use a large time to arrival
         time_to_arrival = self._max_time_to_arrival
@@ -911,6 +973,13 @@ class InTimeToArrivalToVehicle(AtomicCondition):
 
         return new_status
 
+    def terminate(self, new_status):
+        """
+        Stop evaluating the time to arrival between the actors
+        """
+        ConditionEvaluator.unregister(self)
+        super(InTimeToArrivalToVehicle, self).terminate(new_status)
+
 
 class InTimeToArrivalToVehicleSideLane(InTimeToArrivalToLocation):
 
@@ -1009,13 +1078,14 @@ class WaitUntilInFront(AtomicCondition):
         self._factor = max(EPSILON, factor)  # Must be > 0
         self._check_distance = check_distance
 
-        self._world = CarlaDataProvider.get_world()
-        self._map = CarlaDataProvider.get_map(self._world)
-
         actor_extent = self._actor.bounding_box.extent.x
         other_extent = self._other_actor.bounding_box.extent.x
         self._length = self._factor * (actor_extent + other_extent)
 
+        # Lane of the other actor, where the actor's position is compared with it
+        self._lane_frame = LaneFrameTracker(self._other_actor,
+                                            max(LaneFrameTracker.LOOKAHEAD, self._length + self._distance))
+
         self.logger.debug("%s.__init__()" % (self.__class__.__name__))
 
     def update(self):
@@ -1032,29 +1102,28 @@ class WaitUntilInFront(AtomicCondition):
         if actor_location is None:
             return new_status
 
-        # Waypoint in front of the other actor
-        other_location = CarlaDataProvider.get_location(self._other_actor)
-        other_waypoint = self._map.get_waypoint(other_location)
-        if other_waypoint is None:
+        # Position of both actors along the lane of the other actor
+        other_s = self._lane_frame.update()
+        if other_s is None:
             return new_status
-        other_next_waypoints = other_waypoint.next(self._length)
-        if other_next_waypoints is None:
+        actor_s = self._lane_frame.get_s(actor_location, self._actor.id)
+        if actor_s is None:
             return new_status
-        other_next_waypoint = other_next_waypoints[0]
 
-        # Wait for the vehicle to be in front
-        other_dir = other_next_waypoint.transform.get_forward_vector()
-        act_other_dir = actor_location - other_next_waypoint.transform.location
-        dot_ve_wp = other_dir.x * act_other_dir.x + other_dir.y * act_other_dir.y + other_dir.z * act_other_dir.z
-
-        if dot_ve_wp > 0.0:
+        # Wait for the vehicle to be in front of the point at length meters from the other actor
+        target_s = other_s + self._length
+        if actor_s > target_s:
             in_front = True
 
         # Wait for it to be close-by
         if not self._check_distance:
             close_by = True
-        elif actor_location.distance(other_next_waypoint.transform.location) < self._distance:
-            close_by = True
+        else:
+            target_location = self._lane_frame.get_location(target_s)
+            offset = (actor_location.x - target_location[0], actor_location.y - target_location[1],
+                      actor_location.z - target_location[2])
+            if math.sqrt(sum(value * value for value in offset)) < self._distance:
+                close_by = True
 
         if in_front and close_by:
             new_status = py_trees.common.Status.SUCCESS
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a supervisor of the CARLA server, which detects crashed or
+hung servers and restarts them, so that a batch of scenarios can continue
+"""
+
+from __future__ import print_function
+
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+
+import carla
+
+
+def carla_health_check(host, port, timeout):
+    """
+    Cheap RPC to the CARLA server. Returns True if it answered within the timeout
+    """
+    try:
+        client = carla.Client(host, port, worker_threads=1)
+        client.set_timeout(timeout)
+        client.get_server_version()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ServerSupervisor(object):
+
+    """
+    Supervisor of a CARLA server.
+
+    If a launch command is given, the supervisor owns the server process: it starts it,
+    and kills and relaunches it if it crashed or stopped answering. The command may use
+    the '{port}' placeholder, e.g. "./CarlaUE4.sh -RenderOffScreen -carla-rpc-port={port}".
+    Otherwise, the supervisor attaches to a running server and can only wait for it to
+    come back (e.g. if it is restarted by a container orchestrator).
+
+    Args:
+        host (str): Host of the server
+        port (int): RPC port of the server
+        command (str or list): Launch command of the server. None to attach to a running one
+        health_timeout (float): Time the server has to answer a health check [seconds]
+        startup_timeout (float): Time the server has to become healthy after a (re)start [seconds]
+        health_check (callable): health_check(host, port, timeout) returning True if the server is healthy.
+            Defaults to a get_server_version RPC.
+    """
+
+    POLL_INTERVAL = 0.5     # Time between health checks, while waiting for the server [seconds]
+    STOP_TIMEOUT = 10.0     # Time the server has to exit, before it is killed [seconds]
+
+    def __init__(self, host='127.0.0.1', port=2000, command=None, health_timeout=5.0,
+                 startup_timeout=60.0, health_check=None):
+        self._host = host
+        self._port = int(port)
+        if isinstance(command, str):
+            command = shlex.split(command)
+        self._command = [arg.format(port=self._port) for arg in command] if command else None
+        self._health_timeout = health_timeout
+        self._startup_timeout = startup_timeout
+        self._health_check = health_check if health_check is not None else carla_health_check
+        self._process = None
+        self.restarts = 0
+
+    def owns_server(self):
+        """
+        Returns True if the supervisor launched the server
+        """
+        return self._command is not None
+
+    def start(self):
+        """
+        Launch the server (if required) and wait until it is healthy
+        """
+        if self._command and not self._is_process_running():
+            self._launch()
+        return self.wait_until_healthy()
+
+    def _launch(self):
+        """
+        Start the server process, in its own process group so that all its children can be stopped
+        """
+        kwargs = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+        if sys.platform != 'win32':
+            kwargs['start_new_session'] = True
+        self._process = subprocess.Popen(self._command, **kwargs)  # pylint: disable=consider-using-with
+
+    def _is_process_running(self):
+        """
+        Returns True if the server process launched by the supervisor is running
+        """
+        return self._process is not None and self._process.poll() is None
+
+    def is_alive(self):
+        """
+        Returns True if the server is running and answers the health check in time
+        """
+        if self._command and not self._is_process_running():
+            return False
+        try:
+            return bool(self._health_check(self._host, self._port, self._health_timeout))
+        except (RuntimeError, OSError):
+            return False
+
+    def wait_until_healthy(self, timeout=None):
+        """
+        Wait until the server answers the health check. Returns False if it did not
+        within the timeout (default: startup timeout), or if its process exited
+        """
+        deadline = time.time() + (self._startup_timeout if timeout is None else timeout)
+        while True:
+            if self.is_alive():
+                return True
+            if self._command and not self._is_process_running():
+                return False
+            if time.time() > deadline:
+                return False
+            time.sleep(self.POLL_INTERVAL)
+
+    def stop(self):
+        """
+        Stop the server process, if it was launched by the supervisor
+        """
+        if self._process is None:
+            return
+
+        if self._process.poll() is None:
+            self._signal_process(signal.SIGTERM)
+            try:
+                self._process.wait(self.STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._signal_process(signal.SIGKILL if sys.platform != 'win32' else signal.SIGTERM)
+                self._process.wait()
+        self._process = None
+
+    def _signal_process(self, signum):
+        """
+        Send a signal to the server process and all its children
+        """
+        try:
+            if sys.platform != 'win32':
+                os.killpg(os.getpgid(self._process.pid), signum)
+            else:
+                self._process.terminate()
+        except OSError:
+            pass
+
+    def restart(self):
+        """
+        Restart a crashed or hung server and wait until it is healthy again
+        """
+        self.restarts += 1
+        if self._command:
+            print("Restarting the CARLA server at {}:{}".format(self._host, self._port))
+            self.stop()
+            self._launch()
+        else:
+            print("WARNING: The CARLA server at {}:{} is not responding. "
+                  "Waiting for it to be restarted".format(self._host, self._port))
+        return self.wait_until_healthy()
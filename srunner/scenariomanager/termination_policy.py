@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a termination policy, ending a scenario before its timeout
+once its outcome is known or it isn't interesting anymore
+"""
+
+from __future__ import print_function
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.scenarioatomics.atomic_criteria import CollisionTest
+
+
+class TerminationRule(object):
+
+    """
+    Base class of the termination rules. They are checked every tick,
+    and return the reason to end the scenario, or None
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._ego_vehicles = []
+        self._other_actors = []
+
+    def setup(self, ego_vehicles, other_actors, criteria):  # pylint: disable=unused-argument
+        """
+        Setup the rule for a new scenario
+        """
+        self._ego_vehicles = [actor for actor in ego_vehicles if actor is not None]
+        self._other_actors = [actor for actor in other_actors if actor is not None]
+
+    def check(self, time):  # pylint: disable=unused-argument,no-self-use
+        """
+        Returns the reason to end the scenario at the given game time, or None.
+        The base rule never ends it
+        """
+        return None
+
+
+class CollisionRule(TerminationRule):
+
+    """
+    Ends the scenario some time after the first collision registered by its collision tests
+    """
+
+    def __init__(self, delay=0.0):
+        super(CollisionRule, self).__init__("collision")
+        self._delay = delay
+        self._collision_tests = []
+        self._collision_time = None
+
+    def setup(self, ego_vehicles, other_actors, criteria):
+        super(CollisionRule, self).setup(ego_vehicles, other_actors, criteria)
+        self._collision_tests = [criterion for criterion in criteria if isinstance(criterion, CollisionTest)]
+        self._collision_time = None
+        if not self._collision_tests:
+            print("WARNING: The scenario has no collision test, the collision termination rule is ignored")
+
+    def check(self, time):
+        if self._collision_time is None:
+            if not any(criterion.actual_value > 0 for criterion in self._collision_tests):
+                return None
+            self._collision_time = time
+
+        if time - self._collision_time >= self._delay:
+            return "{:.1f}s after the first collision".format(time - self._collision_time)
+        return None
+
+
+class StationaryRule(TerminationRule):
+
+    """
+    Ends the scenario when the ego vehicle has been stationary for some time
+    """
+
+    def __init__(self, duration, max_speed=0.1):
+        super(StationaryRule, self).__init__("stationary")
+        self._duration = duration
+        self._max_speed = max_speed
+        self._moving_time = None
+
+    def setup(self, ego_vehicles, other_actors, criteria):
+        super(StationaryRule, self).setup(ego_vehicles, other_actors, criteria)
+        self._moving_time = None
+
+    def check(self, time):
+        if not self._ego_vehicles:
+            return None
+
+        if self._moving_time is None or CarlaDataProvider.get_velocity(self._ego_vehicles[0]) > self._max_speed:
+            self._moving_time = time
+        elif time - self._moving_time >= self._duration:
+            return "Ego vehicle stationary for {:.1f}s".format(time - self._moving_time)
+        return None
+
+
+class RegionRule(TerminationRule):
+
+    """
+    Ends the scenario when all other actors have been further than a radius
+    from the ego vehicle for some time (i.e. they left the region of interest)
+    """
+
+    def __init__(self, radius, duration=0.0):
+        super(RegionRule, self).__init__("region")
+        self._radius = radius
+        self._duration = duration
+        self._inside_time = None
+
+    def setup(self, ego_vehicles, other_actors, criteria):
+        super(RegionRule, self).setup(ego_vehicles, other_actors, criteria)
+        self._inside_time = None
+
+    def check(self, time):
+        if not self._ego_vehicles or not self._other_actors:
+            return None
+
+        ego_location = CarlaDataProvider.get_location(self._ego_vehicles[0])
+        if ego_location is None:
+            return None
+
+        inside = False
+        for actor in self._other_actors:
+            location = CarlaDataProvider.get_location(actor)
+            if location is not None and location.distance(ego_location) < self._radius:
+                inside = True
+                break
+
+        if self._inside_time is None or inside:
+            self._inside_time = time
+        elif time - self._inside_time >= self._duration:
+            return "Other actors further than {}m for {:.1f}s".format(self._radius, time - self._inside_time)
+        return None
+
+
+class TerminationPolicy(object):
+
+    """
+    Set of termination rules, checked by the ScenarioManager every tick. The scenario
+    ends as soon as one of them is met, and its reason is stored by the manager.
+
+    The policy can be created from a comma separated list of rules, with their
+    arguments separated by colons:
+    - collision[:delay]: end delay seconds after the first collision (default 0)
+    - stationary:duration[:max_speed]: end when the ego has been slower than max_speed
+        (default 0.1 m/s) for duration seconds
+    - region:radius[:duration]: end when all other actors have been further than
+        radius meters from the ego for duration seconds (default 0)
+    e.g. "collision:2,stationary:20,region:80:5"
+    """
+
+    RULES = {
+        'collision': CollisionRule,
+        'stationary': StationaryRule,
+        'region': RegionRule,
+    }
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+
+    @staticmethod
+    def from_string(policy):
+        """
+        Create the policy from its description
+        """
+        rules = []
+        for description in policy.split(','):
+            description = description.strip()
+            if not description:
+                continue
+
+            name, *arguments = description.split(':')
+            if name not in TerminationPolicy.RULES:
+                raise ValueError("Unknown termination rule '{}'. Available rules: {}".format(
+                    name, ', '.join(sorted(TerminationPolicy.RULES))))
+            rules.append(TerminationPolicy.RULES[name](*[float(argument) for argument in arguments]))
+
+        return TerminationPolicy(rules)
+
+    def setup(self, ego_vehicles, other_actors, criteria):
+        """
+        Setup all rules for a new scenario
+        """
+        for rule in self.rules:
+            rule.setup(ego_vehicles, other_actors, criteria)
+
+    def check(self, time):
+        """
+        Returns the reason to end the scenario at the given game time, or None
+        """
+        for rule in self.rules:
+            reason = rule.check(time)
+            if reason is not None:
+                return reason
+        return None
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2018-2020 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the plans of the traffic light manipulations done at junctions,
+compiled before the scenarios start so that only their events are checked at runtime
+"""
+
+from __future__ import print_function
+
+from collections import namedtuple
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.junction_table import JunctionTable
+
+
+TrafficLightPhase = namedtuple('TrafficLightPhase', ['event', 'value', 'states'])
+TrafficLightPhase.__doc__ = """
+Phase of a TrafficLightPlan:
+- event: event starting the phase (one of the TrafficLightPlan events)
+- value: distance [m] or time [s] of the event, depending on its kind
+- states: states set to the junction at the start of the phase, or None to reset it
+"""
+
+
+class TrafficLightPlan(object):
+
+    """
+    Plan of the manipulation of the traffic lights of a junction, to trigger scenarios 7 to 10:
+    the ego lane is set to green and then to yellow when the ego vehicle gets close, red for some
+    time while another lane is green (letting its vehicles enter the junction), and green again
+    together with that other lane, until the ego vehicle leaves the junction.
+
+    Everything that depends on the junction (the lights, their group annotations, the chosen lane,
+    the entry of the junction and the waiting times) is computed when the plan is compiled. At runtime,
+    the phases are just applied in order when their event happens:
+    - START: right away
+    - DISTANCE: the ego vehicle is closer than value to the entry of the junction [m]
+    - TIME: value seconds after the start of the previous phase
+    - JUNCTION_EXIT: the ego vehicle entered the junction and left it
+
+    Args:
+        traffic_light (carla.TrafficLight): traffic light of the ego lane
+        annotations (dict): lights of the junction, by direction ('ref', 'opposite', 'left', 'right')
+        configuration (str): direction set to green together with the ego lane, or None if there is none
+        junction_location (carla.Location): location at which the ego lane enters the junction
+        waiting_time (float): time the ego lane is red while the other lane is green [s]
+    """
+
+    RED = carla.TrafficLightState.Red
+    YELLOW = carla.TrafficLightState.Yellow
+    GREEN = carla.TrafficLightState.Green
+
+    # Events
+    START = 0
+    DISTANCE = 1
+    TIME = 2
+    JUNCTION_EXIT = 3
+
+    # Time constants
+    RED_TIME = 1.5  # Minimum time the ego vehicle waits in red (seconds)
+    YELLOW_TIME = 2  # Time spent at yellow state (seconds)
+
+    # Experimental values
+    TRIGGER_DISTANCE = 10  # Distance that makes all vehicles in the lane enter the junction (meters)
+    DIST_TO_WAITING_TIME = 0.04  # Used to wait longer at larger intersections (s/m)
+
+    INT_CONF_OPP1 = {'ego': RED, 'ref': RED, 'left': RED, 'right': RED, 'opposite': GREEN}
+    INT_CONF_OPP2 = {'ego': GREEN, 'ref': GREEN, 'left': RED, 'right': RED, 'opposite': GREEN}
+    INT_CONF_LFT1 = {'ego': RED, 'ref': RED, 'left': GREEN, 'right': RED, 'opposite': RED}
+    INT_CONF_LFT2 = {'ego': GREEN, 'ref': GREEN, 'left': GREEN, 'right': RED, 'opposite': RED}
+    INT_CONF_RGT1 = {'ego': RED, 'ref': RED, 'left': RED, 'right': GREEN, 'opposite': RED}
+    INT_CONF_RGT2 = {'ego': GREEN, 'ref': GREEN, 'left': RED, 'right': GREEN, 'opposite': RED}
+
+    INT_CONF_REF1 = {'ego': GREEN, 'ref': GREEN, 'left': RED, 'right': RED, 'opposite': RED}
+    INT_CONF_REF2 = {'ego': YELLOW, 'ref': YELLOW, 'left': RED, 'right': RED, 'opposite': RED}
+
+    # Depending on the scenario, IN ORDER OF IMPORTANCE, the traffic light changed
+    # The list has to contain only items of the INT_CONF
+    SUBTYPE_CONFIG_TRANSLATION = {
+        'S7left': ['left', 'opposite', 'right'],
+        'S7right': ['left', 'opposite'],
+        'S7opposite': ['right', 'left', 'opposite'],
+        'S8left': ['opposite'],
+        'S9right': ['left', 'opposite']
+    }
+
+    CONFIG_TLM_TRANSLATION = {
+        'left': [INT_CONF_LFT1, INT_CONF_LFT2],
+        'right': [INT_CONF_RGT1, INT_CONF_RGT2],
+        'opposite': [INT_CONF_OPP1, INT_CONF_OPP2]
+    }
+
+    def __init__(self, traffic_light, annotations, configuration, junction_location, waiting_time):
+        self.traffic_light = traffic_light
+        self.annotations = annotations
+        self.configuration = configuration
+        self.junction_location = junction_location
+        self.waiting_time = waiting_time
+
+        self.phases = []
+        if configuration is not None:
+            self.phases = [
+                TrafficLightPhase(self.START, 0.0, self.INT_CONF_REF1),
+                TrafficLightPhase(self.DISTANCE, self.TRIGGER_DISTANCE, self.INT_CONF_REF2),
+                TrafficLightPhase(self.TIME, self.YELLOW_TIME, self.CONFIG_TLM_TRANSLATION[configuration][0]),
+                TrafficLightPhase(self.TIME, waiting_time, self.CONFIG_TLM_TRANSLATION[configuration][1]),
+                TrafficLightPhase(self.JUNCTION_EXIT, 0.0, None),
+            ]
+
+    @staticmethod
+    def compile(subtype, location, debug=False):
+        """
+        Returns the plan of the junction ahead of a location, for a scenario subtype (check
+        SUBTYPE_CONFIG_TRANSLATION), or None if there is no traffic light ahead of it.
+        If none of the lights of the subtype exist at the junction, the plan has no phases
+        """
+        waypoint = CarlaDataProvider.get_map().get_waypoint(location)
+        junction = CarlaDataProvider.get_next_junction(waypoint)
+        if junction is None or junction.in_junction:
+            return None
+        traffic_light = CarlaDataProvider.get_junction_traffic_light(junction)
+        if traffic_light is None:
+            return None
+
+        annotations = CarlaDataProvider.annotate_trafficlight_in_group(traffic_light)
+        configuration = TrafficLightPlan.get_configuration(subtype, annotations, debug)
+
+        waiting_time = None
+        if configuration is not None:
+            tl_location = CarlaDataProvider.get_trafficlight_trigger_location(annotations[configuration][0])
+            ego_tl_location = CarlaDataProvider.get_trafficlight_trigger_location(annotations['ref'][0])
+            waiting_time = TrafficLightPlan.RED_TIME + \
+                ego_tl_location.distance(tl_location) * TrafficLightPlan.DIST_TO_WAITING_TIME
+
+        return TrafficLightPlan(traffic_light, annotations, configuration,
+                                JunctionTable.get_junction_location(junction), waiting_time)
+
+    @staticmethod
+    def get_configuration(subtype, annotations, debug=False):
+        """
+        Returns the first direction of the subtype with traffic lights at the
+        junction (described by its annotations), or None if there is none
+        """
+        if subtype not in TrafficLightPlan.SUBTYPE_CONFIG_TRANSLATION:
+            if debug:
+                print("This subtype is unknown")
+            return None
+
+        for configuration in TrafficLightPlan.SUBTYPE_CONFIG_TRANSLATION[subtype]:
+            if configuration not in annotations:
+                if debug:
+                    print("This configuration name is wrong")
+            elif annotations[configuration]:
+                return configuration
+
+        if debug:
+            print("This subtype has no traffic light available")
+        return None
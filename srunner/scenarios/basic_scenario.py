@@ -11,13 +11,14 @@ This module provide BasicScenario, the basic class of all the scenarios.
 
 from __future__ import print_function
 
-import operator
 import py_trees
 
 import carla
 
 import srunner.scenariomanager.scenarioatomics.atomic_trigger_conditions as conditions
+from srunner.scenariomanager.actor_state_registry import ActorStateRegistry
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.criteria_engine import CriteriaEngine
 from srunner.scenariomanager.timer import TimeOut
 from srunner.scenariomanager.weather_sim import WeatherBehavior
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import UpdateAllActorControls
@@ -227,6 +228,7 @@ class Scenario(object):
         self.test_criteria = criteria
         self.timeout = timeout
         self.name = name
+        self.criteria_engine = None
 
         if self.test_criteria is not None and not isinstance(self.test_criteria, py_trees.composites.Parallel):
             # list of nodes
@@ -285,24 +287,48 @@ class Scenario(object):
         criteria_list = self._extract_nodes_from_tree(self.criteria_tree)
         return criteria_list
 
+    def add_criterion(self, criterion):
+        """
+        Add a test criterion to the scenario, before it is run
+        """
+        if self.criteria_tree is None:
+            self.criteria_tree = py_trees.composites.Parallel(
+                name="Test Criteria",
+                policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE
+            )
+            self.test_criteria = self.criteria_tree
+            self.scenario_tree.add_child(self.criteria_tree)
+
+        self.criteria_tree.add_child(criterion)
+        if self.criteria_engine is not None:
+            self.criteria_engine.criteria.append(criterion)
+
+    def use_criteria_engine(self):
+        """
+        Remove the test criteria from the scenario tree, to be evaluated by a CriteriaEngine
+        (self.criteria_engine) instead. Returns False if the criteria can't be evaluated by it
+        """
+        if self.criteria_engine is not None:
+            return True
+        if self.test_criteria is None or not CriteriaEngine.supports(self.criteria_tree):
+            return False
+
+        self.scenario_tree.remove_child(self.criteria_tree)
+        self.criteria_engine = CriteriaEngine(self.criteria_tree.children, self.criteria_tree.policy)
+        return True
+
     def terminate(self):
         """
         This function sets the status of all leaves in the scenario tree to INVALID
         """
         # Get list of all nodes in the tree
         node_list = self._extract_nodes_from_tree(self.scenario_tree)
+        if self.criteria_engine is not None:
+            node_list += self.get_criteria()
 
         # Set status to INVALID
         for node in node_list:
             node.terminate(py_trees.common.Status.INVALID)
 
         # Cleanup all instantiated controllers
-        actor_dict = {}
-        try:
-            check_actors = operator.attrgetter("ActorsWithController")
-            actor_dict = check_actors(py_trees.blackboard.Blackboard())
-        except AttributeError:
-            pass
-        for actor_id in actor_dict:
-            actor_dict[actor_id].reset()
-        py_trees.blackboard.Blackboard().set("ActorsWithController", {}, overwrite=True)
+        ActorStateRegistry.reset_controllers()
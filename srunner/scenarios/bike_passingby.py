@@ -8,6 +8,7 @@ import py_trees
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import (ActorTransformSetter,
                                                                       ActorDestroy,
                                                                       AccelerateToVelocity,
@@ -21,7 +22,6 @@ from srunner.scenariomanager.scenarioatomics.atomic_trigger_conditions import (I
 from srunner.scenariomanager.timer import TimeOut
 from srunner.scenarios.basic_scenario import BasicScenario
 from srunner.tools.scenario_helper import get_location_in_distance_from_wp
-import secrets
 
 class BikePassingby(BasicScenario):
 
@@ -50,7 +50,7 @@ class BikePassingby(BasicScenario):
         self._number_of_attempts = 20
         # Number of attempts made so far
         self._spawn_attempted = 0
-        self._random = secrets.randbelow(
+        self._random = RandomStreams.get(RandomStreams.ADVERSARY).randint(
             20)/20-0.5 if randomize else 0  # [-0.5,0.5)
         self._bike_start_distance = 10 + (self._random * 5)
 
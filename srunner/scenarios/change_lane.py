@@ -17,11 +17,11 @@ fast to avoid an collision. There are two options to avoid an accident:
 The ego vehicle adjusts its velocity or changes the lane as well.
 """
 
-import random
 import py_trees
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import (ActorTransformSetter,
                                                                       StopVehicle,
                                                                       LaneChange,
@@ -78,9 +78,10 @@ class ChangeLane(BasicScenario):
                                          criteria_enable=criteria_enable)
 
         if randomize:
-            self._fast_vehicle_distance = random.randint(10, 51)
-            self._fast_vehicle_velocity = random.randint(100, 201)
-            self._slow_vehicle_velocity = random.randint(1, 6)
+            rng = RandomStreams.get(RandomStreams.ADVERSARY)
+            self._fast_vehicle_distance = rng.randint(10, 52)
+            self._fast_vehicle_velocity = rng.randint(100, 202)
+            self._slow_vehicle_velocity = rng.randint(1, 7)
 
     def _initialize_actors(self, config):
 
@@ -12,11 +12,11 @@ bad road conditions, etc. and checks to see if the vehicle
 regains control and corrects it's course.
 """
 
-from numpy import random
 import py_trees
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import ChangeNoiseParameters, ActorTransformSetter
 from srunner.scenariomanager.scenarioatomics.atomic_criteria import CollisionTest
 from srunner.scenariomanager.scenarioatomics.atomic_trigger_conditions import (InTriggerDistanceToLocation,
@@ -74,7 +74,7 @@ class ControlLoss(BasicScenario):
         Custom initialization
         """
         if self._randomize:
-            self._distance = random.randint(low=10, high=80, size=3)
+            self._distance = RandomStreams.get(RandomStreams.ADVERSARY).randint(low=10, high=80, size=3)
             self._distance = sorted(self._distance)
         else:
             self._distance = [14, 48, 74]
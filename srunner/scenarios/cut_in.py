@@ -15,11 +15,11 @@ Another car is cutting just in front, coming from left or right lane.
 The ego vehicle may need to brake to avoid a collision.
 """
 
-import random
 import py_trees
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import (ActorTransformSetter,
                                                                       LaneChange,
                                                                       WaypointFollower,
@@ -62,8 +62,9 @@ class CutIn(BasicScenario):
                                     criteria_enable=criteria_enable)
 
         if randomize:
-            self._velocity = random.randint(20, 60)
-            self._trigger_distance = random.randint(10, 40)
+            rng = RandomStreams.get(RandomStreams.ADVERSARY)
+            self._velocity = rng.randint(20, 61)
+            self._trigger_distance = rng.randint(10, 41)
 
     def _initialize_actors(self, config):
 
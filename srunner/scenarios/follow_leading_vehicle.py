@@ -16,13 +16,12 @@ a collision. The scenario ends either via a timeout, or if the ego
 vehicle stopped close enough to the leading vehicle
 """
 
-import random
-
 import py_trees
 
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import (ActorTransformSetter,
                                                                       ActorDestroy,
                                                                       KeepVelocity,
@@ -58,8 +57,8 @@ class FollowLeadingVehicle(BasicScenario):
         """
 
         self._map = CarlaDataProvider.get_map()
-        self._first_vehicle_location = 25
-        self._first_vehicle_speed = 10
+        self._first_vehicle_location = float(config.other_parameters.get('start_distance', 25))
+        self._first_vehicle_speed = float(config.other_parameters.get('adversary_speed', 10))
         self._reference_waypoint = self._map.get_waypoint(config.trigger_points[0].location)
         self._other_actor_max_brake = 1.0
         self._other_actor_stop_in_front_intersection = 20
@@ -75,10 +74,10 @@ class FollowLeadingVehicle(BasicScenario):
                                                    criteria_enable=criteria_enable)
 
         if randomize:
-            self._ego_other_distance_start = random.randint(4, 8)
+            self._ego_other_distance_start = RandomStreams.get(RandomStreams.ADVERSARY).randint(4, 9)
 
             # Example code how to randomize start location
-            # distance = random.randint(20, 80)
+            # distance = RandomStreams.get(RandomStreams.ADVERSARY).randint(20, 81)
             # new_location, _ = get_location_in_distance(self.ego_vehicles[0], distance)
             # waypoint = CarlaDataProvider.get_map().get_waypoint(new_location)
             # waypoint.transform.location.z += 39
@@ -204,7 +203,7 @@ class FollowLeadingVehicleWithObstacle(BasicScenario):
                                                                debug_mode,
                                                                criteria_enable=criteria_enable)
         if randomize:
-            self._ego_other_distance_start = random.randint(4, 8)
+            self._ego_other_distance_start = RandomStreams.get(RandomStreams.ADVERSARY).randint(4, 9)
 
     def _initialize_actors(self, config):
         """
@@ -14,6 +14,7 @@ from __future__ import print_function
 import py_trees
 
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import TrafficLightManipulator
+from srunner.scenariomanager.traffic_light_plan import TrafficLightPlan
 
 from srunner.scenariomanager.scenarioatomics.atomic_criteria import CollisionTest, DrivenDistanceTest, MaxVelocityTest
 from srunner.scenariomanager.scenarioatomics.atomic_trigger_conditions import DriveDistance, WaitEndIntersection
@@ -47,6 +48,9 @@ class SignalJunctionCrossingRoute(BasicScenario):
         self.timeout = timeout
         self.subtype = config.subtype
 
+        # Plan of the junction ahead of the trigger point, computed now instead of when the scenario starts
+        self._plan = TrafficLightPlan.compile(self.subtype, config.trigger_points[0].location, debug_mode)
+
         super(SignalJunctionCrossingRoute, self).__init__("SignalJunctionCrossingRoute",
                                                           ego_vehicles,
                                                           config,
@@ -70,7 +74,7 @@ class SignalJunctionCrossingRoute(BasicScenario):
         """
 
         # Changes traffic lights
-        traffic_hack = TrafficLightManipulator(self.ego_vehicles[0], self.subtype)
+        traffic_hack = TrafficLightManipulator(self.ego_vehicles[0], self.subtype, self._plan)
 
         # finally wait that ego vehicle drove a specific distance
         wait = DriveDistance(
@@ -112,6 +116,7 @@ class SignalJunctionCrossingRoute(BasicScenario):
         Remove all actors and traffic lights upon deletion
         """
         self._traffic_light = None
+        self._plan = None
         self.remove_all_actors()
 
 
@@ -35,6 +35,11 @@ class ManeuverOppositeDirection(BasicScenario):
     "Vehicle Maneuvering In Opposite Direction" (Traffic Scenario 06)
 
     This is a single ego vehicle scenario
+
+    The flow of opposite vehicles can reuse its actors, with the parameters of the configuration:
+    - source_pool_size: number of actors created out of sight at the start (default: 0)
+    - recycle_actors: if True, the actors reaching the sink are parked to be reused, while
+      there is room for them in the pool of parked actors (see --actorPoolSize) (default: False)
     """
 
     def __init__(self, world, ego_vehicles, config, randomize=False, debug_mode=False, criteria_enable=True,
@@ -51,6 +56,8 @@ class ManeuverOppositeDirection(BasicScenario):
         self._start_distance = self._first_vehicle_location * 0.9
         self._opposite_speed = 5.56   # m/s
         self._source_gap = 40   # m
+        self._source_pool_size = int(config.other_parameters.get('source_pool_size', 0))
+        self._recycle_actors = str(config.other_parameters.get('recycle_actors', False)).lower() in ('true', '1')
         self._reference_waypoint = self._map.get_waypoint(config.trigger_points[0].location)
         self._source_transform = None
         self._sink_location = None
@@ -126,8 +133,8 @@ class ManeuverOppositeDirection(BasicScenario):
         # Leaf nodes
         actor_source = ActorSource(
             ['vehicle.audi.tt', 'vehicle.tesla.model3', 'vehicle.nissan.micra'],
-            self._source_transform, self._source_gap, self._blackboard_queue_name)
-        actor_sink = ActorSink(self._sink_location, 10)
+            self._source_transform, self._source_gap, self._blackboard_queue_name, pool_size=self._source_pool_size)
+        actor_sink = ActorSink(self._sink_location, 10, recycle=self._recycle_actors)
         ego_drive_distance = DriveDistance(self.ego_vehicles[0], self._ego_vehicle_drive_distance)
         waypoint_follower = WaypointFollower(
             self.other_actors[1], self._opposite_speed,
@@ -8,6 +8,7 @@ import py_trees
 import carla
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import (ActorTransformSetter,
                                                                       ActorDestroy,
                                                                       AccelerateToVelocity,
@@ -21,7 +22,6 @@ from srunner.scenariomanager.scenarioatomics.atomic_trigger_conditions import (I
 from srunner.scenariomanager.timer import TimeOut
 from srunner.scenarios.basic_scenario import BasicScenario
 from srunner.tools.scenario_helper import get_location_in_distance_from_wp
-import secrets
 
 
 class PedestrianCrossing(BasicScenario):
@@ -41,6 +41,8 @@ class PedestrianCrossing(BasicScenario):
         self._other_actor_max_brake = 1.0
         self._time_to_reach = 10
         self._adversary_type = adversary_type  # flag to select either pedestrian (False) or cyclist (True)
+        if 'adversary_type' in config.other_parameters:
+            self._adversary_type = config.other_parameters['adversary_type'] == 'cyclist'
         self._walker_yaw = 0
         self._num_lane_changes = 1
         self.transform = None
@@ -51,9 +53,10 @@ class PedestrianCrossing(BasicScenario):
         self._number_of_attempts = 20
         # Number of attempts made so far
         self._spawn_attempted = 0
-        self._random = secrets.randbelow(
+        self._random = RandomStreams.get(RandomStreams.ADVERSARY).randint(
             20)/20-0.5 if randomize else 0  # [-0.5,0.5)
-        self._pedestrian_start_distance = 40 + (self._random * 4)
+        self._pedestrian_start_distance = float(config.other_parameters.get('start_distance', 40)) + (self._random * 4)
+        self._adversary_speed = config.other_parameters.get('adversary_speed', None)
 
         self._ego_route = CarlaDataProvider.get_ego_vehicle_route()
 
@@ -100,6 +103,9 @@ class PedestrianCrossing(BasicScenario):
             first_vehicle.set_simulate_physics(enabled=False)
             adversary = first_vehicle
 
+        if self._adversary_speed is not None:
+            self._other_actor_target_velocity = float(self._adversary_speed)
+
         return adversary
 
     def _spawn_blocker(self, transform, orientation_yaw):
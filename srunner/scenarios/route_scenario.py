@@ -26,6 +26,7 @@ from agents.navigation.local_planner import RoadOption
 from srunner.scenarioconfigs.scenario_configuration import ScenarioConfiguration, ActorConfigurationData
 # pylint: enable=line-too-long
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import Idle, ScenarioTriggerer
 from srunner.scenarios.basic_scenario import BasicScenario
 from srunner.tools.route_parser import RouteParser, TRIGGER_THRESHOLD, TRIGGER_ANGLE_THRESHOLD
@@ -261,13 +262,17 @@ class RouteScenario(BasicScenario):
         world.debug.draw_point(waypoints[-1][0].location + carla.Location(z=vertical_shift), size=0.2,
                                color=carla.Color(255, 0, 0), life_time=persistency)
 
-    def _scenario_sampling(self, potential_scenarios_definitions, random_seed=0):
+    def _scenario_sampling(self, potential_scenarios_definitions, random_seed=None):
         """
         The function used to sample the scenarios that are going to happen for this route.
+        Unless a random_seed is given, the scenario sampling stream of the job is used
         """
 
         # fix the random seed for reproducibility
-        rng = random.RandomState(random_seed)
+        if random_seed is None:
+            rng = RandomStreams.get(RandomStreams.SCENARIO_SAMPLING)
+        else:
+            rng = random.RandomState(random_seed)
 
         def position_sampled(scenario_choice, sampled_scenarios):
             """
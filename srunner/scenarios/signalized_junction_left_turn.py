@@ -16,6 +16,7 @@ import carla
 from agents.navigation.local_planner import RoadOption
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
 from srunner.scenariomanager.scenarioatomics.atomic_behaviors import (ActorTransformSetter,
                                                                       ActorDestroy,
                                                                       ActorSource,
@@ -25,7 +26,6 @@ from srunner.scenariomanager.scenarioatomics.atomic_criteria import CollisionTes
 from srunner.scenariomanager.scenarioatomics.atomic_trigger_conditions import DriveDistance
 from srunner.scenarios.basic_scenario import BasicScenario
 from srunner.tools.scenario_helper import generate_target_waypoint
-import secrets
 
 
 class SignalizedJunctionLeftTurn(BasicScenario):
@@ -55,7 +55,7 @@ class SignalizedJunctionLeftTurn(BasicScenario):
         self._blackboard_queue_name = 'SignalizedJunctionLeftTurn/actor_flow_queue'
         self._queue = py_trees.blackboard.Blackboard().set(self._blackboard_queue_name, Queue())
         self._initialized = True
-        self._random = secrets.randbelow(
+        self._random = RandomStreams.get(RandomStreams.ADVERSARY).randint(
             20)/20-0.5 if randomize else 0  # [-0.5,0.5)
         super(SignalizedJunctionLeftTurn, self).__init__("TurnLeftAtSignalizedJunction",
                                                          ego_vehicles,
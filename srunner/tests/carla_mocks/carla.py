@@ -26,7 +26,7 @@ class command:
     def FutureActor():
         return None
 
-    def ApplyTransform():
+    def ApplyTransform(actor, transform):
         return None
 
     def SetAutopilot(actor, autopilot, port):
@@ -35,6 +35,9 @@ class command:
     def SetVehicleLightState():
         return None
 
+    def ApplyVehicleControl(actor, control):
+        return None
+
     def DestroyActor(actor):
         return None
 
@@ -122,6 +125,34 @@ class Transform:
         self.rotation = rotation
 
 
+class LaneType:
+    NONE = 1
+    Driving = 2
+    Stop = 4
+    Shoulder = 8
+    Biking = 16
+    Sidewalk = 32
+    Border = 64
+    Restricted = 128
+    Parking = 256
+    Bidirectional = 512
+    Median = 1024
+    Special1 = 2048
+    Special2 = 4096
+    Special3 = 8192
+    RoadWorks = 16384
+    Tram = 32768
+    Rail = 65536
+    Entry = 131072
+    Exit = 262144
+    OffRamp = 524288
+    OnRamp = 1048576
+    Any = 4294967294
+
+
+LaneType.values = {value: value for name, value in vars(LaneType).items() if not name.startswith('_')}
+
+
 class Waypoint():
     transform = Transform(Location(), Rotation())
     road_id = 0
@@ -148,6 +179,9 @@ class Map:
     def get_topology(self):
         return []
 
+    def to_opendrive(self):
+        return ""
+
 
 class TrafficLightState:
     Red = 0
@@ -205,6 +239,19 @@ class Control:
     brake = 0
 
 
+class VehicleControl(Control):
+
+    def __init__(self, throttle=0.0, steer=0.0, brake=0.0, hand_brake=False, reverse=False,
+                 manual_gear_shift=False, gear=0):
+        self.throttle = throttle
+        self.steer = steer
+        self.brake = brake
+        self.hand_brake = hand_brake
+        self.reverse = reverse
+        self.manual_gear_shift = manual_gear_shift
+        self.gear = gear
+
+
 class Actor:
 
     def __init__(self):
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Fake CARLA server process, standing in for the simulator in the server supervisor tests.
+
+It answers "ping" requests on its port with "pong". It can be told to crash (exit)
+or to hang (accept connections but never answer) after a given time:
+
+    python fake_carla_server.py --port 2000 [--crash-after 1.0] [--hang-after 1.0]
+"""
+
+from __future__ import print_function
+
+import argparse
+import socket
+import sys
+import time
+
+
+def ping(host, port, timeout):
+    """
+    Health check of the fake server
+    """
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.settimeout(timeout)
+        connection.sendall(b"ping\n")
+        return connection.recv(16).strip() == b"pong"
+
+
+def main():
+    """
+    Serve ping requests until told to crash or hang
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=2000)
+    parser.add_argument('--crash-after', type=float, default=None)
+    parser.add_argument('--hang-after', type=float, default=None)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(('127.0.0.1', args.port))
+    server.listen(8)
+    server.settimeout(0.1)
+
+    hung_connections = []
+    while True:
+        elapsed = time.time() - start_time
+        if args.crash_after is not None and elapsed > args.crash_after:
+            sys.exit(1)
+
+        try:
+            connection, _ = server.accept()
+        except socket.timeout:
+            continue
+
+        if args.hang_after is not None and elapsed > args.hang_after:
+            hung_connections.append(connection)
+            continue
+
+        with connection:
+            connection.settimeout(1.0)
+            try:
+                if connection.recv(16).strip() == b"ping":
+                    connection.sendall(b"pong\n")
+            except socket.timeout:
+                pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the pool of parked actors
+"""
+
+from unittest import TestCase, mock
+
+import py_trees
+from six.moves.queue import Queue
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.scenarioatomics.atomic_behaviors import ActorSource
+from srunner.scenariomanager.timer import GameTime
+
+
+class FakeClient(object):
+    """
+    Client remembering the batches applied to it
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def apply_batch(self, batch):
+        self.batches.append(batch)
+
+    def apply_batch_sync(self, batch, sync_mode=False):
+        return []
+
+
+class BoundingBox(object):
+    """
+    Bounding box of a car
+    """
+
+    extent = carla.Vector3D(2.0, 1.0, 0.8)
+
+    def get_world_vertices(self, _transform):
+        return [carla.Location(0, 0, 0)] * 8
+
+
+class FakeActor(object):
+    """
+    Actor at a fixed location
+    """
+
+    bounding_box = BoundingBox()
+
+    def __init__(self, actor_id, type_id, location=None, role_name='scenario'):
+        self.id = actor_id
+        self.type_id = type_id
+        self.attributes = {'role_name': role_name}
+        self.is_alive = True
+        self.location = location if location is not None else carla.Location(0, 0, 0)
+
+    def get_location(self):
+        return self.location
+
+    def get_transform(self):
+        return carla.Transform(self.location, carla.Rotation())
+
+    def get_velocity(self):
+        return carla.Vector3D(1.0, 0.0, 0.0)
+
+
+class TestActorPool(TestCase):
+    """
+    Test class for the pool of parked actors
+    """
+
+    def setUp(self):
+        self.client = FakeClient()
+        CarlaDataProvider._client = self.client  # pylint: disable=protected-access
+
+    def tearDown(self):
+        CarlaDataProvider.cleanup()
+        # pylint: disable=protected-access
+        CarlaDataProvider._actor_pool_size = 0
+        CarlaDataProvider._actor_history = {}
+        CarlaDataProvider._actor_id_type_map = {}
+        CarlaDataProvider._num_steps = 0
+
+    def _park(self, *actors):
+        for actor in actors:
+            CarlaDataProvider._carla_actor_pool[actor.id] = actor  # pylint: disable=protected-access
+            CarlaDataProvider.register_actor(actor)
+            CarlaDataProvider.park_actor(actor)
+
+    def test_actors_in_radius(self):
+        """
+        Only the alive actors with a known location inside the radius are found
+        """
+        close = FakeActor(1, 'vehicle.audi.tt', carla.Location(3, 4, 0))
+        far = FakeActor(2, 'vehicle.audi.tt', carla.Location(30, 40, 0))
+        dead = FakeActor(3, 'vehicle.audi.tt', carla.Location(0, 1, 0))
+        dead.is_alive = False
+        unknown = FakeActor(4, 'vehicle.audi.tt')
+        for actor in (close, far, dead, unknown):
+            CarlaDataProvider.register_actor(actor)
+            # pylint: disable=protected-access
+            CarlaDataProvider._actor_location_map[actor] = actor.location if actor is not unknown else None
+
+        self.assertEqual(CarlaDataProvider.get_actors_in_radius(carla.Location(0, 0, 0), 5.5), [close])
+        self.assertEqual(CarlaDataProvider.get_actors_in_radius(carla.Location(0, 0, 0), 4.5), [])
+
+    def test_park_actor(self):
+        """
+        Parked actors leave the pool and the cached maps, and vehicles are also stopped
+        """
+        vehicle = FakeActor(1, 'vehicle.audi.tt')
+        walker = FakeActor(2, 'walker.pedestrian.0001')
+        for actor in (vehicle, walker):
+            CarlaDataProvider._carla_actor_pool[actor.id] = actor  # pylint: disable=protected-access
+            CarlaDataProvider.register_actor(actor)
+            CarlaDataProvider.park_actor(actor)
+
+            self.assertTrue(CarlaDataProvider.is_parked(actor))
+            self.assertNotIn(actor.id, CarlaDataProvider._carla_actor_pool)  # pylint: disable=protected-access
+            self.assertNotIn(actor, CarlaDataProvider._actor_location_map)  # pylint: disable=protected-access
+
+        # Physics and transform, plus the autopilot and control of the vehicle
+        self.assertEqual([len(batch) for batch in self.client.batches], [4, 2])
+
+    def test_request_parked_actor(self):
+        """
+        Parked actors are matched by model, and their cached location is the spawn point
+        """
+        audi = FakeActor(1, 'vehicle.audi.tt')
+        tesla = FakeActor(2, 'vehicle.tesla.model3')
+        self._park(audi, tesla)
+
+        spawn_point = carla.Transform(carla.Location(10, 20, 0), carla.Rotation(yaw=90))
+        self.assertIsNone(CarlaDataProvider.request_parked_actor('walker.*', spawn_point))
+        self.assertIs(CarlaDataProvider.request_parked_actor('vehicle.tesla.*', spawn_point), tesla)
+        self.assertFalse(CarlaDataProvider.is_parked(tesla))
+        self.assertTrue(CarlaDataProvider.is_parked(audi))
+
+        # The actor is only moved at the next tick, so its location is not the one of the parking
+        location = CarlaDataProvider.get_location(tesla)
+        self.assertEqual((location.x, location.y, location.z), (10, 20, 0.2))
+        self.assertEqual(CarlaDataProvider.get_transform(tesla).rotation.yaw, 90)
+
+    def test_actor_source_interval(self):
+        """
+        The ActorSource waits for the spawn interval and a free spawn point, up to its limit
+        """
+        py_trees.blackboard.Blackboard().set("test_source", Queue(), overwrite=True)
+        source = ActorSource(['vehicle.*'], carla.Transform(), 5.0, "test_source", actor_limit=2, spawn_interval=2.0)
+        occupied = []
+
+        def update_at(time):
+            GameTime._current_game_time = time  # pylint: disable=protected-access
+            source.update()
+
+        with mock.patch.object(CarlaDataProvider, 'request_new_actor') as request_new_actor, \
+                mock.patch.object(CarlaDataProvider, 'get_actors_in_radius', side_effect=lambda *_: occupied):
+            try:
+                update_at(0.0)
+                self.assertEqual(request_new_actor.call_count, 1)
+
+                # Too soon
+                update_at(1.0)
+                self.assertEqual(request_new_actor.call_count, 1)
+
+                # Spawn point occupied
+                occupied.append(FakeActor(1, 'vehicle.audi.tt'))
+                update_at(2.5)
+                self.assertEqual(request_new_actor.call_count, 1)
+
+                occupied.pop()
+                update_at(3.0)
+                self.assertEqual(request_new_actor.call_count, 2)
+
+                # Limit reached
+                update_at(10.0)
+                self.assertEqual(request_new_actor.call_count, 2)
+            finally:
+                GameTime.restart()
+
+    def test_request_parked_actor_rolename(self):
+        """
+        Parked actors are also matched by rolename, if one is requested
+        """
+        scenario = FakeActor(1, 'vehicle.audi.tt')
+        background = FakeActor(2, 'vehicle.audi.tt', role_name='background')
+        self._park(scenario, background)
+
+        self.assertIs(CarlaDataProvider.request_parked_actor('vehicle.*', carla.Transform(), 'background'), background)
+        self.assertIsNone(CarlaDataProvider.request_parked_actor('vehicle.*', carla.Transform(), 'hero'))
+        self.assertIs(CarlaDataProvider.request_parked_actor('vehicle.*', carla.Transform()), scenario)
+
+    def test_recycle_actor(self):
+        """
+        Only alive vehicles and walkers other than the hero are recycled, while the pool has room
+        """
+        CarlaDataProvider.set_actor_pool_size(2)
+        hero = FakeActor(1, 'vehicle.audi.tt', role_name='hero')
+        prop = FakeActor(2, 'static.prop.barrel')
+        dead = FakeActor(3, 'vehicle.audi.tt')
+        dead.is_alive = False
+        vehicle = FakeActor(4, 'vehicle.audi.tt')
+        walker = FakeActor(5, 'walker.pedestrian.0001')
+        extra = FakeActor(6, 'vehicle.audi.tt')
+
+        recycled = []
+        for actor in (hero, prop, dead, vehicle, walker, extra):
+            CarlaDataProvider._carla_actor_pool[actor.id] = actor  # pylint: disable=protected-access
+            CarlaDataProvider.register_actor(actor)
+            recycled.append(CarlaDataProvider._recycle_actor(actor))  # pylint: disable=protected-access
+
+        self.assertEqual(recycled, [False, False, False, True, True, False])
+        self.assertEqual(sorted(CarlaDataProvider._parked_actors), [4, 5])  # pylint: disable=protected-access
+
+    def test_merge_parked_actors(self):
+        """
+        The actors of a request keep their order, whether they were spawned or parked
+        """
+        spawned = [FakeActor(i, 'vehicle.audi.tt') for i in (10, 11)]
+        parked = {0: FakeActor(1, 'vehicle.audi.tt'), 2: FakeActor(2, 'vehicle.audi.tt')}
+        # pylint: disable=protected-access
+        merged = CarlaDataProvider._merge_parked_actors(spawned, parked, 4)
+        self.assertEqual([actor.id for actor in merged], [1, 10, 2, 11])
+
+        # Actors that failed to spawn are missing
+        merged = CarlaDataProvider._merge_parked_actors(spawned[:1], parked, 4)
+        self.assertEqual([actor.id for actor in merged], [1, 10, 2])
+
+        self.assertIs(CarlaDataProvider._merge_parked_actors(spawned, {}, 2), spawned)
+
+    def test_history_gap(self):
+        """
+        Parked actors have invalid states in their history, and all histories keep the same length
+        """
+        # pylint: disable=protected-access
+        CarlaDataProvider._num_steps = 2
+        actor = FakeActor(1, 'vehicle.audi.tt')
+        CarlaDataProvider._carla_actor_pool[actor.id] = actor
+        CarlaDataProvider._store_history()
+
+        CarlaDataProvider.register_actor(actor)
+        CarlaDataProvider.park_actor(actor)
+        CarlaDataProvider._store_history()
+
+        CarlaDataProvider.request_parked_actor('vehicle.*', carla.Transform())
+        CarlaDataProvider._store_history()
+
+        history = CarlaDataProvider._actor_history[actor.id]
+        self.assertEqual(history["state/valid"], [0, 0, 1, 0, 1])
+        self.assertEqual(history["state/x"], [-1.0, -1.0, 0, -1.0, 0])
+        self.assertEqual(set(len(values) for values in history.values()), {5})
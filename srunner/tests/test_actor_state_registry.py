@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the registry of the per-actor state
+"""
+
+from unittest import TestCase
+
+import py_trees
+
+from srunner.scenariomanager.actor_state_registry import ActorStateRegistry
+
+
+class TestActorStateRegistry(TestCase):
+    """
+    Test class for the registry of the per-actor state
+    """
+
+    def tearDown(self):
+        ActorStateRegistry.cleanup()
+
+    def test_blackboard_names(self):
+        """
+        The state is also readable from the Blackboard under its previous names
+        """
+        blackboard = py_trees.blackboard.Blackboard()
+
+        self.assertIsNone(ActorStateRegistry.get_follower_state(7))
+        state = ActorStateRegistry.get_follower_state(7, create=True)
+        state.running.append(1)
+        state.terminate[:] = state.running
+        self.assertEqual(blackboard.get("running_WF_actor_7"), [1])
+        self.assertEqual(blackboard.get("terminate_WF_actor_7"), [1])
+
+        ActorStateRegistry.get_controllers()[7] = 'controller'
+        self.assertEqual(blackboard.get("ActorsWithController"), {7: 'controller'})
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the batched local planner
+"""
+
+from collections import deque, namedtuple
+from unittest import TestCase
+
+import numpy as np
+
+import carla
+from agents.navigation.controller import PIDLongitudinalController
+from agents.navigation.local_planner import RoadOption
+
+from srunner.scenariomanager.batched_local_planner import BatchedLocalPlanner
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
+Waypoint = namedtuple('Waypoint', ['transform'])
+
+
+def waypoint(x, y):
+    """
+    Returns a waypoint at the given location
+    """
+    return Waypoint(carla.Transform(carla.Location(x, y, 0), carla.Rotation()))
+
+
+class TestBatchedLocalPlanner(TestCase):
+    """
+    Test class for the batched local planner
+    """
+
+    def setUp(self):
+        self.actor = carla.Vehicle()
+        self.actor.id = 1
+        # pylint: disable=protected-access
+        CarlaDataProvider._actor_transform_map[self.actor] = carla.Transform(carla.Location(0, 0, 0),
+                                                                              carla.Rotation())
+        CarlaDataProvider._actor_velocity_map[self.actor] = 0.0
+
+    def tearDown(self):
+        CarlaDataProvider._actor_transform_map.clear()  # pylint: disable=protected-access
+        CarlaDataProvider._actor_velocity_map.clear()  # pylint: disable=protected-access
+
+    def test_purge_queue(self):
+        """
+        Waypoints are reached closer the faster the vehicle goes, and the last one at 1 meter
+        """
+        planner = BatchedLocalPlanner({'K_P': 1.0, 'K_I': 0.0, 'K_D': 0.0, 'dt': 0.05})
+        queue = deque([(waypoint(2, 0), RoadOption.LANEFOLLOW), (waypoint(4, 0), RoadOption.LANEFOLLOW),
+                       (waypoint(6, 0), RoadOption.LANEFOLLOW)])
+
+        planner._purge_queue(queue, carla.Location(0, 0, 0), 0.0)  # pylint: disable=protected-access
+        self.assertEqual(len(queue), 2)
+
+        planner._purge_queue(queue, carla.Location(0, 0, 0), 4.0)  # pylint: disable=protected-access
+        self.assertEqual(len(queue), 1)
+
+        planner._purge_queue(queue, carla.Location(4.5, 0, 0), 10.0)  # pylint: disable=protected-access
+        self.assertEqual(len(queue), 1)
+        planner._purge_queue(queue, carla.Location(5.5, 0, 0), 10.0)  # pylint: disable=protected-access
+        self.assertEqual(len(queue), 0)
+
+    def test_pid(self):
+        """
+        The PID outputs are the ones of the PID controllers of the agents
+        """
+        args = {'K_P': 0.5, 'K_I': 0.2, 'K_D': 0.1, 'dt': 0.05}
+        planner = BatchedLocalPlanner(args, args)
+        planner.add(self.actor, 20.0, [(waypoint(50, 0), RoadOption.LANEFOLLOW)])
+        controller = PIDLongitudinalController(self.actor, **args)
+
+        indexes = np.array([0])
+        # Errors of more than the size of the buffer, saturating the output in the middle
+        for speed in [0.0, 3.0, 10.0, 12.0, 0.0, 15.0, 18.0, 19.0, 21.0, 20.5, 20.0, 19.5, 19.8, 20.1]:
+            # pylint: disable=protected-access
+            planner._error_counts[indexes] = np.minimum(planner._error_counts[indexes] + 1, planner.BUFFER_SIZE)
+            output = planner._pid(planner._longitudinal_errors, np.array([20.0 - speed]), args, indexes)
+            self.assertAlmostEqual(output[0], controller._pid_control(20.0, speed))
+
+    def test_steering_limits(self):
+        """
+        The steering changes at most 0.1 per step, up to 0.8, as in the VehiclePIDController
+        """
+        planner = BatchedLocalPlanner({'K_P': 1.0, 'K_I': 0.0, 'K_D': 0.0, 'dt': 0.05})
+
+        # Target to the left of the vehicle
+        planner.add(self.actor, 20.0, [(waypoint(0, 50), RoadOption.LANEFOLLOW)])
+        steering = [planner.run_step([self.actor])[0].steer for _ in range(10)]
+        self.assertTrue(np.allclose(steering, [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.8, 0.8]))
+
+        # Then to the right of it
+        planner.add(self.actor, 20.0, [(waypoint(0, -50), RoadOption.LANEFOLLOW)])
+        planner._past_steering[0] = 0.8  # pylint: disable=protected-access
+        steering = [planner.run_step([self.actor])[0].steer for _ in range(3)]
+        self.assertTrue(np.allclose(steering, [0.7, 0.6, 0.5]))
+
+        # Vehicles at the end of their plan brake
+        planner.add(self.actor, 20.0, [])
+        control = planner.run_step([self.actor])[0]
+        self.assertEqual((control.throttle, control.steer, control.brake), (0.0, 0.0, 1.0))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the cached route planner
+"""
+
+from collections import namedtuple
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import networkx as nx
+
+import carla
+from agents.navigation.global_route_planner import GlobalRoutePlanner
+from agents.navigation.local_planner import RoadOption
+
+from srunner.scenariomanager.cached_route_planner import CachedRoutePlanner
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
+Waypoint = namedtuple('Waypoint', ['road_id', 'lane_id', 's'])
+
+
+class FakeMap(object):
+    """
+    Map without topology, whose waypoints are found by their OpenDRIVE coordinates
+    """
+
+    name = "Town01"
+
+    def __init__(self, opendrive="<OpenDRIVE/>"):
+        self._opendrive = opendrive
+
+    def get_topology(self):
+        return []
+
+    def to_opendrive(self):
+        return self._opendrive
+
+    def get_waypoint_xodr(self, road_id, lane_id, s):
+        return Waypoint(road_id, lane_id, s)
+
+
+class TestCachedRoutePlanner(TestCase):
+    """
+    Test class for the cached route planner
+    """
+
+    def setUp(self):
+        self._traced = []
+
+        def trace_route(planner, origin, destination):
+            self._traced.append((origin.x, destination.x))
+            planner._previous_decision = RoadOption.LEFT  # pylint: disable=protected-access
+            return [(Waypoint(1, -1, origin.x), RoadOption.LANEFOLLOW)]
+
+        patcher = mock.patch.object(GlobalRoutePlanner, 'trace_route', autospec=True, side_effect=trace_route)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_route_cache(self):
+        """
+        Routes are traced once per endpoints and planner state, and the state is restored on hits
+        """
+        planner = CachedRoutePlanner(FakeMap(), 2.0)
+        route = planner.trace_route(carla.Location(0, 0, 0), carla.Location(10, 0, 0))
+        self.assertEqual(planner._get_state()[0], RoadOption.LEFT)  # pylint: disable=protected-access
+
+        planner.reset()
+        self.assertEqual(planner.trace_route(carla.Location(0, 0, 0), carla.Location(10, 0, 0)), route)
+        self.assertEqual(len(self._traced), 1)
+        self.assertEqual(planner._get_state()[0], RoadOption.LEFT)  # pylint: disable=protected-access
+
+        # The state after the first route is part of the key
+        planner.trace_route(carla.Location(0, 0, 0), carla.Location(10, 0, 0))
+        self.assertEqual(len(self._traced), 2)
+
+    def test_eviction(self):
+        """
+        The least recently used routes are forgotten
+        """
+        planner = CachedRoutePlanner(FakeMap(), 2.0)
+        with mock.patch.object(CachedRoutePlanner, 'MAX_ROUTES', 2):
+            for x in (1, 2, 1, 3, 1, 2):
+                planner.reset()
+                planner.trace_route(carla.Location(0, 0, 0), carla.Location(x, 0, 0))
+        self.assertEqual([destination for _, destination in self._traced], [1, 2, 3, 2])
+
+    def test_save_and_load(self):
+        """
+        The stored graph is loaded with its waypoints, unless the map changed
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        wmap = FakeMap()
+        entry, exit_ = Waypoint(1, -1, 0.0), Waypoint(1, -1, 10.0)
+        topology = [{'entry': entry, 'exit': exit_, 'entryxyz': (0, 0, 0), 'exitxyz': (10, 0, 0),
+                     'path': [Waypoint(1, -1, 5.0)]}]
+        graph = nx.DiGraph()
+        graph.add_node(0, vertex=(0, 0, 0))
+        graph.add_node(1, vertex=(10, 0, 0))
+        graph.add_edge(0, 1, length=10, path=topology[0]['path'], entry_waypoint=entry, exit_waypoint=exit_,
+                       type=RoadOption.LANEFOLLOW)
+
+        built = CachedRoutePlanner(wmap, 2.0)
+        # pylint: disable=protected-access
+        built._planner._topology = topology
+        built._planner._graph = graph
+        built._planner._id_map = {(0, 0, 0): 0, (10, 0, 0): 1}
+        built._planner._road_id_to_edge = {1: {0: {-1: (0, 1)}}}
+        built._save(cache_dir + "/Town01_2.0.pkl", "fingerprint")
+
+        loaded = built._load(cache_dir + "/Town01_2.0.pkl", "fingerprint")
+        self.assertEqual(loaded._topology, topology)
+        self.assertEqual(loaded._graph.edges[0, 1]['exit_waypoint'], exit_)
+        self.assertEqual(loaded._graph.edges[0, 1]['path'], topology[0]['path'])
+        self.assertEqual(loaded._road_id_to_edge, built._planner._road_id_to_edge)
+        self.assertIsNone(built._load(cache_dir + "/Town01_2.0.pkl", "other fingerprint"))
+        # pylint: enable=protected-access
+
+    def test_provider_planners(self):
+        """
+        Maps with the same name but a different OpenDRIVE don't share their planner
+        """
+        try:
+            first_map = FakeMap("<OpenDRIVE>1</OpenDRIVE>")
+            planner = CarlaDataProvider.get_route_planner(2.0, first_map)
+            self.assertIs(CarlaDataProvider.get_route_planner(2.0, first_map), planner)
+            self.assertIs(CarlaDataProvider.get_route_planner(2.0, FakeMap("<OpenDRIVE>1</OpenDRIVE>")), planner)
+            self.assertIsNot(CarlaDataProvider.get_route_planner(2.0, FakeMap("<OpenDRIVE>2</OpenDRIVE>")), planner)
+        finally:
+            CarlaDataProvider._route_planners = {}  # pylint: disable=protected-access
+            CarlaDataProvider._map_fingerprints = {}  # pylint: disable=protected-access
+
+    def test_fingerprints_cleanup(self):
+        """
+        The maps are only remembered for their fingerprint until the cleanup of the provider
+        """
+        wmap = FakeMap()
+        with mock.patch.object(FakeMap, 'to_opendrive', return_value="<OpenDRIVE/>") as to_opendrive:
+            fingerprint = CarlaDataProvider.get_map_fingerprint(wmap)
+            self.assertEqual(CarlaDataProvider.get_map_fingerprint(wmap), fingerprint)
+            self.assertEqual(to_opendrive.call_count, 1)
+
+            CarlaDataProvider.cleanup()
+            self.assertEqual(CarlaDataProvider._map_fingerprints, {})  # pylint: disable=protected-access
+            self.assertEqual(CarlaDataProvider.get_map_fingerprint(wmap), fingerprint)
+            self.assertEqual(to_opendrive.call_count, 2)
+        CarlaDataProvider.cleanup()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the collision manager
+"""
+
+from collections import namedtuple
+from unittest import TestCase
+
+from srunner.scenariomanager.collision_manager import CollisionManager
+from srunner.scenariomanager.timer import GameTime
+
+OtherActor = namedtuple('OtherActor', ['id', 'type_id'])
+CollisionEvent = namedtuple('CollisionEvent', ['other_actor'])
+
+
+class FakeSensor(object):
+    """
+    Collision sensor whose events are sent by the test
+    """
+
+    def __init__(self):
+        self.callback = None
+        self.destroyed = False
+
+    def listen(self, callback):
+        self.callback = callback
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class FakeActor(object):
+    """
+    Actor counting the sensors spawned on it
+    """
+
+    def __init__(self, actor_id):
+        self.id = actor_id
+        self.sensors = []
+
+    def get_world(self):
+        return self
+
+    def get_blueprint_library(self):
+        return self
+
+    def find(self, _):
+        return None
+
+    def spawn_actor(self, _blueprint, _transform, attach_to=None):
+        self.sensors.append(FakeSensor())
+        return self.sensors[-1]
+
+
+class Listener(object):
+    """
+    Criterion-like listener of the collisions
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def on_collisions(self, events):
+        self.events.extend(events)
+
+
+class TestCollisionManager(TestCase):
+    """
+    Test class for the collision manager
+    """
+
+    def tearDown(self):
+        CollisionManager.cleanup()
+
+    def test_shared_sensor(self):
+        """
+        The actor has a single sensor, whose events are deduplicated and sent to all listeners
+        """
+        actor = FakeActor(1)
+        listeners = [Listener(), Listener()]
+        for listener in listeners:
+            CollisionManager.register(actor, listener.on_collisions)
+        self.assertEqual(len(actor.sensors), 1)
+
+        sensor = actor.sensors[0]
+        for other_actor in (OtherActor(2, 'vehicle.a'), OtherActor(2, 'vehicle.a'), OtherActor(0, 'static.b')):
+            sensor.callback(CollisionEvent(other_actor))
+
+        GameTime._last_frame += 1  # pylint: disable=protected-access
+        CollisionManager.tick(actor)
+        CollisionManager.tick(actor)
+        for listener in listeners:
+            self.assertEqual([event.other_actor.id for event in listener.events], [2, 0])
+
+        for listener in listeners:
+            CollisionManager.unregister(actor, listener.on_collisions)
+        self.assertTrue(sensor.destroyed)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the batched evaluation of the trigger conditions
+"""
+
+from collections import namedtuple
+from unittest import TestCase
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.condition_evaluator import ConditionEvaluator
+
+Actor = namedtuple('Actor', ['id'])
+
+
+class TestConditionEvaluator(TestCase):
+    """
+    Test class for the batched evaluation of the trigger conditions
+    """
+
+    def setUp(self):
+        self.ego = Actor(1)
+        self.other = Actor(2)
+        # pylint: disable=protected-access
+        CarlaDataProvider._actor_location_map[self.ego] = carla.Location(0, 0, 0)
+        CarlaDataProvider._actor_location_map[self.other] = carla.Location(30, 40, 0)
+        CarlaDataProvider._actor_velocity_map[self.ego] = 15.0
+        CarlaDataProvider._actor_velocity_map[self.other] = 5.0
+
+    def tearDown(self):
+        ConditionEvaluator.cleanup()
+        CarlaDataProvider._actor_location_map.clear()  # pylint: disable=protected-access
+        CarlaDataProvider._actor_velocity_map.clear()  # pylint: disable=protected-access
+
+    def test_values(self):
+        """
+        All kinds of conditions are evaluated at once
+        """
+        ConditionEvaluator.register('distance', ConditionEvaluator.DISTANCE, self.ego, self.other, 4.0)
+        ConditionEvaluator.register('tta', ConditionEvaluator.TIME_TO_ARRIVAL, self.ego, self.other)
+        ConditionEvaluator.register('tta_back', ConditionEvaluator.TIME_TO_ARRIVAL, self.other, self.ego)
+        ConditionEvaluator.register('velocity', ConditionEvaluator.VELOCITY, self.other)
+
+        self.assertAlmostEqual(ConditionEvaluator.get_value('distance'), 46.0)
+        self.assertAlmostEqual(ConditionEvaluator.get_value('tta'), 5.0)
+        self.assertEqual(ConditionEvaluator.get_value('tta_back'), float('inf'))
+        self.assertEqual(ConditionEvaluator.get_value('velocity'), 5.0)
+
+    def test_unknown_actor(self):
+        """
+        Conditions with actors without location have no value
+        """
+        ConditionEvaluator.register('velocity', ConditionEvaluator.VELOCITY, self.ego)
+        self.assertEqual(ConditionEvaluator.get_value('velocity'), 15.0)
+
+        # Registered after the evaluation of the frame
+        ConditionEvaluator.register('distance', ConditionEvaluator.DISTANCE, self.ego, Actor(3))
+        self.assertIsNone(ConditionEvaluator.get_value('distance'))
+
+    def test_overlapping_actors(self):
+        """
+        Actors closer than the offset are at distance 0, and arrive right away
+        """
+        ConditionEvaluator.register('distance', ConditionEvaluator.DISTANCE, self.ego, self.other, 60.0)
+        ConditionEvaluator.register('tta', ConditionEvaluator.TIME_TO_ARRIVAL, self.ego, self.other, 60.0)
+
+        self.assertEqual(ConditionEvaluator.get_value('distance'), 0.0)
+        self.assertEqual(ConditionEvaluator.get_value('tta'), 0.0)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the criteria engine
+"""
+
+from unittest import TestCase, mock
+
+import py_trees
+
+from srunner.scenariomanager.criteria_engine import CriteriaEngine
+from srunner.scenariomanager.scenarioatomics.atomic_criteria import Criterion
+
+
+class CountingCriterion(Criterion):
+    """
+    Criterion failing after a number of updates (never, if None)
+    """
+
+    def __init__(self, name, fail_after=None):
+        super(CountingCriterion, self).__init__(name, None, 0)
+        self.fail_after = fail_after
+        self.updates = 0
+        self.terminations = []
+
+    def update(self):
+        self.updates += 1
+        if self.fail_after is not None and self.updates >= self.fail_after:
+            self.test_status = "FAILURE"
+            return py_trees.common.Status.FAILURE
+        return py_trees.common.Status.RUNNING
+
+    def terminate(self, new_status):
+        self.terminations.append(new_status)
+        super(CountingCriterion, self).terminate(new_status)
+
+
+class TestCriteriaEngine(TestCase):
+    """
+    Test class for the criteria engine
+    """
+
+    @staticmethod
+    def _get_criteria():
+        return [CountingCriterion("Running"), CountingCriterion("Failing", fail_after=3)]
+
+    def test_same_as_tree(self):
+        """
+        The criteria are evaluated as if they were ticked by their Parallel node
+        """
+        tree_criteria = self._get_criteria()
+        tree = py_trees.composites.Parallel("Test Criteria", policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE)
+        tree.add_children(tree_criteria)
+        self.assertTrue(CriteriaEngine.supports(tree))
+
+        engine_criteria = self._get_criteria()
+        engine = CriteriaEngine(engine_criteria)
+
+        for _ in range(3):
+            tree.tick_once()
+            engine.tick()
+            self.assertEqual(engine.status, tree.status)
+
+        self.assertEqual(engine.status, py_trees.common.Status.FAILURE)
+        for tree_criterion, engine_criterion in zip(tree_criteria, engine_criteria):
+            self.assertEqual(engine_criterion.status, tree_criterion.status)
+            self.assertEqual(engine_criterion.test_status, tree_criterion.test_status)
+            self.assertEqual(engine_criterion.updates, tree_criterion.updates)
+            self.assertEqual(engine_criterion.terminations, tree_criterion.terminations)
+
+        # Once finished, the criteria aren't evaluated anymore
+        engine.tick()
+        self.assertEqual(engine_criteria[0].updates, 3)
+
+    def test_lazy_debug_messages(self):
+        """
+        The debug messages of the criteria are only formatted if py_trees logs them
+        """
+        criterion = CountingCriterion("Running")
+        criterion.status = mock.MagicMock()
+        criterion.status.__str__.return_value = "Status.RUNNING"
+        with mock.patch.object(criterion.logger, 'debug') as debug:
+            criterion.terminate(py_trees.common.Status.INVALID)
+            self.assertFalse(criterion.status.__str__.called)
+            self.assertFalse(debug.called)
+
+            level = py_trees.logging.level
+            py_trees.logging.level = py_trees.logging.Level.DEBUG
+            try:
+                criterion.terminate(py_trees.common.Status.INVALID)
+            finally:
+                py_trees.logging.level = level
+            debug.assert_called_once_with("CountingCriterion.terminate()[Status.RUNNING->Status.INVALID]")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the junction table
+"""
+
+from collections import namedtuple
+from unittest import TestCase
+
+from srunner.scenariomanager.junction_table import JunctionTable
+
+Waypoint = namedtuple('Waypoint', ['road_id', 'lane_id', 's'])
+
+
+def segment(road_id, lane_id, entry_s, exit_s, entry, exit_, junction_id=-1):
+    """
+    Returns a lane segment of the table
+    """
+    return {'road_id': road_id, 'lane_id': lane_id, 'entry_s': entry_s, 'exit_s': exit_s,
+            'length': abs(exit_s - entry_s), 'junction_id': junction_id, 'entry': entry, 'exit': exit_}
+
+
+class TestJunctionTable(TestCase):
+    """
+    Test class for the junction table
+    """
+
+    def setUp(self):
+        self.table = JunctionTable([
+            segment(1, -1, 0, 50, (0, 0, 0), (50, 0, 0)),
+            segment(2, 1, 30, 0, (50, 0, 0), (80, 0, 0)),
+            segment(3, -1, 0, 10, (80, 0, 0), (90, 0, 0), junction_id=7),
+            segment(4, -1, 0, 20, (90, 0, 0), (110, 0, 0)),
+        ])
+
+    def test_distances(self):
+        """
+        The distances are accumulated along the lanes, whatever their direction
+        """
+        junction = self.table.get_next_junction(Waypoint(1, -1, 10))
+        self.assertFalse(junction.in_junction)
+        self.assertEqual(junction.junction_id, 7)
+        self.assertAlmostEqual(junction.entry_distance, 70)
+        self.assertAlmostEqual(junction.exit_distance, 80)
+        self.assertEqual(junction.entry_location, (80, 0, 0))
+
+        self.assertAlmostEqual(self.table.get_next_junction(Waypoint(2, 1, 20)).entry_distance, 20)
+
+        junction = self.table.get_next_junction(Waypoint(3, -1, 4))
+        self.assertTrue(junction.in_junction)
+        self.assertAlmostEqual(junction.exit_distance, 6)
+
+    def test_no_junction(self):
+        """
+        Lanes without junctions ahead, or unknown, have no junction
+        """
+        self.assertIsNone(self.table.get_next_junction(Waypoint(4, -1, 5)))
+        self.assertIsNone(self.table.get_next_junction(Waypoint(5, -1, 5)))
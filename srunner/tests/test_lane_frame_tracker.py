@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the lane frame tracker
+"""
+
+from collections import namedtuple
+from unittest import TestCase
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.lane_frame_tracker import LaneFrameTracker
+
+Actor = namedtuple('Actor', ['id'])
+Transform = namedtuple('Transform', ['location'])
+
+
+class Waypoint(object):
+    """
+    Waypoint of a straight lane along the x axis
+    """
+
+    lane_width = 3.5
+
+    def __init__(self, x):
+        self.transform = Transform(carla.Location(x, 0, 0))
+
+    def next(self, distance):
+        return [Waypoint(self.transform.location.x + distance)]
+
+    def previous(self, distance):
+        return [Waypoint(self.transform.location.x - distance)]
+
+
+class Map(object):
+    """
+    Map of a straight lane along the x axis, counting the waypoint queries
+    """
+
+    def __init__(self):
+        self.queries = 0
+
+    def get_waypoint(self, location):
+        self.queries += 1
+        return Waypoint(location.x)
+
+
+class TestLaneFrameTracker(TestCase):
+    """
+    Test class for the lane frame tracker
+    """
+
+    def setUp(self):
+        self.map = Map()
+        self.actor = Actor(1)
+        CarlaDataProvider._map = self.map  # pylint: disable=protected-access
+
+    def tearDown(self):
+        CarlaDataProvider._map = None  # pylint: disable=protected-access
+        CarlaDataProvider._actor_location_map.clear()  # pylint: disable=protected-access
+
+    def test_longitudinal_positions(self):
+        """
+        The lane is only sampled again when the actor gets close to its end,
+        and the positions along it are compared by their s-coordinates
+        """
+        tracker = LaneFrameTracker(self.actor, lookahead=20.0)
+        locations = CarlaDataProvider._actor_location_map  # pylint: disable=protected-access
+
+        for x in range(0, 21, 2):
+            locations[self.actor] = carla.Location(x, 0, 0)
+            tracker.update()
+            self.assertEqual(self.map.queries, 1)
+            behind = tracker.get_s(carla.Location(x - 5, 3.5, 0), 2)
+            ahead = tracker.get_s(carla.Location(x + 5, 3.5, 0), 3)
+            self.assertAlmostEqual(behind, tracker.s - 5)
+            self.assertAlmostEqual(ahead, tracker.s + 5)
+
+        locations[self.actor] = carla.Location(40, 0, 0)
+        self.assertIsNotNone(tracker.update())
+        self.assertEqual(self.map.queries, 2)
+        self.assertEqual(list(tracker.get_location(tracker.s + 3)), [43, 0, 0])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the lane type grid
+"""
+
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import carla
+
+from srunner.scenariomanager.lane_type_grid import LaneTypeGrid
+from srunner.scenariomanager.map_cache import MapCache
+
+DRIVING = 2
+SIDEWALK = 32
+
+
+class TestLaneTypeGrid(TestCase):
+    """
+    Test class for the lane type grid
+    """
+
+    def setUp(self):
+        # A 3.5m wide driving lane at y=1.75 and a 2m wide sidewalk at its right, along x
+        centers = []
+        left_extents = []
+        right_extents = []
+        lane_types = []
+        for x in range(0, 21):
+            centers += [(x, 1.75, 0), (x, 4.5, 0)]
+            left_extents += [1.75, 1.0]
+            right_extents += [1.375, 1.0]
+            lane_types += [DRIVING, SIDEWALK]
+        junctions = [x > 15 for x, _, _ in centers]
+        self._grid = LaneTypeGrid(centers, [0] * len(centers), left_extents, right_extents, lane_types, junctions)
+
+    def test_lane_types(self):
+        """
+        The lane type is known inside the lanes
+        """
+        self.assertEqual(self._grid.get_lane_type(carla.Location(10, 1.5, 0)), (DRIVING, False))
+        self.assertEqual(self._grid.get_lane_type(carla.Location(10, 4.6, 0.5)), (SIDEWALK, False))
+        self.assertEqual(self._grid.get_lane_type(carla.Location(18, 1.5, 0)), (DRIVING, True))
+
+    def test_unknown_locations(self):
+        """
+        The borders of the lanes, other heights and the outside of the roads are unknown
+        """
+        self.assertIsNone(self._grid.get_lane_type(carla.Location(10, 3.3, 0)))
+        self.assertIsNone(self._grid.get_lane_type(carla.Location(15.8, 1.5, 0)))
+        self.assertIsNone(self._grid.get_lane_type(carla.Location(10, 1.5, 5)))
+        self.assertIsNone(self._grid.get_lane_type(carla.Location(10, -1.0, 0)))
+        self.assertIsNone(self._grid.get_lane_type(carla.Location(100, 100, 0)))
+
+    def test_stored_grid(self):
+        """
+        A grid stored for the map is loaded instead of being built again
+        """
+        cache_dir = tempfile.mkdtemp()
+        try:
+            wmap = mock.Mock()
+            wmap.name = 'Carla/Maps/Town01'
+            file_name = MapCache.get_file_name(cache_dir, wmap, "lane_types_2.0_0.5")
+            # pylint: disable=protected-access
+            MapCache.save(file_name, 'abc', {'grid': self._grid._get_state(), 'lane_types': [DRIVING, SIDEWALK]})
+
+            grid, lane_types = LaneTypeGrid.from_map(wmap, 2.0, 0.5, cache_dir, 'abc')
+            wmap.generate_waypoints.assert_not_called()
+            self.assertEqual(lane_types, {DRIVING: carla.LaneType.Driving, SIDEWALK: carla.LaneType.Sidewalk})
+            self.assertEqual(grid.get_lane_type(carla.Location(10, 4.6, 0.5)), (SIDEWALK, False))
+            self.assertEqual(grid.get_lane_type(carla.Location(18, 1.5, 0)), (DRIVING, True))
+            self.assertIsNone(grid.get_lane_type(carla.Location(10, 3.3, 0)))
+        finally:
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the storage of the map data
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import TestCase
+
+from srunner.scenariomanager.map_cache import MapCache
+
+
+class FakeMap(object):
+    """
+    Map with a name and an OpenDRIVE
+    """
+
+    name = "Carla/Maps/Town01"
+
+    def to_opendrive(self):
+        return "<OpenDRIVE/>"
+
+
+class TestMapCache(TestCase):
+    """
+    Test class for the storage of the map data
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_save_and_load(self):
+        """
+        The data is only loaded for the map it was stored for
+        """
+        wmap = FakeMap()
+        fingerprint = MapCache.get_fingerprint(wmap)
+        file_name = MapCache.get_file_name(os.path.join(self.cache_dir, "maps"), wmap, "junctions")
+        self.assertEqual(os.path.basename(file_name), "Town01_junctions.pkl")
+
+        self.assertIsNone(MapCache.load(file_name, fingerprint))
+        MapCache.save(file_name, fingerprint, [1, 2, 3])
+        self.assertEqual(MapCache.load(file_name, fingerprint), [1, 2, 3])
+        self.assertIsNone(MapCache.load(file_name, "other fingerprint"))
+
+    def test_invalid_files(self):
+        """
+        Files that aren't pickles of the cache are ignored
+        """
+        file_name = os.path.join(self.cache_dir, "Town01_junctions.pkl")
+        with open(file_name, 'w', encoding='utf-8') as fd:
+            fd.write("not a pickle")
+        self.assertIsNone(MapCache.load(file_name, "fingerprint"))
+
+        with open(file_name, 'wb') as fd:
+            pickle.dump(['fingerprint'], fd)
+        self.assertIsNone(MapCache.load(file_name, "fingerprint"))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the offline evaluation of the criteria
+"""
+
+from unittest import TestCase, mock
+
+import numpy as np
+
+import carla
+
+from srunner.metrics.tools.offline_criteria import (AverageVelocityCriterion,
+                                                    DrivenDistanceCriterion,
+                                                    InRouteCriterion,
+                                                    MaxVelocityCriterion,
+                                                    OfflineCriterion,
+                                                    OfflineScenarioResult,
+                                                    RouteCompletionCriterion,
+                                                    Trajectory,
+                                                    densify_route,
+                                                    read_recorder_trajectories)
+
+
+def get_trajectory(end_x, lateral=0.0, speed=10.0, delta_seconds=0.05):
+    """
+    Returns the trajectory of an actor driving along x at a constant speed
+    """
+    x = np.arange(0.0, end_x + 1e-6, speed * delta_seconds)
+    positions = np.stack((x, np.full_like(x, lateral), np.zeros_like(x)), axis=1)
+    velocities = np.tile([speed, 0.0, 0.0], (len(x), 1))
+    times = (np.arange(len(x)) + 1) * delta_seconds
+    return Trajectory(times, positions, velocities, 1, 'vehicle.unknown')
+
+
+class FakeMetricsLog(object):
+    """
+    MetricsLog of a hero created at frame 2, driving along x at 10 m/s, without a transform at frame 4
+    """
+
+    def __init__(self, _recorder):
+        pass
+
+    def get_actor_ids_with_role_name(self, role_name):
+        return [7] if role_name == 'hero' else []
+
+    def get_actor_alive_frames(self, _actor_id):
+        return 2, 5
+
+    def get_actor_attributes(self, _actor_id):
+        return {'type_id': 'vehicle.audi.tt', 'role_name': 'hero'}
+
+    def get_elapsed_time(self, frame):
+        return 0.05 * frame
+
+    def get_actor_transform(self, _actor_id, frame):
+        if frame == 4:
+            return None
+        return carla.Transform(carla.Location(0.5 * frame, 0, 0), carla.Rotation())
+
+    def get_actor_velocity(self, _actor_id, _frame):
+        return carla.Vector3D(10, 0, 0)
+
+
+class TestOfflineCriteria(TestCase):
+    """
+    Test class for the offline criteria
+    """
+
+    def setUp(self):
+        self._route = densify_route([(0, 0, 0), (100, 0, 0)])
+
+    def test_motion_criteria(self):
+        """
+        The velocities and driven distance are the ones of the trajectory
+        """
+        trajectory = get_trajectory(50)
+        max_velocity = MaxVelocityCriterion(8).evaluate(trajectory)
+        driven_distance = DrivenDistanceCriterion(60, 40).evaluate(trajectory)
+        average_velocity = AverageVelocityCriterion(5).evaluate(trajectory)
+
+        self.assertEqual(max_velocity.test_status, "FAILURE")
+        self.assertAlmostEqual(max_velocity.actual_value, 10)
+        self.assertEqual(driven_distance.test_status, "FAILURE")
+        self.assertAlmostEqual(driven_distance.actual_value, 50)
+        self.assertEqual(average_velocity.test_status, "SUCCESS")
+
+    def test_route_criteria(self):
+        """
+        The route is completed when its end is reached, and deviations fail the in route test
+        """
+        completed = OfflineScenarioResult("Completed", get_trajectory(105), [
+            InRouteCriterion(self._route), RouteCompletionCriterion(self._route)])
+        self.assertEqual(completed.get_result(), "SUCCESS")
+        self.assertEqual(completed.get_criteria()[1].actual_value, 100)
+
+        partial = RouteCompletionCriterion(self._route).evaluate(get_trajectory(50))
+        self.assertEqual(partial.test_status, "FAILURE")
+        self.assertAlmostEqual(partial.actual_value, 50, delta=1)
+
+        deviated = OfflineScenarioResult("Deviated", get_trajectory(105, lateral=40), [
+            InRouteCriterion(self._route)])
+        self.assertEqual(deviated.get_result(), "FAILURE")
+        self.assertEqual(len(deviated.get_criteria()[0].list_traffic_events), 1)
+
+    def test_recorder_trajectories(self):
+        """
+        The trajectories of the recorder logs are the ones of the ego vehicles, while they have a transform
+        """
+        with mock.patch('srunner.metrics.tools.offline_criteria.MetricsLog', FakeMetricsLog):
+            trajectories = read_recorder_trajectories("")
+
+        self.assertEqual(len(trajectories), 1)
+        trajectory = trajectories[0]
+        self.assertEqual(trajectory.actor, (7, 'vehicle.audi.tt'))
+        self.assertTrue(np.allclose(trajectory.times, [0.05, 0.1, 0.2]))
+        self.assertTrue(np.allclose(trajectory.positions[:, 0], [1.0, 1.5, 2.5]))
+        self.assertTrue(np.allclose(trajectory.speeds, 10))
+
+    def test_base_criterion(self):
+        """
+        The base criterion has no condition, and succeeds
+        """
+        criterion = OfflineCriterion("Base", 0).evaluate(get_trajectory(10))
+        self.assertEqual(criterion.test_status, "SUCCESS")
+        self.assertEqual(criterion.actual_value, 0)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the seeded random streams
+"""
+
+from unittest import TestCase
+
+from srunner.scenariomanager.random_streams import RandomStreams
+
+
+class TestRandomStreams(TestCase):
+    """
+    Test class for the seeded random streams
+    """
+
+    def tearDown(self):
+        RandomStreams.set_seed(2000)
+
+    def _draw(self, component, seed, job_id=0, repetition=0):
+        RandomStreams.set_seed(seed, job_id, repetition)
+        return list(RandomStreams.get(component).randint(0, 1 << 30, size=8))
+
+    def test_reproducible(self):
+        """
+        The same seed, job and repetition always give the same draws
+        """
+        first = self._draw(RandomStreams.ADVERSARY, 7, 3, 1)
+        second = self._draw(RandomStreams.ADVERSARY, 7, 3, 1)
+        self.assertEqual(first, second)
+
+    def test_independent(self):
+        """
+        Jobs, repetitions and components use different streams
+        """
+        reference = self._draw(RandomStreams.ADVERSARY, 7)
+        self.assertNotEqual(reference, self._draw(RandomStreams.ADVERSARY, 7, job_id=1))
+        self.assertNotEqual(reference, self._draw(RandomStreams.ADVERSARY, 7, repetition=1))
+        self.assertNotEqual(reference, self._draw(RandomStreams.SPAWNING, 7))
+
+        # Drawing from one component does not shift the others
+        RandomStreams.set_seed(7)
+        RandomStreams.get(RandomStreams.SPAWNING).rand(100)
+        self.assertEqual(reference, list(RandomStreams.get(RandomStreams.ADVERSARY).randint(0, 1 << 30, size=8)))
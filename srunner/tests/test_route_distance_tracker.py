@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the route distance tracker
+"""
+
+from collections import namedtuple
+from unittest import TestCase
+
+import carla
+
+from srunner.scenariomanager.route_distance_tracker import RouteDistanceTracker
+
+Transform = namedtuple('Transform', ['location'])
+
+
+class Waypoint(object):
+    """
+    Waypoint of a straight lane along the x axis
+    """
+
+    def __init__(self, x):
+        self.transform = Transform(carla.Location(x, 0, 0))
+
+    def next(self, distance):
+        return [Waypoint(self.transform.location.x + distance)]
+
+
+class Planner(object):
+    """
+    Planner of a straight lane along the x axis, counting the traced routes
+    """
+
+    resolution = 1.0
+
+    def __init__(self):
+        self.traces = 0
+
+    def trace_route(self, origin, destination):
+        self.traces += 1
+        return [(Waypoint(float(x)), None) for x in range(int(origin.x), int(destination.x) + 1)]
+
+
+class TestRouteDistanceTracker(TestCase):
+    """
+    Test class for the route distance tracker
+    """
+
+    def test_incremental(self):
+        """
+        The route is only traced again when a location leaves it
+        """
+        planner = Planner()
+        tracker = RouteDistanceTracker(planner)
+
+        self.assertAlmostEqual(tracker.get_distance(carla.Location(0, 0, 0), carla.Location(20, 0, 0)), 20)
+        for step in range(1, 20):
+            distance = tracker.get_distance(carla.Location(step, 0.5, 0), carla.Location(20 + 2 * step, 0, 0))
+            self.assertAlmostEqual(distance, 20 + step)
+        self.assertEqual(planner.traces, 1)
+
+        tracker.get_distance(carla.Location(20, 5, 0), carla.Location(60, 0, 0))
+        self.assertEqual(planner.traces, 2)
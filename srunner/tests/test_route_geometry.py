@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the route geometry
+"""
+
+from unittest import TestCase, mock
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.route_geometry import RouteGeometry
+
+
+class TestRouteGeometry(TestCase):
+    """
+    Test class for the route geometry
+    """
+
+    def setUp(self):
+        # Straight route along x, followed by a turn to +y
+        points = [(0, 0), (10, 0), (20, 0), (20, 10), (20, 20)]
+        self._route = [(carla.Location(x, y, 0), None) for x, y in points]
+        self._geometry = RouteGeometry(self._route)
+
+    def test_accumulated_distance(self):
+        """
+        The distance along the route is accumulated at every point
+        """
+        self.assertEqual(list(self._geometry.accum_meters), [0, 10, 20, 30, 40])
+
+    def test_closest_and_passed_index(self):
+        """
+        The closest and the passed points are searched within the window
+        """
+        location = carla.Location(19, 9, 0)
+        self.assertEqual(self._geometry.get_closest_index(location)[0], 3)
+        self.assertEqual(self._geometry.get_closest_index(location, 0, 1)[0], 1)
+        self.assertEqual(self._geometry.get_passed_index(carla.Location(12, 0, 0)), 1)
+        self.assertIsNone(self._geometry.get_passed_index(carla.Location(-1, 0, 0)))
+
+    def test_project(self):
+        """
+        A location is projected onto the closest segment
+        """
+        projection = self._geometry.project(carla.Location(15, 2, 0))
+        self.assertEqual(projection.index, 1)
+        self.assertAlmostEqual(projection.progress, 15)
+        self.assertAlmostEqual(projection.lateral_offset, 2)
+        self.assertAlmostEqual(projection.distance, 2)
+
+        projection = self._geometry.project(carla.Location(22, 15, 0))
+        self.assertEqual(projection.index, 3)
+        self.assertAlmostEqual(projection.progress, 35)
+        self.assertAlmostEqual(projection.lateral_offset, -2)
+
+    def test_project_near(self):
+        """
+        Tracked locations are only projected onto the segments close to their previous projection
+        """
+        geometry = RouteGeometry([(carla.Location(x, 0, 0), None) for x in range(30)])
+        location = carla.Location(25, 1, 0)
+        self.assertAlmostEqual(geometry.project_near(location).progress, 25)
+        self.assertAlmostEqual(geometry.project_near(location, 20).progress, 25)
+        self.assertAlmostEqual(geometry.project_near(location, 0).progress, 13)
+
+    def test_distances_along_route(self):
+        """
+        Many positions are projected at once, only onto compatible segments
+        """
+        positions = [(15, 2), (21, 15), (100, 100)]
+        distances, found = self._geometry.get_distances_along_route(positions)
+        self.assertEqual(list(found), [True, True, False])
+        self.assertAlmostEqual(distances[0], 15)
+        self.assertAlmostEqual(distances[1], 35)
+        self.assertAlmostEqual(distances[2], 40)
+
+        # Positions at a road of the route, but with lanes of the opposite direction
+        _, found = self._geometry.get_distances_along_route(positions, [-1, -1, -1], [1, 1, 1])
+        self.assertFalse(any(found))
+
+    def test_provider_cache(self):
+        """
+        The provider builds one geometry per route, and only compares the points of new route lists
+        """
+        CarlaDataProvider._map = carla.Map()  # pylint: disable=protected-access
+        try:
+            geometry = CarlaDataProvider.get_route_geometry(self._route)
+            with mock.patch.object(RouteGeometry, 'get_key', wraps=RouteGeometry.get_key) as get_key:
+                self.assertIs(CarlaDataProvider.get_route_geometry(self._route), geometry)
+                self.assertEqual(get_key.call_count, 0)
+                self.assertIs(CarlaDataProvider.get_route_geometry(list(self._route)), geometry)
+                self.assertEqual(get_key.call_count, 1)
+        finally:
+            CarlaDataProvider._map = None  # pylint: disable=protected-access
+            CarlaDataProvider._route_geometries = {}  # pylint: disable=protected-access
+            CarlaDataProvider._route_geometries_by_id = {}  # pylint: disable=protected-access
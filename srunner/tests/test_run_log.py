@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the run log
+"""
+
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+import time
+
+from srunner.scenarioconfigs.scenario_configuration import ScenarioConfiguration
+from srunner.scenariomanager.run_log import RunLog, read_run_log, summarize_run_log
+
+
+class ManagerResults(object):
+    """
+    Results of a ScenarioManager, as used by the run log
+    """
+    scenario = None
+    start_system_time = None
+    scenario_duration_system = 0.0
+    scenario_duration_game = 0.0
+    tick_count = 0
+    tick_durations = []
+    export_duration = 0.0
+
+
+class TestRunLog(TestCase):
+    """
+    Test class for the run log
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._file = os.path.join(self._dir, "runs.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_write_and_summarize(self):
+        """
+        Each job appends a record, and the records are aggregated
+        """
+        config = ScenarioConfiguration()
+        config.name = "Test_1"
+        manager = ManagerResults()
+        run_log = RunLog(self._file)
+
+        # A job that failed before its scenario was run
+        run_log.start_job(config)
+        run_log.write(manager, False)
+
+        # A job that ran 4 ticks
+        run_log.start_job(config)
+        with run_log.measure(RunLog.WORLD_LOAD):
+            pass
+        manager.start_system_time = time.time()
+        manager.tick_count = 4
+        manager.tick_durations = [0.05, 0.05, 0.05]
+        manager.scenario_duration_system = 0.3
+        manager.scenario_duration_game = 0.2
+        manager.export_duration = 0.1
+        run_log.write(manager, True)
+
+        records = read_run_log(self._file)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['tick_count'], 0)
+        self.assertIsNone(records[0]['tick_latency_mean'])
+        self.assertEqual(records[1]['tick_count'], 4)
+        self.assertAlmostEqual(records[1]['tick_latency_p95'], 0.05)
+        self.assertAlmostEqual(records[1]['sim_wall_ratio'], 1.0)
+        self.assertAlmostEqual(records[1]['scenario_wall_time'], 0.2)
+        self.assertAlmostEqual(records[1]['export_time'], 0.1)
+
+        summary = summarize_run_log(records)
+        self.assertEqual(summary['jobs'], 2)
+        self.assertAlmostEqual(summary['success_rate'], 0.5)
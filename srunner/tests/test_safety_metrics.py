@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the surrogate safety indicators
+"""
+
+from collections import namedtuple
+from unittest import TestCase, mock
+
+import numpy as np
+import py_trees
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.safety_metrics import get_box_corners, get_box_distances, get_safety_metrics
+from srunner.scenariomanager.scenarioatomics.atomic_criteria import SurrogateSafetyTest
+from srunner.scenariomanager.timer import GameTime
+
+Actor = namedtuple('Actor', ['id'])
+
+
+def get_states(other_x):
+    """
+    Returns the states of an ego vehicle at 10 m/s, and another stopped vehicle ahead of it
+    """
+    return {
+        "ids": np.array([1, 2]),
+        "positions": np.array([[0.0, 0.0], [other_x, 0.0]]),
+        "yaws": np.zeros(2),
+        "extents": np.array([[2.0, 1.0], [2.0, 1.0]]),
+        "velocities": np.array([[10.0, 0.0], [0.0, 0.0]]),
+    }
+
+
+class TestSafetyMetrics(TestCase):
+    """
+    Test class for the surrogate safety indicators
+    """
+
+    def test_box_distances(self):
+        """
+        The distances between oriented boxes are 0 when they overlap
+        """
+        box = get_box_corners([0, 0], 0, [2, 1])[0]
+        boxes = get_box_corners([[10, 0], [0, 5], [3, 0], [0, 0]], [0, np.pi / 2, np.pi / 4, 0], [[2, 1]] * 4)
+        distances = get_box_distances(box, boxes)
+        np.testing.assert_allclose(distances[:2], [6, 2])
+        self.assertEqual(distances[2], 0)
+        self.assertEqual(distances[3], 0)
+
+    def test_metrics(self):
+        """
+        Following, crossing and departing actors
+        """
+        metrics = get_safety_metrics(
+            [0, 0], 0, [2, 1], [10, 0],
+            [[20, 0], [20, -20], [-20, 0]], [0, np.pi / 2, 0], [[2, 1]] * 3, [[5, 0], [0, 10], [0, 0]])
+
+        np.testing.assert_allclose(metrics['gap'][0], 16)
+        np.testing.assert_allclose(metrics['ttc'][0], 16 / 5.0)
+        np.testing.assert_allclose(metrics['drac'][0], 25 / 32.0)
+        self.assertEqual(metrics['pet'][0], np.inf)
+
+        # Both reach (20, 0) after 2 seconds
+        np.testing.assert_allclose(metrics['pet'][1], 0, atol=1e-9)
+
+        self.assertEqual(metrics['ttc'][2], np.inf)
+        self.assertEqual(metrics['drac'][2], 0)
+
+    def test_criterion(self):
+        """
+        The time below the minimum time to collision only counts the ticks at which it is below
+        """
+        criterion = SurrogateSafetyTest(Actor(1), min_ttc=1.5)
+        ticks = [(0.0, get_states(10.0)), (0.1, get_states(10.0)), (0.2, get_states(1000.0)),
+                 (0.3, None), (0.4, get_states(10.0))]
+        try:
+            for time, states in ticks:
+                GameTime._current_game_time = time  # pylint: disable=protected-access
+                with mock.patch.object(CarlaDataProvider, 'get_actor_states', return_value=states):
+                    criterion.update()
+        finally:
+            GameTime.restart()
+        criterion.terminate(py_trees.common.Status.SUCCESS)
+
+        self.assertEqual(criterion.test_status, "FAILURE")
+        self.assertEqual(criterion.actual_value, 0.6)
+        self.assertAlmostEqual(criterion.details['summary']['time_below_min_ttc'], 0.2)
+        self.assertEqual(criterion.details['time'], [0.0, 0.1, 0.4])
+
+        # Without other actors, there is no time to collision
+        criterion = SurrogateSafetyTest(Actor(1))
+        criterion.terminate(py_trees.common.Status.SUCCESS)
+        self.assertIsNone(criterion.actual_value)
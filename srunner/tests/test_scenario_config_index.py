@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the scenario configuration index
+"""
+
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+
+from srunner.tools.scenario_config_index import ScenarioConfigurationIndex
+
+CONFIG = """<?xml version="1.0"?>
+<scenarios>
+    <scenario name="Test_1" type="TestType" town="Town01">
+        <ego_vehicle x="1" y="2" z="0.5" yaw="0" model="vehicle.lincoln.mkz_2017" />
+    </scenario>
+    <scenario name="Test_2" type="{}" town="Town01">
+        <ego_vehicle x="3" y="4" z="0.5" yaw="0" model="vehicle.lincoln.mkz_2017" />
+    </scenario>
+</scenarios>
+"""
+
+
+class TestScenarioConfigurationIndex(TestCase):
+    """
+    Test class for the persistent scenario configuration index
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._index_file = os.path.join(self._dir, "index.json")
+        self._config_file = os.path.join(self._dir, "config.xml")
+        with open(self._config_file, 'w', encoding='utf-8') as fd:
+            fd.write(CONFIG.format("TestType"))
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_lookup(self):
+        """
+        Lookups by name and by type
+        """
+        index = ScenarioConfigurationIndex(self._index_file)
+        self.assertEqual(len(index.find([self._config_file], name="Test_2")), 1)
+        self.assertEqual(len(index.find([self._config_file], scenario_type="TestType")), 2)
+        self.assertEqual(index.list_scenarios([self._config_file]), ["Test_1", "Test_2"])
+
+    def test_persistence_and_invalidation(self):
+        """
+        The index is reused from disk and refreshed once the file content changes
+        """
+        ScenarioConfigurationIndex(self._index_file).list_scenarios([self._config_file])
+        self.assertTrue(os.path.isfile(self._index_file))
+
+        index = ScenarioConfigurationIndex(self._index_file)
+        self.assertEqual(len(index.find([self._config_file], scenario_type="TestType")), 2)
+
+        with open(self._config_file, 'w', encoding='utf-8') as fd:
+            fd.write(CONFIG.format("OtherType"))
+        self.assertEqual(len(index.find([self._config_file], scenario_type="TestType")), 1)
+        self.assertEqual(len(index.find([self._config_file], scenario_type="OtherType")), 1)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the scenario parameter space sampler
+"""
+
+from unittest import TestCase
+
+import carla
+
+from srunner.scenarioconfigs.scenario_configuration import ScenarioConfiguration, ActorConfigurationData
+from srunner.tools.scenario_sampler import ScenarioParameter, ScenarioParameterSpace
+
+
+class TestScenarioSampler(TestCase):
+    """
+    Test class for the scenario parameter space sampler
+    """
+
+    def setUp(self):
+        self._space = ScenarioParameterSpace([ScenarioParameter('start_distance', 20, 60),
+                                              ScenarioParameter('weather.precipitation', 0, 100)])
+
+    def _assert_stratified(self, samples, name, minimum, maximum):
+        strata = sorted(int((sample[name] - minimum) / (maximum - minimum) * len(samples)) for sample in samples)
+        self.assertEqual(strata, list(range(len(samples))))
+
+    def test_lhs_and_sobol(self):
+        """
+        Both methods cover every stratum of each parameter once
+        """
+        for method in ('lhs', 'sobol'):
+            samples = self._space.sample(16, method)
+            self.assertEqual(len(samples), 16)
+            self._assert_stratified(samples, 'start_distance', 20, 60)
+            self._assert_stratified(samples, 'weather.precipitation', 0, 100)
+
+    def test_grid(self):
+        """
+        The grid uses all categorical values and stays within the number of samples
+        """
+        space = ScenarioParameterSpace([ScenarioParameter('start_distance', 20, 60),
+                                        ScenarioParameter('adversary_type', values=['pedestrian', 'cyclist'])])
+        samples = space.sample(10, 'grid')
+        self.assertEqual(len(samples), 10)
+        self.assertEqual(sorted(set(sample['adversary_type'] for sample in samples)), ['cyclist', 'pedestrian'])
+
+    def test_apply(self):
+        """
+        The sample is applied to a copy of the configuration
+        """
+        config = ScenarioConfiguration()
+        config.name = "Test_1"
+        config.other_actors = [ActorConfigurationData('vehicle.*', carla.Transform())]
+        sample = {'start_distance': 30, 'weather.precipitation': 50, 'other_actor_speed': 5}
+
+        new_config = ScenarioParameterSpace.apply(config, sample, 3)
+        self.assertEqual(new_config.name, "Test_1_sample3")
+        self.assertEqual(new_config.other_parameters, {'start_distance': 30})
+        self.assertEqual(new_config.weather.precipitation, 50)
+        self.assertEqual(new_config.other_actors[0].speed, 5)
+        self.assertEqual(config.other_parameters, {})
+        self.assertEqual(config.other_actors[0].speed, 0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the server supervisor, using a fake server process
+"""
+
+from unittest import TestCase
+import os
+import socket
+import sys
+import time
+
+from srunner.scenariomanager.server_supervisor import ServerSupervisor
+from srunner.tests.fake_carla_server import ping
+
+FAKE_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_carla_server.py")
+
+
+def get_free_port():
+    """
+    Returns a free port of localhost
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestServerSupervisor(TestCase):
+    """
+    Test class for the server supervisor
+    """
+
+    def _create_supervisor(self, *options):
+        command = [sys.executable, FAKE_SERVER, '--port', '{port}'] + list(options)
+        supervisor = ServerSupervisor('127.0.0.1', get_free_port(), command, health_timeout=0.5,
+                                      startup_timeout=10.0, health_check=ping)
+        self.addCleanup(supervisor.stop)
+        return supervisor
+
+    def test_crashed_server_is_restarted(self):
+        """
+        A crashed server is detected and relaunched
+        """
+        supervisor = self._create_supervisor('--crash-after', '1.0')
+        self.assertTrue(supervisor.start())
+
+        supervisor._process.wait(10.0)  # pylint: disable=protected-access
+        self.assertFalse(supervisor.is_alive())
+        self.assertTrue(supervisor.restart())
+        self.assertEqual(supervisor.restarts, 1)
+
+    def test_hung_server_is_restarted(self):
+        """
+        A server that stops answering is detected, killed and relaunched
+        """
+        supervisor = self._create_supervisor('--hang-after', '1.0')
+        self.assertTrue(supervisor.start())
+
+        deadline = time.time() + 10.0
+        while supervisor.is_alive() and time.time() < deadline:
+            time.sleep(0.1)
+        self.assertFalse(supervisor.is_alive())
+
+        hung_process = supervisor._process  # pylint: disable=protected-access
+        self.assertTrue(supervisor.restart())
+        self.assertIsNotNone(hung_process.poll())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the termination policy
+"""
+
+from collections import namedtuple
+import json
+import math
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.scenario_manager import ScenarioManager
+from srunner.scenariomanager.scenarioatomics.atomic_criteria import CollisionTest
+from srunner.scenariomanager.termination_policy import (CollisionRule,
+                                                        RegionRule,
+                                                        StationaryRule,
+                                                        TerminationPolicy)
+
+Actor = namedtuple('Actor', ['id'])
+
+
+class Point(namedtuple('Point', ['x', 'y'])):
+    """
+    Location with an euclidean distance
+    """
+
+    def distance(self, other):
+        return math.hypot(self.x - other.x, self.y - other.y)
+
+
+class TestTerminationPolicy(TestCase):
+    """
+    Test class for the termination policy
+    """
+
+    def tearDown(self):
+        CarlaDataProvider._actor_velocity_map.clear()  # pylint: disable=protected-access
+        CarlaDataProvider._actor_location_map.clear()  # pylint: disable=protected-access
+
+    def test_from_string(self):
+        """
+        The rules and their arguments are parsed from their description
+        """
+        policy = TerminationPolicy.from_string("collision:2, stationary:20,region:80:5")
+        self.assertEqual([type(rule) for rule in policy.rules], [CollisionRule, StationaryRule, RegionRule])
+        with self.assertRaises(ValueError):
+            TerminationPolicy.from_string("unknown:1")
+
+    def test_stationary(self):
+        """
+        The scenario ends once the ego has been stopped for the given duration
+        """
+        ego = Actor(1)
+        velocities = CarlaDataProvider._actor_velocity_map  # pylint: disable=protected-access
+        policy = TerminationPolicy([StationaryRule(2.0)])
+        policy.setup([ego], [], [])
+
+        velocities[ego] = 5.0
+        self.assertIsNone(policy.check(1.0))
+        velocities[ego] = 0.0
+        self.assertIsNone(policy.check(2.0))
+        self.assertIsNotNone(policy.check(3.0))
+
+        policy.setup([ego], [], [])
+        self.assertIsNone(policy.check(3.0))
+
+    def test_collision(self):
+        """
+        The scenario ends the given delay after the first collision of its collision tests
+        """
+        collision_test = mock.Mock(spec=CollisionTest, actual_value=0)
+        other_criterion = mock.Mock(actual_value=5)
+        policy = TerminationPolicy([CollisionRule(1.0)])
+        policy.setup([Actor(1)], [], [collision_test, other_criterion])
+
+        self.assertIsNone(policy.check(1.0))
+        collision_test.actual_value = 1
+        self.assertIsNone(policy.check(2.0))
+        self.assertIsNone(policy.check(2.5))
+        self.assertIsNotNone(policy.check(3.0))
+
+    def test_region(self):
+        """
+        The scenario ends once all other actors have been out of the radius for the given duration
+        """
+        ego, near, far = Actor(1), Actor(2), Actor(3)
+        locations = CarlaDataProvider._actor_location_map  # pylint: disable=protected-access
+        locations[ego] = Point(0, 0)
+        locations[near] = Point(10, 0)
+        locations[far] = Point(100, 0)
+        policy = TerminationPolicy([RegionRule(50.0, 2.0)])
+        policy.setup([ego], [near, far], [])
+
+        self.assertIsNone(policy.check(1.0))
+        locations[near] = Point(60, 0)
+        self.assertIsNone(policy.check(2.0))
+        self.assertIsNone(policy.check(2.5))
+        self.assertIsNotNone(policy.check(3.0))
+
+        # Without other actors, there is no region to leave
+        policy.setup([ego], [], [])
+        self.assertIsNone(policy.check(10.0))
+
+    def test_manager_result(self):
+        """
+        Scenarios ended by the policy are not successful, and the reason is part of their results
+        """
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+
+        criterion = mock.Mock(optional=False, test_status="SUCCESS", actual_value=0, expected_value_success=0,
+                              details=None)
+        criterion.name = "CollisionTest"
+        criterion.actor.type_id = "vehicle.audi.tt"
+        scenario = mock.Mock(timeout=60.0)
+        scenario.get_criteria.return_value = [criterion]
+        scenario.timeout_node.timeout = False
+
+        manager = ScenarioManager()
+        manager.scenario = scenario
+        manager.scenario_tree = mock.Mock()
+        manager.scenario_tree.name = "Scenario"
+        manager.ego_vehicles = []
+        manager.other_actors = []
+        manager.start_system_time = manager.end_system_time = 0.0
+        manager.scenario_duration_system = 20.0
+        manager.scenario_duration_game = 20.0
+
+        json_file = os.path.join(output_dir, "result.json")
+        self.assertFalse(manager.analyze_scenario(False, None, None, json_file))
+
+        manager.termination_reason = "Ego vehicle stationary for 20.0s"
+        junit_file = os.path.join(output_dir, "result.xml")
+        self.assertTrue(manager.analyze_scenario(False, None, junit_file, json_file))
+        with open(json_file, encoding='utf-8') as fd:
+            results = json.load(fd)
+        self.assertFalse(results["success"])
+        self.assertEqual(results["termination_reason"], manager.termination_reason)
+        with open(junit_file, encoding='utf-8') as fd:
+            self.assertIn("Terminated early: Ego vehicle stationary", fd.read())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides some basic unit tests for the traffic light plans
+"""
+
+from unittest import TestCase
+
+from srunner.scenariomanager.traffic_light_plan import TrafficLightPlan
+
+
+class TestTrafficLightPlan(TestCase):
+    """
+    Test class for the traffic light plans
+    """
+
+    def test_configuration(self):
+        """
+        The first direction of the subtype with lights is chosen
+        """
+        annotations = {'ref': ['ref'], 'opposite': ['opposite'], 'left': [], 'right': ['right']}
+        self.assertEqual(TrafficLightPlan.get_configuration('S7left', annotations), 'opposite')
+        self.assertEqual(TrafficLightPlan.get_configuration('S7opposite', annotations), 'right')
+        self.assertIsNone(TrafficLightPlan.get_configuration('S9right', {'ref': ['ref'], 'left': [],
+                                                                         'opposite': [], 'right': []}))
+        self.assertIsNone(TrafficLightPlan.get_configuration('S10', annotations))
+
+    def test_phases(self):
+        """
+        The phases end with the reset of the junction, and plans without configuration have none
+        """
+        plan = TrafficLightPlan('light', {}, 'left', None, 3.0)
+        self.assertEqual([phase.event for phase in plan.phases],
+                         [TrafficLightPlan.START, TrafficLightPlan.DISTANCE, TrafficLightPlan.TIME,
+                          TrafficLightPlan.TIME, TrafficLightPlan.JUNCTION_EXIT])
+        self.assertEqual(plan.phases[2].states, TrafficLightPlan.INT_CONF_LFT1)
+        self.assertEqual(plan.phases[3].value, 3.0)
+        self.assertIsNone(plan.phases[-1].states)
+
+        self.assertEqual(TrafficLightPlan('light', {}, None, None, None).phases, [])
@@ -13,10 +13,10 @@ It also contains functions to convert the CARLA world location do GPS coordinate
 import math
 import xml.etree.ElementTree as ET
 
-from agents.navigation.global_route_planner import GlobalRoutePlanner
-
 from agents.navigation.local_planner import RoadOption
 
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
 
 def _location_to_gps(lat_ref, lon_ref, location):
     """
@@ -138,7 +138,8 @@ def interpolate_trajectory(world, waypoints_trajectory, hop_resolution=1.0):
     :return: the full interpolated route both in GPS coordinates and also in its original form.
     """
 
-    grp = GlobalRoutePlanner(world.get_map(), hop_resolution)
+    grp = CarlaDataProvider.get_route_planner(hop_resolution, CarlaDataProvider.get_map(world))
+    grp.reset()
     # Obtain route plan
     route = []
     for i in range(len(waypoints_trajectory) - 1):   # Goes until the one before the last.
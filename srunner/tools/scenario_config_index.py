@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a persistent index of the scenario configuration files (*.xml, *.xosc),
+so that scenario lookups by name or by type do not have to re-parse every file on each call
+"""
+
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
+
+
+class ScenarioConfigurationIndex(object):
+
+    """
+    Index of all scenario configuration files, persisted as JSON.
+
+    For every file the index stores its modification time, size and content hash, together
+    with a compact serialized form of its content:
+    - *.xml: name, type and XML snippet of every <scenario> node
+    - *.xosc: the description of the FileHeader
+
+    A file is only parsed again if its modification time or size changed and its content hash
+    no longer matches. Files are parsed with iterparse, so large files are streamed and
+    already indexed nodes are released right away.
+    """
+
+    INDEX_VERSION = 1
+    HASH_CHUNK_SIZE = 1 << 16
+
+    def __init__(self, index_file=None):
+        """
+        Setup the index and load a previously stored one, if available
+        """
+        if index_file is None:
+            index_file = os.path.join(os.getenv('SCENARIO_RUNNER_ROOT', "./"), ".scenario_config_index.json")
+        self._index_file = index_file
+        self._entries = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """
+        Read the index from disk. A missing, outdated or corrupted index is silently discarded
+        """
+        if not os.path.isfile(self._index_file):
+            return
+
+        try:
+            with open(self._index_file, 'r', encoding='utf-8') as fd:
+                data = json.load(fd)
+        except (IOError, OSError, ValueError):
+            return
+
+        if data.get('version') != self.INDEX_VERSION:
+            return
+
+        self._entries = data.get('files', {})
+
+    def save(self):
+        """
+        Write the index to disk, if it has changed since it was loaded
+        """
+        if not self._dirty:
+            return
+
+        try:
+            with open(self._index_file, 'w', encoding='utf-8') as fd:
+                json.dump({'version': self.INDEX_VERSION, 'files': self._entries}, fd)
+            self._dirty = False
+        except (IOError, OSError) as e:
+            print("WARNING: Scenario configuration index could not be saved: {}".format(e))
+
+    def _get_file_hash(self, file_name):
+        """
+        Returns the SHA1 hash of the file content
+        """
+        sha1 = hashlib.sha1()
+        with open(file_name, 'rb') as fd:
+            for chunk in iter(lambda: fd.read(self.HASH_CHUNK_SIZE), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    @staticmethod
+    def _parse_xml(file_name):
+        """
+        Stream all <scenario> nodes of a XML configuration file
+        """
+        scenarios = []
+        for _, elem in ET.iterparse(file_name, events=('end',)):
+            if elem.tag == 'scenario':
+                scenarios.append({
+                    'name': elem.attrib.get('name', None),
+                    'type': elem.attrib.get('type', None),
+                    'xml': ET.tostring(elem, encoding='unicode')
+                })
+                elem.clear()
+        return scenarios
+
+    @staticmethod
+    def _parse_xosc(file_name):
+        """
+        Stream an OpenSCENARIO file until its FileHeader is found
+        """
+        for _, elem in ET.iterparse(file_name, events=('end',)):
+            if elem.tag == 'FileHeader':
+                return elem.attrib.get('description', None)
+        return None
+
+    def _get_entry(self, file_name):
+        """
+        Returns the (updated) index entry of a file
+        """
+        key = os.path.abspath(file_name)
+        stat = os.stat(file_name)
+        entry = self._entries.get(key, None)
+
+        if entry is not None and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+            return entry
+
+        file_hash = self._get_file_hash(file_name)
+        if entry is not None and entry['hash'] == file_hash:
+            # Touched, but not modified
+            entry['mtime'] = stat.st_mtime
+            entry['size'] = stat.st_size
+            self._dirty = True
+            return entry
+
+        entry = {'mtime': stat.st_mtime, 'size': stat.st_size, 'hash': file_hash}
+        if file_name.endswith(".xosc"):
+            entry['description'] = self._parse_xosc(file_name)
+        else:
+            entry['scenarios'] = self._parse_xml(file_name)
+
+        self._entries[key] = entry
+        self._dirty = True
+        return entry
+
+    def find(self, file_names, name=None, scenario_type=None):
+        """
+        Returns the XML nodes of all scenarios in the given files that match the name (or the type)
+        """
+        nodes = []
+        for file_name in file_names:
+            for scenario in self._get_entry(file_name).get('scenarios', []):
+                if name is not None and scenario['name'] != name:
+                    continue
+                if scenario_type is not None and scenario['type'] != scenario_type:
+                    continue
+                nodes.append(ET.fromstring(scenario['xml']))
+
+        self.save()
+        return nodes
+
+    def list_scenarios(self, file_names):
+        """
+        Returns the name of all scenarios in the given files
+        """
+        scenarios = []
+        for file_name in file_names:
+            entry = self._get_entry(file_name)
+            if 'description' in entry:
+                scenarios.append("{} (OpenSCENARIO)".format(entry['description']))
+            else:
+                scenarios.extend([scenario['name'] for scenario in entry['scenarios']])
+
+        self.save()
+        return scenarios
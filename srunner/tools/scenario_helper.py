@@ -28,94 +28,34 @@ def get_distance_along_route(route, target_location):
 
     Note: If the location is not along the route, the route length will be returned
     """
+    distances, found = get_distances_along_route(route, [target_location])
+    return float(distances[0]), bool(found[0])
 
-    wmap = CarlaDataProvider.get_map()
-    covered_distance = 0
-    prev_position = None
-    found = False
-
-    # Don't use the input location, use the corresponding wp as location
-    target_location_from_wp = wmap.get_waypoint(target_location).transform.location
 
-    for position, _ in route:
-
-        location = target_location_from_wp
+def get_distances_along_route(route, target_locations):
+    """
+    Calculate the distance of each of the given locations (e.g. of all actors) along the route.
 
-        # Don't perform any calculations for the first route point
-        if not prev_position:
-            prev_position = position
-            continue
+    The locations are moved to their lane centers and projected onto the precomputed route polyline,
+    using the closest route segment of the same road and lane direction.
+    Note: Locations that are not along the route get the route length
 
-        # Calculate distance between previous and current route point
-        interval_length_squared = ((prev_position.x - position.x) ** 2) + ((prev_position.y - position.y) ** 2)
-        distance_squared = ((location.x - prev_position.x) ** 2) + ((location.y - prev_position.y) ** 2)
+    @return (distances, found) arrays
+    """
+    wmap = CarlaDataProvider.get_map()
+    route_geometry = CarlaDataProvider.get_route_geometry(route)
 
-        # Close to the current position? Stop calculation
-        if distance_squared < 0.01:
-            break
+    positions = np.zeros((len(target_locations), 2))
+    road_ids = np.zeros(len(target_locations), dtype=np.int64)
+    lane_ids = np.zeros(len(target_locations), dtype=np.int64)
+    for i, target_location in enumerate(target_locations):
+        # Don't use the input location, use the corresponding wp as location
+        waypoint = wmap.get_waypoint(target_location)
+        positions[i] = (waypoint.transform.location.x, waypoint.transform.location.y)
+        road_ids[i] = waypoint.road_id
+        lane_ids[i] = waypoint.lane_id
 
-        if distance_squared < 400 and not distance_squared < interval_length_squared:
-            # Check if a neighbor lane is closer to the route
-            # Do this only in a close distance to correct route interval, otherwise the computation load is too high
-            starting_wp = wmap.get_waypoint(location)
-            wp = starting_wp.get_left_lane()
-            while wp is not None:
-                new_location = wp.transform.location
-                new_distance_squared = ((new_location.x - prev_position.x) ** 2) + (
-                    (new_location.y - prev_position.y) ** 2)
-
-                if np.sign(starting_wp.lane_id) != np.sign(wp.lane_id):
-                    break
-
-                if new_distance_squared < distance_squared:
-                    distance_squared = new_distance_squared
-                    location = new_location
-                else:
-                    break
-
-                wp = wp.get_left_lane()
-
-            wp = starting_wp.get_right_lane()
-            while wp is not None:
-                new_location = wp.transform.location
-                new_distance_squared = ((new_location.x - prev_position.x) ** 2) + (
-                    (new_location.y - prev_position.y) ** 2)
-
-                if np.sign(starting_wp.lane_id) != np.sign(wp.lane_id):
-                    break
-
-                if new_distance_squared < distance_squared:
-                    distance_squared = new_distance_squared
-                    location = new_location
-                else:
-                    break
-
-                wp = wp.get_right_lane()
-
-        if distance_squared < interval_length_squared:
-            # The location could be inside the current route interval, if route/lane ids match
-            # Note: This assumes a sufficiently small route interval
-            # An alternative is to compare orientations, however, this also does not work for
-            # long route intervals
-
-            curr_wp = wmap.get_waypoint(position)
-            prev_wp = wmap.get_waypoint(prev_position)
-            wp = wmap.get_waypoint(location)
-
-            if prev_wp and curr_wp and wp:
-                if wp.road_id in (prev_wp.road_id, curr_wp.road_id):
-                    # Roads match, now compare the sign of the lane ids
-                    if (np.sign(wp.lane_id) == np.sign(prev_wp.lane_id) or
-                            np.sign(wp.lane_id) == np.sign(curr_wp.lane_id)):
-                        # The location is within the current route interval
-                        covered_distance += math.sqrt(distance_squared)
-                        found = True
-                        break
-
-        covered_distance += math.sqrt(interval_length_squared)
-        prev_position = position
-
-    return covered_distance, found
+    return route_geometry.get_distances_along_route(positions, road_ids, lane_ids)
 
 
 def get_crossing_point(actor):
@@ -566,10 +506,11 @@ def get_troad_from_transform(actor_transform):
 
 
 def get_distance_between_actors(current, target, distance_type="euclidianDistance", freespace=False,
-                                global_planner=None):
+                                global_planner=None, route_tracker=None):
     """
     This function finds the distance between actors for different use cases described by distance_type and freespace
-    attributes
+    attributes. The longitudinal distance between actors on different roads is the distance along the route given by
+    the global planner, or by a RouteDistanceTracker, if the distance is updated every tick
     """
 
     target_transform = CarlaDataProvider.get_transform(target)
@@ -583,7 +524,9 @@ def get_distance_between_actors(current, target, distance_type="euclidianDistanc
             extent_sum_x = target.bounding_box.extent.x + current.bounding_box.extent.x
             extent_sum_y = target.bounding_box.extent.y + current.bounding_box.extent.y
     if distance_type == "longitudinal":
-        if not current_wp.road_id == target_wp.road_id:
+        if not current_wp.road_id == target_wp.road_id and route_tracker is not None:
+            distance = route_tracker.get_distance(current_transform.location, target_transform.location)
+        elif not current_wp.road_id == target_wp.road_id:
             distance = 0
             # Get the route
             route = global_planner.trace_route(current_transform.location, target_transform.location)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Intel Corporation
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a sampler of the scenario parameter space, used to generate
+batches of scenario configurations for bulk data generation.
+
+The parameter space is declared in a JSON file, e.g.:
+
+{
+    "method": "lhs",
+    "samples": 20,
+    "parameters": {
+        "ego_lane_offset": {"min": -10, "max": 10},
+        "start_distance": {"min": 30, "max": 50},
+        "adversary_speed": {"min": 2, "max": 8},
+        "adversary_type": {"values": ["pedestrian", "cyclist"]},
+        "weather.precipitation": {"min": 0, "max": 80}
+    }
+}
+
+The following parameters are applied to the configuration itself:
+- ego_lane_offset: moves the ego vehicles along their lane [m]
+- other_actor_speed: speed of all other actors of the configuration [m/s]
+- weather.<attribute>: any attribute of carla.WeatherParameters
+All other parameters are stored in config.other_parameters, for the scenarios to use them.
+"""
+
+from __future__ import print_function
+
+import copy
+import itertools
+import json
+import math
+
+import numpy as np
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.random_streams import RandomStreams
+
+# Primitive polynomials and initial direction numbers of the Sobol sequence (Joe & Kuo),
+# as (degree, coefficients, initial direction numbers), starting at the second dimension
+SOBOL_DIRECTION_NUMBERS = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+]
+SOBOL_BITS = 30
+
+WEATHER_ATTRIBUTES = ['cloudiness', 'precipitation', 'precipitation_deposits', 'wind_intensity',
+                      'sun_azimuth_angle', 'sun_altitude_angle', 'fog_density', 'fog_distance', 'fog_falloff',
+                      'wetness', 'scattering_intensity', 'mie_scattering_scale', 'rayleigh_scattering_scale']
+
+
+def _latin_hypercube(samples, dimensions, rng):
+    """
+    Latin hypercube sampling of the unit cube: every dimension is split into as many
+    strata as samples, and each stratum is sampled exactly once
+    """
+    points = np.empty((samples, dimensions))
+    for dim in range(dimensions):
+        points[:, dim] = (rng.permutation(samples) + rng.random_sample(samples)) / samples
+    return points
+
+
+def _sobol(samples, dimensions, rng):
+    """
+    Sobol sequence of the unit cube, randomized with a digital shift.
+    For the best uniformity, the number of samples should be a power of two.
+    """
+    if dimensions > len(SOBOL_DIRECTION_NUMBERS) + 1:
+        raise ValueError("Sobol sampling supports up to {} parameters".format(len(SOBOL_DIRECTION_NUMBERS) + 1))
+
+    directions = np.zeros((dimensions, SOBOL_BITS), dtype=np.int64)
+    directions[0, :] = [1 << (SOBOL_BITS - 1 - i) for i in range(SOBOL_BITS)]
+    for dim in range(1, dimensions):
+        degree, coefficients, initial = SOBOL_DIRECTION_NUMBERS[dim - 1]
+        values = list(initial)
+        for i in range(degree, SOBOL_BITS):
+            value = values[i - degree] ^ (values[i - degree] << degree)
+            for k in range(1, degree):
+                if (coefficients >> (degree - 1 - k)) & 1:
+                    value ^= values[i - k] << k
+            values.append(value)
+        directions[dim, :] = [values[i] << (SOBOL_BITS - 1 - i) for i in range(SOBOL_BITS)]
+
+    shift = rng.randint(0, 1 << SOBOL_BITS, size=dimensions).astype(np.int64)
+    points = np.empty((samples, dimensions))
+    state = np.zeros(dimensions, dtype=np.int64)
+    for index in range(samples):
+        points[index, :] = (state ^ shift) / float(1 << SOBOL_BITS)
+        # Gray code ordering: flip the direction number of the lowest zero bit of the index
+        bit = 0
+        while (index >> bit) & 1:
+            bit += 1
+        state ^= directions[:, bit]
+    return points
+
+
+def _grid(levels):
+    """
+    Full factorial grid of the unit cube, using the cell centers of each dimension
+    """
+    axes = [[(i + 0.5) / level for i in range(level)] for level in levels]
+    return np.array(list(itertools.product(*axes))).reshape(-1, len(levels))
+
+
+class ScenarioParameter(object):
+
+    """
+    A single dimension of the parameter space, either a continuous range [min, max]
+    or a list of categorical values
+    """
+
+    def __init__(self, name, minimum=None, maximum=None, values=None):
+        if values is None and (minimum is None or maximum is None):
+            raise ValueError("Parameter '{}' requires either a range or a list of values".format(name))
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.values = values
+
+    def is_categorical(self):
+        """
+        Returns True if the parameter is a list of values
+        """
+        return self.values is not None
+
+    def get_value(self, unit_value):
+        """
+        Map a value of [0, 1) to the parameter
+        """
+        if self.is_categorical():
+            return self.values[min(int(unit_value * len(self.values)), len(self.values) - 1)]
+        return self.minimum + unit_value * (self.maximum - self.minimum)
+
+
+class ScenarioParameterSpace(object):
+
+    """
+    Parameter space of a scenario, producing batches of parameter samples through
+    Latin hypercube ('lhs'), Sobol ('sobol') or grid ('grid') sampling
+    """
+
+    SAMPLING_METHODS = ('lhs', 'sobol', 'grid')
+
+    def __init__(self, parameters, method='lhs', samples=10):
+        if method not in self.SAMPLING_METHODS:
+            raise ValueError("Unknown sampling method '{}'. Use one of {}".format(method, self.SAMPLING_METHODS))
+        self.parameters = parameters
+        self.method = method
+        self.samples = samples
+
+    @staticmethod
+    def parse_from_file(file_name):
+        """
+        Parse the JSON declaration of a parameter space
+        """
+        with open(file_name, 'r', encoding='utf-8') as fd:
+            data = json.load(fd)
+
+        parameters = []
+        for name, declaration in data['parameters'].items():
+            parameters.append(ScenarioParameter(name,
+                                                declaration.get('min', None),
+                                                declaration.get('max', None),
+                                                declaration.get('values', None)))
+
+        return ScenarioParameterSpace(parameters, data.get('method', 'lhs'), int(data.get('samples', 10)))
+
+    def sample(self, samples=None, method=None):
+        """
+        Returns a batch of samples, as a list of {parameter name: value}.
+
+        Grid sampling uses all values of the categorical parameters and as many levels
+        of the continuous ones as needed to stay within the number of samples.
+        """
+        samples = self.samples if samples is None else samples
+        method = self.method if method is None else method
+        dimensions = len(self.parameters)
+        if dimensions == 0 or samples < 1:
+            return []
+
+        rng = RandomStreams.get(RandomStreams.PARAMETER_SAMPLING)
+        if method == 'lhs':
+            points = _latin_hypercube(samples, dimensions, rng)
+        elif method == 'sobol':
+            points = _sobol(samples, dimensions, rng)
+        elif method == 'grid':
+            categorical = [len(p.values) for p in self.parameters if p.is_categorical()]
+            continuous = dimensions - len(categorical)
+            budget = float(samples) / max(1, int(np.prod(categorical)))
+            level = max(1, int(math.floor(budget ** (1.0 / continuous) + 1e-9))) if continuous else 1
+            points = _grid([len(p.values) if p.is_categorical() else level for p in self.parameters])
+        else:
+            raise ValueError("Unknown sampling method '{}'. Use one of {}".format(method, self.SAMPLING_METHODS))
+
+        return [{p.name: p.get_value(point[i]) for i, p in enumerate(self.parameters)} for point in points]
+
+    @staticmethod
+    def _move_along_lane(transform, distance):
+        """
+        Returns the transform moved by distance along its lane, or None if that is not a valid spawn point
+        """
+        wmap = CarlaDataProvider.get_map()
+        waypoint = wmap.get_waypoint(transform.location, project_to_road=False, lane_type=carla.LaneType.Driving)
+        if waypoint is None:
+            return None
+
+        if distance > 0:
+            waypoints = waypoint.next(distance)
+        elif distance < 0:
+            waypoints = waypoint.previous(-distance)
+        else:
+            waypoints = [waypoint]
+        if not waypoints or waypoints[0].is_junction:
+            return None
+
+        location = waypoints[0].transform.location
+        rotation = waypoints[0].transform.rotation
+        return carla.Transform(carla.Location(location.x, location.y, transform.location.z),
+                               carla.Rotation(pitch=rotation.pitch, yaw=rotation.yaw, roll=rotation.roll))
+
+    @staticmethod
+    def apply(config, sample, index=0):
+        """
+        Returns a copy of the configuration with the sample applied to it,
+        or None if the sample results in an invalid spawn point.
+
+        This requires the map of the configuration to be loaded.
+        """
+        new_config = copy.copy(config)
+        new_config.name = "{}_sample{}".format(config.name, index)
+        new_config.ego_vehicles = [copy.copy(actor) for actor in config.ego_vehicles]
+        new_config.other_actors = [copy.copy(actor) for actor in config.other_actors]
+        new_config.trigger_points = list(config.trigger_points)
+        new_config.other_parameters = dict(getattr(config, 'other_parameters', {}))
+
+        weather = carla.WeatherParameters()
+        for attribute in WEATHER_ATTRIBUTES:
+            setattr(weather, attribute, getattr(config.weather, attribute))
+        new_config.weather = weather
+
+        for name, value in sample.items():
+            if name == 'ego_lane_offset':
+                for i, ego_vehicle in enumerate(new_config.ego_vehicles):
+                    transform = ScenarioParameterSpace._move_along_lane(ego_vehicle.transform, value)
+                    if transform is None:
+                        return None
+                    ego_vehicle.transform = transform
+                    if i < len(new_config.trigger_points):
+                        new_config.trigger_points[i] = transform
+            elif name == 'other_actor_speed':
+                for actor in new_config.other_actors:
+                    actor.speed = value
+            elif name.startswith('weather.'):
+                attribute = name[len('weather.'):]
+                if attribute not in WEATHER_ATTRIBUTES:
+                    raise ValueError("Unknown weather attribute '{}'".format(attribute))
+                setattr(weather, attribute, value)
+            else:
+                new_config.other_parameters[name] = value
+
+        return new_config